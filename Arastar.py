@@ -0,0 +1,269 @@
+import heapq
+import time
+from array import array
+from heuristics import get_heuristic, node_heuristic
+from connectivity import disconnected
+from grid import PathIndex
+
+UNSEEN = 2**31 - 1     # g value of a node that has never been reached
+
+
+class ARAStarSearch:
+    """
+    Anytime Repairing A* (ARA*): weighted A* with f = g + w*h, run
+    with a falling weight. The first pass (w = weight) finds a path
+    quickly; each later pass lowers w by weight_step and carries on
+    from the previous pass's g values, re-expanding only the nodes
+    whose g improved after they were closed (kept in INCONS), until
+    w = 1 and the path is optimal or the budget runs out.
+
+    Budget: deadline_ms (time spent inside the engine, so pauses
+    between GUI frames do not count) and/or max_expansions. Neither is
+    checked before the first path is found, so a search with a budget
+    still returns one whenever a path exists. With no budget it runs
+    to the optimal path.
+
+    self.bound is the proven suboptimality of the current path, the
+    lower of the weight it was found with and cost / min(g + h) over
+    OPEN and INCONS (a lower bound on the optimal cost); 1.0 means
+    optimal. It is None until the first path is found.
+
+    Same step()/solve() interface and delta events as AStarSearch;
+    every event also carries "bound" and "cost" (those of the current
+    path, None before there is one), and solve() adds "bound".
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan",
+                 weight=3.0, weight_step=0.5, deadline_ms=None, max_expansions=None):
+        if weight < 1 or weight_step <= 0:
+            raise ValueError("need weight >= 1 and weight_step > 0")
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+        self.weight    = weight      # w of the pass under way
+        self.weight_step    = weight_step
+        self.deadline_ms    = deadline_ms
+        self.max_expansions = max_expansions
+
+        # Search state (indexed by flat id)
+        n = grid.rows * grid.cols
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.open_set  = []                          # min-heap: (g + w*h, g, id)
+        self.came_from = array("i", [-1]) * n        # id -> parent id
+        self.g_score   = array("i", [UNSEEN]) * n    # id -> best g so far
+        self.closed    = array("I", [0]) * n         # pass number it was closed in
+        self.visited   = bytearray(n)                # 1 once expanded in any pass
+        self.incons    = []                          # closed this pass, g improved since
+        self.passes    = 0
+        self.elapsed   = 0.0                         # seconds spent inside the engine
+
+        self.done      = False
+        self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
+        self.nodes_visited = 0
+        self.bound     = None            # proven suboptimality of the current path
+        self.lower     = 0               # lower bound on the optimal cost
+
+        # Initialise with start node; no path provably (see AStarSearch)
+        # leaves the open set empty
+        h = self.heuristic(start, goal)
+        self.g_score[self.start_id] = 0
+        if h != float("inf") and not disconnected(grid, self.start_id, self.goal_id):
+            heapq.heappush(self.open_set, (weight * h, 0, self.start_id))
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator performs ONE expansion.
+
+        Yields the same delta events as AStarSearch.step(), plus
+                "bound"   : float | None,    # see the class docstring
+                "cost"    : int | None       # cost of the current path
+        A pass after the first re-expands nodes already shown as visited.
+        """
+        cols = self.cols
+        for cur, added in self._run():
+            current = divmod(cur, cols)
+            yield {
+                "type"    : "step",
+                "current" : current,
+                "added"   : [divmod(i, cols) for i in added],
+                "removed" : [current],
+                "path"    : [],
+                "bound"   : self.bound,
+                "cost"    : len(self.path) - 1 if self.path else None
+            }
+
+        if self.bound is not None:
+            goal = divmod(self.goal_id, cols)
+            yield {
+                "type"    : "found",
+                "current" : goal,
+                "added"   : [],
+                "removed" : [goal],
+                "path"    : self.path,
+                "bound"   : self.bound,
+                "cost"    : len(self.path) - 1
+            }
+            return
+        yield {
+            "type"    : "no_path",
+            "current" : None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : [],
+            "bound"   : None,
+            "cost"    : None
+        }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same passes as step() without building events.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve(),
+            plus "bound" (None on "no_path")
+        """
+        for _ in self._run():
+            pass
+        if self.bound is not None:
+            return {"type": "found", "path": self.path, "cost": len(self.path) - 1,
+                    "nodes_visited": self.nodes_visited, "bound": self.bound}
+        return {"type": "no_path", "path": [], "cost": 0,
+                "nodes_visited": self.nodes_visited, "bound": None}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+    def _run(self):
+        """
+        Drive the passes, yielding (id, [ids newly reached]) per
+        expansion. Sets self.path / self.bound as paths are found.
+        """
+        clock = time.perf_counter
+        t0 = clock()
+        while True:
+            self.passes += 1
+            for expanded in self._improve():
+                self.elapsed += clock() - t0
+                yield expanded
+                t0 = clock()
+                if self.path and self._out_of_budget():
+                    self._publish(pass_done=False)   # keep what this pass gained
+                    self.done = True
+                    return
+            if self._cost() is None:                 # open list ran dry: no path
+                break
+            self._publish(pass_done=True)
+            if self.bound <= 1 or self._out_of_budget():
+                break
+            self._next_pass()
+        self.done = True
+        self.elapsed += clock() - t0
+
+    def _improve(self):
+        """One weighted A* pass, until no open node can beat the goal's g."""
+        heap, g, closed = self.open_set, self.g_score, self.closed
+        came_from, visited, incons = self.came_from, self.visited, self.incons
+        h_node, w, goal, it = self.h_node, self.weight, self.goal_id, self.passes
+        while heap:
+            key, g_entry, cur = heap[0]
+            if closed[cur] == it or g_entry != g[cur]:     # stale duplicate
+                heapq.heappop(heap)
+                continue
+            if g[goal] <= key:
+                return
+            heapq.heappop(heap)
+            closed[cur]  = it
+            visited[cur] = 1
+            self.nodes_visited += 1
+
+            added = []
+            tentative_g = g_entry + 1
+            for nb in self._neighbours(cur):
+                if tentative_g >= g[nb]:
+                    continue
+                if g[nb] == UNSEEN:
+                    added.append(nb)
+                g[nb]         = tentative_g
+                came_from[nb] = cur
+                if closed[nb] == it:
+                    incons.append(nb)          # reopened next pass
+                else:
+                    heapq.heappush(heap, (tentative_g + w * h_node(nb), tentative_g, nb))
+            yield cur, added
+
+    def _next_pass(self):
+        """Lower w, move INCONS into OPEN and re-key it; nothing is closed."""
+        self.weight = max(1.0, self.weight - self.weight_step)
+        g, w, h_node = self.g_score, self.weight, self.h_node
+        live = {i for _, g_entry, i in self.open_set if g_entry == g[i]}
+        live.update(self.incons)
+        self.incons = []
+        self.open_set = [(g[i] + w * h_node(i), g[i], i) for i in live]
+        heapq.heapify(self.open_set)
+
+    def _publish(self, pass_done):
+        """
+        Take the goal's current path. After a full pass its cost is
+        within w of optimal and the lower bound is refreshed from OPEN
+        and INCONS. Cut short, only the path can have got shorter, so
+        the last bounds still hold for it.
+        """
+        self.path = self._reconstruct_path()
+        self.path_index = PathIndex(self.path)
+        cost = len(self.path) - 1
+        if pass_done:
+            g, h_node = self.g_score, self.h_node
+            live = [g[i] + h_node(i) for _, g_entry, i in self.open_set
+                    if g_entry == g[i] and self.closed[i] != self.passes]
+            live += [g[i] + h_node(i) for i in self.incons]
+            self.lower = min(live, default=cost)
+        w_bound = self.weight if pass_done or self.bound is None else self.bound
+        if cost == 0 or (pass_done and self.lower >= cost):
+            self.bound = 1.0
+        elif self.lower > 0:
+            self.bound = min(w_bound, cost / self.lower)
+        else:
+            self.bound = w_bound
+
+    def _out_of_budget(self):
+        return ((self.deadline_ms is not None and self.elapsed * 1000 >= self.deadline_ms) or
+                (self.max_expansions is not None and self.nodes_visited >= self.max_expansions))
+
+    def _cost(self):
+        """g of the goal (None while unreached); may run ahead of self.path."""
+        g = self.g_score[self.goal_id]
+        return None if g == UNSEEN else g
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _neighbours(self, i):
+        """4-directional movement (no diagonals), on flat ids, from Grid.nbr."""
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            yield i + off
+
+    def _reconstruct_path(self):
+        path, node = [], self.goal_id
+        while node != -1:
+            path.append(divmod(node, self.cols))
+            node = self.came_from[node]
+        path.reverse()
+        return path
@@ -1,5 +1,13 @@
-import heapq
-from heuristics import manhattan, euclidean
+import math
+import time
+from array import array
+from heuristics import manhattan, euclidean, get_heuristic, node_heuristic
+from open_lists import make_open_list
+from connectivity import disconnected
+from grid import PathIndex
+from compact import dir_table, move_dir, set_dir, trace_path, unpack_dirs, pack_dirs
+
+UNSEEN = 2**31 - 1     # g value of a node that has never been reached
 
 
 class AStarSearch:
@@ -7,32 +15,60 @@ class AStarSearch:
     A* Search: f(n) = g(n) + h(n)
     Uses a generator to yield one step at a time so the GUI
     can animate frontier / visited nodes frame by frame.
+
+    Nodes are flat ids (r*cols + c) internally; search state lives in
+    compact tables sized to the grid (see compact.py): a 2-bit parent
+    direction and a visited bit per cell, plus g in an int array.
+    (r, c) tuples only appear in the events, the path and the
+    constructor arguments.
+
+    open_list / tie pick the priority queue backend and how equal f
+    values are ordered (see open_lists.py); the defaults reproduce the
+    original heapq behaviour. Queue counters are in self.open_set.stats;
+    probe= adds fuller counters and phase timings (see instrument.py).
     """
 
-    def __init__(self, grid, start, goal, heuristic="manhattan"):
+    def __init__(self, grid, start, goal, heuristic="manhattan",
+                 open_list="heap", tie="low_g", probe=None):
+        t0 = time.perf_counter()
         self.grid      = grid
         self.start     = start
         self.goal      = goal
-        self.heuristic = manhattan if heuristic == "manhattan" else euclidean
-
-        # Search state
-        self.open_set  = []          # min-heap: (f, g, node)
-        self.came_from = {}          # node -> parent node
-        self.g_score   = {}          # node -> best g cost so far
-        self.visited   = set()       # fully expanded nodes
-        self.frontier  = set()       # nodes currently in open_set
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+
+        # Search state (indexed by flat id)
+        n = grid.rows * grid.cols
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.open_set  = make_open_list(open_list, n, tie,
+                                        integer=heuristic != "euclidean")
+        self.came_from = dir_table(n)              # id -> move it was entered by (2 bits)
+        self.g_score   = array("i", [UNSEEN]) * n  # id -> best g so far
+        self.visited   = self.open_set.closed      # bit set once expanded (by pop)
 
         self.done      = False
         self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
         self.nodes_visited = 0
 
         # Initialise with start node
         g = 0
         h = self.heuristic(start, goal)
         f = g + h
-        heapq.heappush(self.open_set, (f, g, start))
-        self.g_score[start] = g
-        self.frontier.add(start)
+        self.g_score[self.start_id] = g
+        # Start and goal in different components (when the grid keeps a
+        # component index, see connectivity.py) or an infinite estimate
+        # from the landmark tables means no path: leave the open set
+        # empty so step() reports no_path without expanding.
+        if h != float("inf") and not disconnected(grid, self.start_id, self.goal_id):
+            self.open_set.push(self.start_id, f, g)
+
+        # Optional instrumentation (see instrument.py); None costs nothing
+        self.probe = probe
+        if probe is not None:
+            probe.attach(self, time.perf_counter() - t0)
 
     # ------------------------------------------------------------------
     # Generator — call next() each frame from the GUI
@@ -46,56 +82,63 @@ class AStarSearch:
         Yields:
             {
                 "type"    : "step" | "found" | "no_path",
-                "current" : (r, c),          # node being expanded
-                "visited" : set of (r,c),    # all expanded so far
-                "frontier": set of (r,c),    # all nodes in open set
+                "current" : (r, c),          # node expanded this step
+                "added"   : [(r,c), ...],    # nodes newly put on the frontier
+                "removed" : [(r,c), ...],    # nodes taken off the frontier
                 "path"    : [(r,c), ...]     # only on "found"
             }
-        """
-        while self.open_set:
-            _, g_cur, current = heapq.heappop(self.open_set)
-            self.frontier.discard(current)
 
-            # Skip stale entries (node was re-added with better g)
-            if current in self.visited:
-                continue
+        Only the change since the previous event is reported, so a
+        consumer's work per step is constant. A node is on the frontier
+        when it has a g_score but is not yet visited.
+        """
+        cols = self.cols
+        while True:
+            # The open list never hands out a node twice (stale
+            # duplicates are dropped inside it), so no visited check.
+            cur, g_cur = self.open_set.pop()
+            if cur < 0:
+                break
 
-            self.visited.add(current)
             self.nodes_visited += 1
+            current = divmod(cur, cols)
 
             # Goal reached
-            if current == self.goal:
+            if cur == self.goal_id:
                 self.path = self._reconstruct_path()
+                self.path_index = PathIndex(self.path)
                 self.done = True
                 yield {
                     "type"    : "found",
                     "current" : current,
-                    "visited" : self.visited,
-                    "frontier": self.frontier,
+                    "added"   : [],
+                    "removed" : [current],
                     "path"    : self.path
                 }
                 return
 
             # Expand neighbours
-            for neighbour in self._neighbours(current):
-                if neighbour in self.visited:
+            added = []
+            tentative_g = g_cur + 1   # uniform cost (each step = 1)
+            for nb in self._neighbours(cur):
+                if self.visited[nb >> 3] >> (nb & 7) & 1:
                     continue
 
-                tentative_g = g_cur + 1   # uniform cost (each step = 1)
-
-                if tentative_g < self.g_score.get(neighbour, float("inf")):
-                    self.came_from[neighbour] = current
-                    self.g_score[neighbour]   = tentative_g
-                    h = self.heuristic(neighbour, self.goal)
+                if tentative_g < self.g_score[nb]:
+                    nr, nc = divmod(nb, cols)
+                    if self.g_score[nb] == UNSEEN:
+                        added.append((nr, nc))
+                    set_dir(self.came_from, nb, move_dir(cur, nb))
+                    self.g_score[nb]   = tentative_g
+                    h = self.h_node(nb)
                     f = tentative_g + h
-                    heapq.heappush(self.open_set, (f, tentative_g, neighbour))
-                    self.frontier.add(neighbour)
+                    self.open_set.push(nb, f, tentative_g)
 
             yield {
                 "type"    : "step",
                 "current" : current,
-                "visited" : self.visited,
-                "frontier": self.frontier,
+                "added"   : added,
+                "removed" : [current],
                 "path"    : []
             }
 
@@ -104,11 +147,85 @@ class AStarSearch:
         yield {
             "type"    : "no_path",
             "current" : None,
-            "visited" : self.visited,
-            "frontier": self.frontier,
+            "added"   : [],
+            "removed" : [],
             "path"    : []
         }
 
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same search as step() in a tight loop, without the
+        per-expansion generator resume and event dicts. Expansion order
+        and tie-breaking are identical, so the returned path matches the
+        one step() would produce. The loop goes through the push / pop of
+        whichever open list the constructor picked, computes the common
+        heuristics in place and keeps parents a byte per cell until it
+        ends (see compact.unpack_dirs).
+
+        Returns:
+            {
+                "type"         : "found" | "no_path",
+                "path"         : [(r,c), ...],   # empty on "no_path"
+                "cost"         : int,            # len(path) - 1, or 0
+                "nodes_visited": int
+            }
+        """
+        if self.probe is not None:       # counted run: go through step()
+            return self.probe.solve()
+        nbr, steps = self.grid.nbr, self.grid.steps
+        cols       = self.cols
+        gr, gc     = self.goal
+        goal_id    = self.goal_id
+        h_node     = self.h_node
+        kind       = 1 if self.heuristic is manhattan else 2 if self.heuristic is euclidean else 0
+        sqrt       = math.sqrt
+        g_score    = self.g_score
+        dirs       = unpack_dirs(self.came_from)    # a byte per cell until the end
+        push, pop  = self.open_set.push, self.open_set.pop
+        expanded   = 0
+        found      = False
+
+        while True:
+            cur, g_cur = pop()
+            if cur < 0:
+                break
+            expanded += 1
+            if cur == goal_id:
+                found = True
+                break
+
+            r, c = divmod(cur, cols)
+            tentative_g = g_cur + 1
+            for off, dr, dc, d in steps[nbr[cur]]:        # passable moves only
+                nb = cur + off
+                # An expanded node already has its optimal g (the
+                # heuristics are consistent), so this also skips visited
+                if tentative_g >= g_score[nb]:
+                    continue
+                g_score[nb] = tentative_g
+                dirs[nb] = d
+                if kind == 1:
+                    h = abs(r + dr - gr) + abs(c + dc - gc)
+                elif kind == 2:
+                    y, x = r + dr - gr, c + dc - gc
+                    h = sqrt(y*y + x*x)
+                else:
+                    h = h_node(nb)
+                push(nb, tentative_g + h, tentative_g)
+
+        pack_dirs(self.came_from, dirs)
+        self.nodes_visited += expanded
+        self.done = True
+        if not found:
+            return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": self.nodes_visited}
+        self.path = self._reconstruct_path()
+        self.path_index = PathIndex(self.path)
+        return {"type": "found", "path": self.path,
+                "cost": len(self.path) - 1, "nodes_visited": self.nodes_visited}
+
     # ------------------------------------------------------------------
     # Re-planning support
     # ------------------------------------------------------------------
@@ -118,25 +235,15 @@ class AStarSearch:
         If the wall is on the current path, signals that re-planning
         is needed. Returns True if a replan is required.
         """
-        return cell in set(self.path)
+        return cell in self.path_index
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _neighbours(self, node):
-        """4-directional movement (no diagonals)."""
-        r, c = node
-        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < self.grid.rows and 0 <= nc < self.grid.cols:
-                if self.grid.cells[nr][nc] not in (1,):   # 1 = WALL
-                    yield (nr, nc)
+    def _neighbours(self, i):
+        """4-directional movement (no diagonals), on flat ids, from Grid.nbr."""
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            yield i + off
 
     def _reconstruct_path(self):
-        path, node = [], self.goal
-        while node in self.came_from:
-            path.append(node)
-            node = self.came_from[node]
-        path.append(self.start)
-        path.reverse()
-        return path
\ No newline at end of file
+        return trace_path(self.came_from, self.start_id, self.goal_id, self.cols)
@@ -0,0 +1,242 @@
+import heapq
+from heuristics import get_heuristic, node_heuristic
+from connectivity import components_for
+from grid import PathIndex
+from compact import bitset, dir_table, set_dir, trace_path
+
+DEFAULT_WIDTH = 256      # frontier cells kept by the first pass
+
+
+class BeamGBFSearch:
+    """
+    Beam-limited Greedy Best-First Search: GBFS whose frontier holds
+    at most `width` cells. When a new cell would overflow it, the cell
+    with the worst h is dropped (and may be found again later by
+    another route), so the frontier's memory and the cost of each
+    push stay bounded however large the map is.
+
+    A narrow beam can run dry in a dead end without reaching the goal.
+    The search then restarts with the width doubled, up to max_width;
+    after that the final pass is plain GBFS (no limit), so a path is
+    always found when one exists. max_width=None keeps doubling until
+    the beam can hold the whole grid. Like GBFS, paths are not optimal.
+
+    Same step()/solve() interface and delta events as GBFSearch
+    ("removed" also lists dropped cells; a later pass re-expands cells
+    already shown as visited). solve() adds "width", the beam width of
+    the pass that finished (None for unbounded), also self.width.
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan",
+                 width=DEFAULT_WIDTH, max_width=None):
+        if width < 1:
+            raise ValueError("width must be at least 1")
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+        self.max_width = max_width
+
+        # Search state (indexed by flat id), reset for every pass
+        n = grid.rows * grid.cols
+        self.n         = n
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.width     = width if max_width is None or width < max_width else max_width
+        self.beam      = []                      # min-heap: (h, -seq, id), best first
+        self.worst     = []                      # min-heap: (-h, seq, id), worst first
+        self.live      = {}                      # id on the beam -> seq of its entry
+        self.came_from = dir_table(n)            # id -> move it was entered by (2 bits)
+        self.seen      = bitset(n)               # bit set while on the beam or once expanded
+        self.visited   = bitset(n)               # bit set once expanded
+        self.passes    = 0
+
+        self.done      = False
+        self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
+        self.nodes_visited = 0
+        self.dropped   = 0               # cells pushed off a full beam, all passes
+
+        # Provably unreachable (see AStarSearch): no pass is run at all
+        h = self.heuristic(start, goal)
+        self.reachable = (h != float("inf") and
+                          components_for(grid).connected(self.start_id, self.goal_id))
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator performs ONE expansion.
+
+        Yields the same delta events as GBFSearch.step().
+        """
+        cols = self.cols
+        for cur, added, dropped in self._run():
+            current = divmod(cur, cols)
+            if cur == self.goal_id:
+                yield {
+                    "type"    : "found",
+                    "current" : current,
+                    "added"   : [],
+                    "removed" : [current],
+                    "path"    : self.path
+                }
+                return
+            yield {
+                "type"    : "step",
+                "current" : current,
+                "added"   : [divmod(i, cols) for i in added],
+                "removed" : [current] + [divmod(i, cols) for i in dropped],
+                "path"    : []
+            }
+
+        yield {
+            "type"    : "no_path",
+            "current" : None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : []
+        }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same passes as step() without building events.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as GBFSearch.solve(),
+            plus "width"
+        """
+        for _ in self._run():
+            pass
+        if self.path:
+            return {"type": "found", "path": self.path, "cost": len(self.path) - 1,
+                    "nodes_visited": self.nodes_visited, "width": self.width}
+        return {"type": "no_path", "path": [], "cost": 0,
+                "nodes_visited": self.nodes_visited, "width": self.width}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+    def _run(self):
+        """
+        Beam passes, widening until the goal is reached; yields
+        (id, [ids put on the beam], [ids dropped from it]) per expansion.
+        """
+        if not self.reachable:
+            self.done = True
+            return
+        while True:
+            self.passes += 1
+            yield from self._pass()
+            if self.path or self.width is None:
+                break
+            self._widen()
+        self.done = True
+
+    def _pass(self):
+        """
+        One beam pass from the start under self.width.
+
+        The beam is two heaps over the same entries, one to expand the
+        best and one to drop the worst, with lazy deletion: an entry is
+        live while self.live maps its id to its seq, and is skipped when
+        it surfaces after its cell was expanded or dropped. The worst
+        heap is only built once the beam first fills, so a pass that
+        never drops (always the unbounded one) runs on one heap.
+        """
+        beam, worst, live = self.beam, self.worst, self.live
+        h_node, goal = self.h_node, self.goal_id
+        came_from, seen, visited = self.came_from, self.seen, self.visited
+        nbr, steps = self.grid.nbr, self.grid.steps
+        full = self.width if self.width is not None else self.n + 1
+        push, pop = heapq.heappush, heapq.heappop
+        start = self.start_id
+        seq = 0
+        seen[start >> 3] |= 1 << (start & 7)
+        live[start] = seq
+        push(beam, (h_node(start), -seq, start))
+        while live:
+            _, s, cur = pop(beam)
+            if live.get(cur) != -s:
+                continue                            # expanded or dropped
+            del live[cur]
+            visited[cur >> 3] |= 1 << (cur & 7)
+            self.nodes_visited += 1
+            if cur == goal:
+                self.path = self._reconstruct_path()
+                self.path_index = PathIndex(self.path)
+                yield cur, [], []
+                return
+
+            added, dropped = [], []
+            for off, _, _, d in steps[nbr[cur]]:
+                nb = cur + off
+                if seen[nb >> 3] >> (nb & 7) & 1:
+                    continue
+                h = h_node(nb)
+                if len(live) >= full:
+                    if not worst:                   # first time full: every beam entry is live
+                        worst[:] = [(-eh, -es, i) for eh, es, i in beam]
+                        heapq.heapify(worst)
+                    while live.get(worst[0][2]) != worst[0][1]:
+                        pop(worst)
+                    if h > -worst[0][0]:            # worse than all it would displace
+                        continue
+                    w = pop(worst)[2]
+                    del live[w]
+                    seen[w >> 3] &= ~(1 << (w & 7))
+                    if w in added:                  # pushed and dropped by this expansion
+                        added.remove(w)
+                    else:
+                        dropped.append(w)
+                    self.dropped += 1
+                seq += 1
+                seen[nb >> 3] |= 1 << (nb & 7)
+                set_dir(came_from, nb, d)
+                live[nb] = seq
+                push(beam, (h, -seq, nb))
+                added.append(nb)
+                if worst:
+                    push(worst, (-h, seq, nb))
+                    if len(beam) + len(worst) > 4 * full:
+                        self._compact()
+            yield cur, added, dropped
+
+    def _compact(self):
+        """Drop dead entries from both heaps (at least half of them are)."""
+        live = self.live
+        self.beam[:]  = [e for e in self.beam if live.get(e[2]) == -e[1]]
+        self.worst[:] = [e for e in self.worst if live.get(e[2]) == e[1]]
+        heapq.heapify(self.beam)
+        heapq.heapify(self.worst)
+
+    def _widen(self):
+        """Double the width (unbounded past max_width or the grid) and reset."""
+        width = self.width * 2
+        if width >= self.n or (self.max_width is not None and width > self.max_width):
+            width = None
+        self.width     = width
+        self.beam      = []
+        self.worst     = []
+        self.live      = {}
+        self.seen      = bitset(self.n)
+        self.visited   = bitset(self.n)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _reconstruct_path(self):
+        return trace_path(self.came_from, self.start_id, self.goal_id, self.cols)
@@ -0,0 +1,226 @@
+import heapq
+from array import array
+from heuristics import get_heuristic, node_heuristic
+from open_lists import TIES
+from connectivity import disconnected
+from grid import PathIndex
+
+UNSEEN = 2**31 - 1     # g value of a node that has never been reached
+FWD, BWD = 0, 1        # search sides: from the start / from the goal
+
+
+class BidirectionalAStarSearch:
+    """
+    Bidirectional A*: one A* from the start towards the goal and one
+    from the goal towards the start, each guided by the heuristic to
+    its own target (front-to-end). Each step expands one node on the
+    side with the smaller open list, so neither ball grows far ahead.
+
+    mu is the cost of the best start-goal path seen so far, found where
+    a node reached by one side is reached by the other. The search stops
+    once the best f on either open list is >= mu: with a consistent
+    heuristic each side's open list holds a node of any shorter path at
+    f <= that path's cost, so none can be left. Paths are optimal.
+
+    Ties on f go to the deeper node by default (tie="high_g", see
+    open_lists.py): on open maps whole plateaus share one f, and the
+    sides then dive at each other and meet early instead of each
+    flooding its plateau first.
+
+    Same step()/solve() interface and delta events as AStarSearch;
+    "current" / "added" report nodes of both sides, so both frontiers
+    show in the GUI. nodes_visited counts expansions on both sides.
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan", tie="high_g"):
+        if tie not in TIES:
+            raise ValueError(f"unknown tie-breaking {tie!r} (choose from {', '.join(TIES)})")
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = (node_heuristic(heuristic, grid, goal),    # FWD: towards the goal
+                          node_heuristic(heuristic, grid, start))   # BWD: towards the start
+
+        # Search state per side (indexed by flat id)
+        n = grid.rows * grid.cols
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.open_set  = ([], [])                                # min-heaps: (f, ±g, id)
+        self.sign      = 1 if tie == "low_g" else -1
+        self.came_from = tuple(array("i", [-1]) * n for _ in range(2))
+        self.g_score   = tuple(array("i", [UNSEEN]) * n for _ in range(2))
+        self.visited   = tuple(bytearray(n) for _ in range(2))
+        self.mu        = float("inf")    # best path cost seen through a meeting node
+        self.meet      = -1              # that meeting node
+
+        self.done      = False
+        self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
+        self.nodes_visited = 0
+
+        # Initialise both sides; different components (or an infinite
+        # landmark estimate) means no path, so leave both empty
+        h = self.heuristic(start, goal)
+        if h != float("inf") and not disconnected(grid, self.start_id, self.goal_id):
+            for side, root in ((FWD, self.start_id), (BWD, self.goal_id)):
+                self.g_score[side][root] = 0
+                heapq.heappush(self.open_set[side], (h, 0, root))
+            if self.start_id == self.goal_id:
+                self.mu, self.meet = 0, self.start_id
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator performs ONE expansion,
+        on whichever side is due.
+
+        Yields the same delta events as AStarSearch.step():
+            {
+                "type"    : "step" | "found" | "no_path",
+                "current" : (r, c),
+                "added"   : [(r,c), ...],
+                "removed" : [(r,c), ...],
+                "path"    : [(r,c), ...]     # only on "found"
+            }
+        A node counts as added when its own side first reaches it.
+        """
+        cols = self.cols
+        while True:
+            expanded = self._expand()
+            if expanded is None:
+                break
+            cur, added = expanded
+            current = divmod(cur, cols)
+            yield {
+                "type"    : "step",
+                "current" : current,
+                "added"   : [divmod(i, cols) for i in added],
+                "removed" : [current],
+                "path"    : []
+            }
+
+        self.done = True
+        if self.meet >= 0:
+            self.path = self._reconstruct_path()
+            self.path_index = PathIndex(self.path)
+            meet = divmod(self.meet, cols)
+            yield {
+                "type"    : "found",
+                "current" : meet,
+                "added"   : [],
+                "removed" : [meet],
+                "path"    : self.path
+            }
+            return
+        yield {
+            "type"    : "no_path",
+            "current" : None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : []
+        }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same expansions as step() without building events.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve()
+        """
+        expand = self._expand
+        while expand() is not None:
+            pass
+        self.done = True
+        if self.meet >= 0:
+            self.path = self._reconstruct_path()
+            self.path_index = PathIndex(self.path)
+            return {"type": "found", "path": self.path,
+                    "cost": len(self.path) - 1, "nodes_visited": self.nodes_visited}
+        return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": self.nodes_visited}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+    def _top(self, side):
+        """f of the best live entry on side's open list (inf if empty)."""
+        heap, g, closed = self.open_set[side], self.g_score[side], self.visited[side]
+        sign = self.sign
+        while heap:
+            f, t, node = heap[0]
+            if closed[node] or sign * t != g[node]:   # superseded by a better g
+                heapq.heappop(heap)
+                continue
+            return f
+        return float("inf")
+
+    def _expand(self):
+        """
+        Expand one node on the side with the smaller open list.
+        Returns (id, [ids newly reached by that side]), or None once the
+        stopping criterion holds (self.meet >= 0 if a path was found).
+        """
+        top_f, top_b = self._top(FWD), self._top(BWD)
+        if max(top_f, top_b) >= self.mu:
+            return None
+        side = FWD if len(self.open_set[FWD]) <= len(self.open_set[BWD]) else BWD
+        if (top_f, top_b)[side] == float("inf"):
+            side = 1 - side
+        heap = self.open_set[side]
+        g, came_from, closed = self.g_score[side], self.came_from[side], self.visited[side]
+        g_other, h_node = self.g_score[1 - side], self.h_node[side]
+
+        sign = self.sign
+        _, t, cur = heapq.heappop(heap)
+        g_cur = sign * t
+        closed[cur] = 1
+        self.nodes_visited += 1
+
+        added = []
+        tentative_g = g_cur + 1
+        for nb in self._neighbours(cur):
+            if closed[nb] or tentative_g >= g[nb]:
+                continue
+            if g[nb] == UNSEEN:
+                added.append(nb)
+            g[nb]         = tentative_g
+            came_from[nb] = cur
+            heapq.heappush(heap, (tentative_g + h_node(nb), sign * tentative_g, nb))
+            if g_other[nb] != UNSEEN and tentative_g + g_other[nb] < self.mu:
+                self.mu, self.meet = tentative_g + g_other[nb], nb
+        return cur, added
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _neighbours(self, i):
+        """4-directional movement (no diagonals), on flat ids, from Grid.nbr."""
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            yield i + off
+
+    def _reconstruct_path(self):
+        """Start -> meeting node along FWD parents, then on to the goal along BWD ones."""
+        fwd, bwd = self.came_from
+        path, node = [], self.meet
+        while node != -1:
+            path.append(divmod(node, self.cols))
+            node = fwd[node]
+        path.reverse()
+        node = bwd[self.meet]
+        while node != -1:
+            path.append(divmod(node, self.cols))
+            node = bwd[node]
+        return path
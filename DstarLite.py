@@ -0,0 +1,302 @@
+import heapq
+from array import array
+from heuristics import get_heuristic, node_heuristic
+
+INF = 2**31 - 1        # g / rhs of a cell with no known route to the goal
+
+
+class DStarLiteSearch:
+    """
+    D* Lite: incremental replanning (Koenig & Likhachev).
+    Searches backwards from the goal, keeping g / rhs values between
+    map changes. When a wall is added or removed only the cells whose
+    distance-to-goal actually changes are re-expanded, so a replan costs
+    roughly the size of the change instead of the size of the map.
+
+    Nodes are flat ids (r*cols + c) with g / rhs in int arrays, and
+    successors come from Grid.nbr, as in AStarSearch; (r, c) tuples
+    only appear in the events, the path and the public methods.
+
+    Same step()/solve() interface and delta events as AStarSearch.
+    Frontier changes made by notify_wall_added / notify_wall_removed are
+    reported with the next event step() yields.
+    """
+
+    incremental = True
+
+    def __init__(self, grid, start, goal, heuristic="manhattan"):
+        # Queued keys must stay lower bounds across map edits, and the
+        # landmark bound moves with the walls (a removed wall can shrink
+        # it below a key already in the heap): use Manhattan instead
+        if heuristic == "landmark":
+            heuristic = "manhattan"
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_name    = heuristic
+        self.h_node    = node_heuristic(heuristic, grid, start)   # flat id -> h to start
+
+        # Search state (indexed by flat id)
+        n = grid.rows * grid.cols
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.g         = array("i", [INF]) * n   # id -> distance to goal (consistent part)
+        self.rhs       = array("i", [INF]) * n   # id -> one-step lookahead of g
+        self.open_set  = []                      # min-heap: (k1, k2, id), lazily pruned
+        self.entry     = [None] * n              # id -> its live entry in open_set
+        self.km        = 0           # key modifier, grows as the start moves
+        self.last      = start       # start used when km was last updated
+        self.pending   = [], []      # ids opened / closed by map changes, not yet reported
+
+        self.done      = False
+        self.path      = []
+        self.nodes_visited = 0
+
+        # Initialise with goal node
+        self.rhs[self.goal_id] = 0
+        self._push(self.goal_id)
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator performs ONE expansion of
+        the repair loop. Map changes reported through notify_wall_added /
+        notify_wall_removed between calls are picked up by the running
+        generator; once it has finished, call step() again to repair.
+
+        Yields the same delta events as AStarSearch.step():
+            {
+                "type"    : "step" | "found" | "no_path",
+                "current" : (r, c),
+                "added"   : [(r,c), ...],
+                "removed" : [(r,c), ...],
+                "path"    : [(r,c), ...]     # only on "found"
+            }
+        """
+        self.done = False
+        while self._needs_repair():
+            current, added, removed = self._expand()
+            if current < 0:
+                continue
+            added, removed = self._deltas(added, removed)
+            yield {
+                "type"    : "step",
+                "current" : divmod(current, self.cols),
+                "added"   : added,
+                "removed" : removed,
+                "path"    : []
+            }
+
+        self.done = True
+        self.path = self._extract_path()
+        added, removed = self._deltas([], [])
+        if self.path:
+            yield {
+                "type"    : "found",
+                "current" : self.start,
+                "added"   : added,
+                "removed" : removed,
+                "path"    : self.path
+            }
+        else:
+            yield {
+                "type"    : "no_path",
+                "current" : None,
+                "added"   : added,
+                "removed" : removed,
+                "path"    : []
+            }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs (or resumes) the repair loop to completion.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve()
+        """
+        while self._needs_repair():
+            self._expand()
+        self.pending = [], []        # no event to report them in
+        self.done = True
+        self.path = self._extract_path()
+        if self.path:
+            return {"type": "found", "path": self.path,
+                    "cost": len(self.path) - 1, "nodes_visited": self.nodes_visited}
+        return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": self.nodes_visited}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """
+        Called after a wall has been written into the grid at cell.
+        Invalidates the cell and re-evaluates its neighbours; the actual
+        repair happens in the next step()/solve(). Returns True if the
+        current solution is affected and a repair pass is needed.
+        """
+        self._cell_changed(self.grid.index(cell))
+        return self._needs_repair()
+
+    def notify_wall_removed(self, cell):
+        """
+        Called after a wall at cell has been cleared in the grid.
+        Returns True if a repair pass is needed (a shorter route may
+        now exist through the freed cell).
+        """
+        self._cell_changed(self.grid.index(cell))
+        return self._needs_repair()
+
+    def move_start(self, cell):
+        """
+        Move the search start (e.g. to the agent's current cell) without
+        discarding any state. km absorbs the heuristic shift so queued
+        keys stay valid lower bounds.
+        """
+        self.km      += self.heuristic(self.last, cell)
+        self.last     = cell
+        self.start    = cell
+        self.start_id = self.grid.index(cell)
+        self.h_node   = node_heuristic(self.h_name, self.grid, cell)
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+    def _key(self, i):
+        m = min(self.g[i], self.rhs[i])
+        return (m + self.h_node(i) + self.km, m)
+
+    def _push(self, i):
+        m = min(self.g[i], self.rhs[i])
+        entry = (m + self.h_node(i) + self.km, m, i)
+        self.entry[i] = entry
+        heapq.heappush(self.open_set, entry)
+
+    def _top(self):
+        """Return the live minimum heap entry, dropping stale ones."""
+        heap, live = self.open_set, self.entry
+        while heap:
+            if live[heap[0][2]] is heap[0]:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _needs_repair(self):
+        top = self._top()
+        if top is None:
+            return False
+        s = self.start_id
+        return top[:2] < self._key(s) or self.rhs[s] != self.g[s]
+
+    def _expand(self):
+        """
+        One iteration of ComputeShortestPath. Returns (id, added,
+        removed) for the expanded node, or (-1, ...) when the top entry
+        only had its key refreshed.
+        """
+        k1, k2, u = self._top()
+        added, removed = [], []
+        if (k1, k2) < self._key(u):
+            self._push(u)
+            return -1, added, removed
+
+        heapq.heappop(self.open_set)
+        self.entry[u] = None
+        removed.append(u)
+        self.nodes_visited += 1
+
+        g, rhs, entry = self.g, self.rhs, self.entry
+        # Walled neighbours need no update: a wall's rhs is INF, and one
+        # whose g was still finite was queued when the wall went in
+        around = self.grid.steps[self.grid.nbr[u]]
+        if g[u] > rhs[u]:
+            # Overconsistent: g only fell, so a neighbour's rhs can only
+            # drop to g[u] + 1 and needs no rescan of its own neighbours
+            g[u] = v = rhs[u]
+            v += 1
+            for off, _, _, _ in around:
+                s = u + off
+                if v < rhs[s]:
+                    rhs[s] = v
+                    if g[s] != v:
+                        if entry[s] is None:
+                            added.append(s)
+                        self._push(s)
+                    elif entry[s] is not None:
+                        entry[s] = None
+                        removed.append(s)
+        else:
+            g[u] = INF
+            self._update_vertex(u, added, removed)
+            for off, _, _, _ in around:
+                self._update_vertex(u + off, added, removed)
+        return u, added, removed
+
+    def _update_vertex(self, u, added, removed):
+        g, rhs = self.g, self.rhs
+        if u != self.goal_id:
+            best = INF
+            if self.grid.data[u] != 1:                      # 1 = WALL
+                for off, _, _, _ in self.grid.steps[self.grid.nbr[u]]:
+                    v = g[u + off] + 1
+                    if v < best:
+                        best = v
+            rhs[u] = best
+        was_open = self.entry[u] is not None
+        if g[u] != rhs[u]:
+            self._push(u)
+            if not was_open:
+                added.append(u)
+        elif was_open:
+            self.entry[u] = None
+            removed.append(u)
+
+    def _cell_changed(self, i):
+        """Re-evaluate i and its neighbours; queue the frontier change for step()."""
+        added, removed = self.pending
+        self._update_vertex(i, added, removed)
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            self._update_vertex(i + off, added, removed)
+
+    def _deltas(self, added, removed):
+        """
+        Cells for an event: pending map-change deltas first, then this
+        expansion's, reduced to where each cell ended up so a cell both
+        opened and closed since the last event is reported once.
+        """
+        p_added, p_removed = self.pending
+        if p_added or p_removed:
+            added, removed = p_added + added, p_removed + removed
+            self.pending = [], []
+        live, cols = self.entry, self.cols
+        return ([divmod(i, cols) for i in dict.fromkeys(added) if live[i] is not None],
+                [divmod(i, cols) for i in dict.fromkeys(removed) if live[i] is None])
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _extract_path(self):
+        """Follow the steepest descent of g from start to goal."""
+        g, data, nbr, steps = self.g, self.grid.data, self.grid.nbr, self.grid.steps
+        i = self.start_id
+        if g[i] == INF or data[i] == 1:                     # 1 = WALL
+            return []
+        cols  = self.cols
+        path  = [divmod(i, cols)]
+        limit = len(data)
+        while i != self.goal_id and len(path) <= limit:
+            best, best_g = -1, INF
+            for off, _, _, _ in steps[nbr[i]]:
+                if g[i + off] < best_g:
+                    best, best_g = i + off, g[i + off]
+            if best < 0:
+                return []
+            path.append(divmod(best, cols))
+            i = best
+        return path if i == self.goal_id else []
@@ -1,5 +1,10 @@
-import heapq
-from heuristics import manhattan, euclidean
+import math
+import time
+from heuristics import manhattan, euclidean, get_heuristic, node_heuristic
+from open_lists import make_open_list
+from connectivity import disconnected
+from grid import PathIndex
+from compact import bitset, dir_table, move_dir, set_dir, trace_path
 
 
 class GBFSearch:
@@ -8,28 +13,51 @@ class GBFSearch:
     Only uses the heuristic — ignores path cost g(n).
     Faster than A* but not guaranteed to find the optimal path.
     Uses a generator to yield one step at a time for GUI animation.
+
+    Nodes are flat ids (r*cols + c) internally, with compact state as
+    in AStarSearch; GBFS keeps no g at all.
+    open_list selects the queue backend as in AStarSearch; a node is
+    queued at most once, so there is nothing for tie to order by and
+    it is accepted only for a uniform constructor. probe= as in
+    AStarSearch.
     """
 
-    def __init__(self, grid, start, goal, heuristic="manhattan"):
+    def __init__(self, grid, start, goal, heuristic="manhattan",
+                 open_list="heap", tie="low_g", probe=None):
+        t0 = time.perf_counter()
         self.grid      = grid
         self.start     = start
         self.goal      = goal
-        self.heuristic = manhattan if heuristic == "manhattan" else euclidean
-
-        # Search state
-        self.open_set  = []          # min-heap: (h, node)
-        self.came_from = {}          # node -> parent node
-        self.visited   = set()       # fully expanded nodes
-        self.frontier  = set()       # nodes currently in open_set
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+
+        # Search state (indexed by flat id)
+        n = grid.rows * grid.cols
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.open_set  = make_open_list(open_list, n, tie,
+                                        integer=heuristic != "euclidean")
+        self.came_from = dir_table(n)            # id -> move it was entered by (2 bits)
+        self.seen      = bitset(n)               # bit set once pushed (visited | frontier)
+        self.visited   = self.open_set.closed    # bit set once expanded (by pop)
 
         self.done      = False
         self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
         self.nodes_visited = 0
 
         # Initialise with start node
         h = self.heuristic(start, goal)
-        heapq.heappush(self.open_set, (h, start))
-        self.frontier.add(start)
+        self.seen[self.start_id >> 3] |= 1 << (self.start_id & 7)
+        # Provably unreachable: leave the open set empty, see AStarSearch
+        if h != float("inf") and not disconnected(grid, self.start_id, self.goal_id):
+            self.open_set.push(self.start_id, h, 0)
+
+        # Optional instrumentation (see instrument.py); None costs nothing
+        self.probe = probe
+        if probe is not None:
+            probe.attach(self, time.perf_counter() - t0)
 
     # ------------------------------------------------------------------
     # Generator — call next() each frame from the GUI
@@ -41,51 +69,57 @@ class GBFSearch:
         Yields:
             {
                 "type"    : "step" | "found" | "no_path",
-                "current" : (r, c),
-                "visited" : set of (r,c),
-                "frontier": set of (r,c),
+                "current" : (r, c),          # node expanded this step
+                "added"   : [(r,c), ...],    # nodes newly put on the frontier
+                "removed" : [(r,c), ...],    # nodes taken off the frontier
                 "path"    : [(r,c), ...]     # only on "found"
             }
-        """
-        while self.open_set:
-            _, current = heapq.heappop(self.open_set)
-            self.frontier.discard(current)
 
-            # Skip stale entries
-            if current in self.visited:
-                continue
+        Only the change since the previous event is reported, so a
+        consumer's work per step is constant. A node is on the frontier
+        when it is seen but not yet visited.
+        """
+        cols = self.cols
+        while True:
+            cur, _ = self.open_set.pop()
+            if cur < 0:
+                break
 
-            self.visited.add(current)
             self.nodes_visited += 1
+            current = divmod(cur, cols)
 
             # Goal reached
-            if current == self.goal:
+            if cur == self.goal_id:
                 self.path = self._reconstruct_path()
+                self.path_index = PathIndex(self.path)
                 self.done = True
                 yield {
                     "type"    : "found",
                     "current" : current,
-                    "visited" : self.visited,
-                    "frontier": self.frontier,
+                    "added"   : [],
+                    "removed" : [current],
                     "path"    : self.path
                 }
                 return
 
             # Expand neighbours
-            for neighbour in self._neighbours(current):
-                if neighbour in self.visited or neighbour in self.frontier:
+            added = []
+            for nb in self._neighbours(cur):
+                if self.seen[nb >> 3] >> (nb & 7) & 1:
                     continue
 
-                self.came_from[neighbour] = current
-                h = self.heuristic(neighbour, self.goal)
-                heapq.heappush(self.open_set, (h, neighbour))
-                self.frontier.add(neighbour)
+                nr, nc = divmod(nb, cols)
+                self.seen[nb >> 3] |= 1 << (nb & 7)
+                set_dir(self.came_from, nb, move_dir(cur, nb))
+                h = self.h_node(nb)
+                self.open_set.push(nb, h, 0)
+                added.append((nr, nc))
 
             yield {
                 "type"    : "step",
                 "current" : current,
-                "visited" : self.visited,
-                "frontier": self.frontier,
+                "added"   : added,
+                "removed" : [current],
                 "path"    : []
             }
 
@@ -94,11 +128,76 @@ class GBFSearch:
         yield {
             "type"    : "no_path",
             "current" : None,
-            "visited" : self.visited,
-            "frontier": self.frontier,
+            "added"   : [],
+            "removed" : [],
             "path"    : []
         }
 
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same search as step() in a tight loop, without the
+        per-expansion generator resume and event dicts, through the open
+        list the constructor picked. Returns the same path step() would.
+
+        Returns:
+            {
+                "type"         : "found" | "no_path",
+                "path"         : [(r,c), ...],   # empty on "no_path"
+                "cost"         : int,            # len(path) - 1, or 0
+                "nodes_visited": int
+            }
+        """
+        if self.probe is not None:       # counted run: go through step()
+            return self.probe.solve()
+        nbr, steps = self.grid.nbr, self.grid.steps
+        cols       = self.cols
+        gr, gc     = self.goal
+        goal_id    = self.goal_id
+        h_node     = self.h_node
+        kind       = 1 if self.heuristic is manhattan else 2 if self.heuristic is euclidean else 0
+        sqrt       = math.sqrt
+        seen, came_from = self.seen, self.came_from
+        push, pop  = self.open_set.push, self.open_set.pop
+        expanded   = 0
+        found      = False
+
+        while True:
+            cur, _ = pop()
+            if cur < 0:
+                break
+            expanded += 1
+            if cur == goal_id:
+                found = True
+                break
+
+            r, c = divmod(cur, cols)
+            for off, dr, dc, d in steps[nbr[cur]]:        # passable moves only
+                nb = cur + off
+                if seen[nb >> 3] >> (nb & 7) & 1:
+                    continue
+                seen[nb >> 3] |= 1 << (nb & 7)
+                came_from[nb >> 2] |= d << ((nb & 3) << 1)      # set once: no clear needed
+                if kind == 1:
+                    h = abs(r + dr - gr) + abs(c + dc - gc)
+                elif kind == 2:
+                    y, x = r + dr - gr, c + dc - gc
+                    h = sqrt(y*y + x*x)
+                else:
+                    h = h_node(nb)
+                push(nb, h, 0)
+
+        self.nodes_visited += expanded
+        self.done = True
+        if not found:
+            return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": self.nodes_visited}
+        self.path = self._reconstruct_path()
+        self.path_index = PathIndex(self.path)
+        return {"type": "found", "path": self.path,
+                "cost": len(self.path) - 1, "nodes_visited": self.nodes_visited}
+
     # ------------------------------------------------------------------
     # Re-planning support
     # ------------------------------------------------------------------
@@ -108,25 +207,15 @@ class GBFSearch:
         Returns True if the wall lands on the current path,
         meaning a replan is required.
         """
-        return cell in set(self.path)
+        return cell in self.path_index
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _neighbours(self, node):
-        """4-directional movement (no diagonals)."""
-        r, c = node
-        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < self.grid.rows and 0 <= nc < self.grid.cols:
-                if self.grid.cells[nr][nc] not in (1,):   # 1 = WALL
-                    yield (nr, nc)
+    def _neighbours(self, i):
+        """4-directional movement (no diagonals), on flat ids, from Grid.nbr."""
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            yield i + off
 
     def _reconstruct_path(self):
-        path, node = [], self.goal
-        while node in self.came_from:
-            path.append(node)
-            node = self.came_from[node]
-        path.append(self.start)
-        path.reverse()
-        return path
\ No newline at end of file
+        return trace_path(self.came_from, self.start_id, self.goal_id, self.cols)
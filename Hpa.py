@@ -0,0 +1,223 @@
+import heapq
+from heuristics import get_heuristic, node_heuristic
+from connectivity import components_for
+from clusters import CLUSTER, graph_for
+from grid import PathIndex
+
+
+class HPAStarSearch:
+    """
+    Hierarchical A* (HPA*) over the grid's shared ClusterGraph (see
+    clusters.py). Start and goal are linked into the abstract graph by
+    a BFS inside their own clusters, A* runs over the entrance nodes,
+    and each abstract edge is then refined into cells by a BFS inside
+    the one cluster it crosses.
+
+    The abstract graph has a few nodes per cluster instead of
+    cluster**2 cells, so expansions drop by roughly that factor and a
+    query's cost follows the path length in clusters rather than the
+    area searched. Ties on f go to the deeper node: whole bands of
+    entrances share one f on open maps and would otherwise all be
+    expanded.
+
+    Paths are near-optimal, not optimal: routes are forced through the
+    chosen entrance cells, so each border crossed can add a detour
+    along it of up to about 2*cluster steps. Over long routes that is
+    usually a few percent; short routes near a border suffer most.
+
+    Same step()/solve() interface and delta events as AStarSearch;
+    "current" / "added" report abstract nodes, "path" is the full cell
+    path. cells_scanned counts cells the cluster-local BFS touched for
+    this query, including clusters whose edges it had to (re)build.
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan", cluster=CLUSTER):
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+
+        # Search state (abstract nodes are sparse flat ids, so dicts)
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.graph     = graph_for(grid, cluster)
+        self.open_set  = []          # min-heap: (f, -g, id)
+        self.came_from = {}          # abstract node -> parent node
+        self.g_score   = {}          # abstract node -> best g so far
+        self.visited   = set()       # expanded abstract nodes
+        self.start_links = []        # [(node, cost), ...] out of the start
+        self.goal_links  = {}        # node -> cost on to the goal
+
+        self.done      = False
+        self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
+        self.nodes_visited = 0
+        self.cells_scanned = 0
+
+        # Initialise: link start and goal into their clusters, unless
+        # they are provably apart (see AStarSearch)
+        h = self.heuristic(start, goal)
+        if h != float("inf") and components_for(grid).connected(self.start_id, self.goal_id):
+            scanned = self.graph.cells_scanned
+            self._link_endpoints()
+            self.cells_scanned += self.graph.cells_scanned - scanned
+            self.g_score[self.start_id] = 0
+            heapq.heappush(self.open_set, (h, 0, self.start_id))
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator expands ONE abstract node.
+
+        Yields the same delta events as AStarSearch.step():
+            {
+                "type"    : "step" | "found" | "no_path",
+                "current" : (r, c),          # abstract node expanded
+                "added"   : [(r,c), ...],    # abstract nodes newly opened
+                "removed" : [(r,c), ...],
+                "path"    : [(r,c), ...]     # only on "found"
+            }
+        """
+        cols = self.cols
+        while self.open_set:
+            _, neg_g, cur = heapq.heappop(self.open_set)
+            if cur in self.visited:
+                continue
+
+            self.visited.add(cur)
+            self.nodes_visited += 1
+            current = divmod(cur, cols)
+
+            if cur == self.goal_id:
+                self._finish()
+                yield {
+                    "type"    : "found",
+                    "current" : current,
+                    "added"   : [],
+                    "removed" : [current],
+                    "path"    : self.path
+                }
+                return
+
+            added = [divmod(i, cols) for i in self._expand(cur, -neg_g)]
+            yield {
+                "type"    : "step",
+                "current" : current,
+                "added"   : added,
+                "removed" : [current],
+                "path"    : []
+            }
+
+        self.done = True
+        yield {
+            "type"    : "no_path",
+            "current" : None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : []
+        }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the search to completion without yielding.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve()
+        """
+        open_set, visited = self.open_set, self.visited
+        while open_set:
+            _, neg_g, cur = heapq.heappop(open_set)
+            if cur in visited:
+                continue
+            visited.add(cur)
+            self.nodes_visited += 1
+            if cur == self.goal_id:
+                self._finish()
+                return {"type": "found", "path": self.path,
+                        "cost": len(self.path) - 1, "nodes_visited": self.nodes_visited}
+            self._expand(cur, -neg_g)
+
+        self.done = True
+        return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": self.nodes_visited}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
+
+    # ------------------------------------------------------------------
+    # Abstract search
+    # ------------------------------------------------------------------
+    def _link_endpoints(self):
+        """Costs from the start to its cluster's nodes, and on to the goal from the goal's."""
+        graph = self.graph
+        dist, _ = graph.local_distances(self.start_id)
+        k = graph.cluster_of(self.start_id)
+        self.start_links = [(v, dist[v]) for v in graph.nodes(k) if v in dist]
+        if self.goal_id in dist:                       # same cluster: direct route
+            self.start_links.append((self.goal_id, dist[self.goal_id]))
+        dist, _ = graph.local_distances(self.goal_id)
+        k = graph.cluster_of(self.goal_id)
+        self.goal_links = {v: dist[v] for v in graph.nodes(k) if v in dist}
+
+    def _expand(self, cur, g_cur):
+        """Relax cur's abstract edges; return the nodes newly opened."""
+        scanned = self.graph.cells_scanned
+        edges = self.graph.neighbours(cur)
+        if cur == self.start_id:
+            edges += self.start_links
+        if cur in self.goal_links:
+            edges.append((self.goal_id, self.goal_links[cur]))
+        self.cells_scanned += self.graph.cells_scanned - scanned
+
+        opened = []
+        for nb, cost in edges:
+            if nb in self.visited:
+                continue
+            tentative_g = g_cur + cost
+            if tentative_g < self.g_score.get(nb, float("inf")):
+                if nb not in self.g_score:
+                    opened.append(nb)
+                self.g_score[nb]   = tentative_g
+                self.came_from[nb] = cur
+                heapq.heappush(self.open_set, (tentative_g + self.h_node(nb), -tentative_g, nb))
+        return opened
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _finish(self):
+        self.path = self._reconstruct_path()
+        self.path_index = PathIndex(self.path)
+        self.done = True
+
+    def _reconstruct_path(self):
+        """Abstract node chain, with each intra-cluster hop refined into cells."""
+        nodes, node = [], self.goal_id
+        while node in self.came_from:
+            nodes.append(node)
+            node = self.came_from[node]
+        nodes.append(self.start_id)
+        nodes.reverse()
+
+        cols, graph = self.cols, self.graph
+        scanned = graph.cells_scanned
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            if a == b:
+                continue
+            if abs(a - b) == cols or (abs(a - b) == 1 and a // cols == b // cols):
+                path.append(b)                         # entrance crossing
+            else:
+                path += graph.local_path(a, b)[1:]
+        self.cells_scanned += graph.cells_scanned - scanned
+        return [divmod(i, cols) for i in path]
@@ -0,0 +1,199 @@
+import math
+from heuristics import get_heuristic, node_heuristic
+from connectivity import components_for
+from grid import PathIndex
+
+DEFAULT_NODE_LIMIT = 100_000     # transposition table entries
+
+
+class IDAStarSearch:
+    """
+    Iterative-deepening A*: depth-first passes bounded by f = g + h,
+    the bound rising each pass to the smallest f that exceeded it.
+    Memory is the current path plus a transposition table.
+
+    Plain IDA* is hopeless on grids: the number of equal-cost routes to
+    a cell grows exponentially, and it walks every one of them. So the
+    best g seen per cell is kept (this pass or any earlier one), and a
+    route is cut when it reaches a cell no cheaper than that. The
+    table holds at most node_limit cells; once it is full new cells
+    are not remembered, trading CPU for the memory cap. Bounds are
+    rounded up to whole costs, so fractional heuristics (euclidean)
+    do not add a pass per distinct f. Paths are optimal for the
+    admissible heuristics here.
+
+    Same step()/solve() interface and delta events as AStarSearch;
+    solve() adds "peak_nodes", the most nodes held at once (path +
+    table), also kept in self.peak_nodes.
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan", node_limit=DEFAULT_NODE_LIMIT):
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+        self.node_limit = node_limit
+
+        # Search state (flat ids)
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.best_g    = {}          # transposition table: id -> (g, pass it was set in)
+        self.bound     = self._ceil(self.heuristic(start, goal))
+        self.passes    = 0
+
+        self.done      = False
+        self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
+        self.nodes_visited = 0
+        self.peak_nodes    = 0
+
+        # Provably unreachable (see AStarSearch): no pass is run at all
+        self.reachable = (self.bound != float("inf") and
+                          components_for(grid).connected(self.start_id, self.goal_id))
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator performs ONE expansion.
+
+        Yields the same delta events as AStarSearch.step(); "added"
+        are the children put on the depth-first stack. Later passes
+        re-expand cells already shown as visited.
+        """
+        cols = self.cols
+        for cur, added in self._run():
+            current = divmod(cur, cols)
+            yield {
+                "type"    : "step",
+                "current" : current,
+                "added"   : [divmod(i, cols) for i in added],
+                "removed" : [current],
+                "path"    : []
+            }
+
+        if self.path:
+            yield {
+                "type"    : "found",
+                "current" : self.goal,
+                "added"   : [],
+                "removed" : [self.goal],
+                "path"    : self.path
+            }
+            return
+        yield {
+            "type"    : "no_path",
+            "current" : None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : []
+        }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same passes as step() without building events.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve(),
+            plus "peak_nodes"
+        """
+        for _ in self._run():
+            pass
+        if self.path:
+            return {"type": "found", "path": self.path, "cost": len(self.path) - 1,
+                    "nodes_visited": self.nodes_visited, "peak_nodes": self.peak_nodes}
+        return {"type": "no_path", "path": [], "cost": 0,
+                "nodes_visited": self.nodes_visited, "peak_nodes": self.peak_nodes}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+    def _run(self):
+        """Run passes until the goal is reached; yields (id, [children]) per expansion."""
+        if self.reachable:
+            while self.bound != float("inf"):
+                self.passes += 1
+                next_bound = yield from self._pass()
+                if self.path:
+                    break
+                self.bound = self._ceil(next_bound)
+        self.done = True
+
+    def _pass(self):
+        """
+        One depth-first pass under self.bound. Returns the smallest f
+        that was cut off (inf if none), or sets self.path on success.
+        Frames are [id, g, children still to try].
+        """
+        h_node, best_g, goal = self.h_node, self.best_g, self.goal_id
+        bound, it, limit = self.bound, self.passes, self.node_limit
+        next_bound = float("inf")
+        stack = [[self.start_id, 0, None]]
+        best_g[self.start_id] = (0, it)
+        while stack:
+            frame = stack[-1]
+            node, g, children = frame
+            if children is None:                    # first visit: expand
+                if node == goal:
+                    self._finish(stack)
+                    return next_bound
+                self.nodes_visited += 1
+                parent = stack[-2][0] if len(stack) > 1 else -1
+                children = []
+                for nb in self._neighbours(node):
+                    if nb == parent:
+                        continue
+                    f = g + 1 + h_node(nb)
+                    if f > bound:
+                        if f < next_bound:
+                            next_bound = f
+                        continue
+                    seen = best_g.get(nb)
+                    if seen is not None and (seen[0] < g + 1 or (seen[0] == g + 1 and seen[1] == it)):
+                        continue                    # reached as cheaply before
+                    if seen is not None or len(best_g) < limit:
+                        best_g[nb] = (g + 1, it)
+                    children.append((f, nb))
+                children.sort(reverse=True)         # best f popped first
+                frame[2] = children
+                held = len(stack) + len(best_g)
+                if held > self.peak_nodes:
+                    self.peak_nodes = held
+                yield node, [nb for _, nb in children]
+            if children:
+                _, nb = children.pop()
+                stack.append([nb, g + 1, None])
+            else:
+                stack.pop()
+        return next_bound
+
+    @staticmethod
+    def _ceil(f):
+        """Moves cost 1, so path costs are whole: a bound can round up."""
+        return f if f == float("inf") else math.ceil(f - 1e-9)
+
+    def _finish(self, stack):
+        cols = self.cols
+        self.path = [divmod(frame[0], cols) for frame in stack]
+        self.path_index = PathIndex(self.path)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _neighbours(self, i):
+        """4-directional movement (no diagonals), on flat ids, from Grid.nbr."""
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            yield i + off
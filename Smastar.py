@@ -0,0 +1,354 @@
+import heapq
+import itertools
+import math
+from heuristics import get_heuristic, node_heuristic
+from connectivity import components_for
+from grid import PathIndex
+
+DEFAULT_NODE_LIMIT = 10_000      # search-tree nodes held at once
+
+INF = float("inf")
+
+# Fields of a search-tree node (a list, indexed by these)
+G, F, PARENT, KIDS, FORGOT, VERSION, OPEN = range(7)
+
+
+class SMAStarSearch:
+    """
+    Simplified memory-bounded A* (SMA*): A* over a search tree that
+    never holds more than node_limit nodes. When a new child would go
+    over the limit, the worst leaf (highest f, shallowest on ties) is
+    forgotten and its f is remembered in its parent, unless the child
+    is no better than that leaf, in which case the child itself is. A
+    parent with forgotten children is queued again at the best of
+    their f values and, when it comes to the top, regenerates just
+    those children, each at the f remembered for it.
+
+    f values are rounded up to whole costs (moves cost 1, so euclidean
+    does not split a contour into many), use pathmax (a child's f is
+    never below its parent's) and are backed up the tree: an expanded
+    node's f is the best f among its children, in memory or forgotten,
+    so a subtree searched to a higher f is not searched again at the
+    old one. A path of cost c needs c + 1 nodes, so a child with
+    f > node_limit - 1, or a non-goal child at depth node_limit - 1, is
+    forgotten at once with f = inf; once the best node left has f = inf
+    the search stops. Paths are optimal whenever the optimal path fits
+    in memory; if none fits the search reports no_path with
+    self.out_of_memory set.
+
+    Simplification against full SMA*: a cell is held once, with its
+    best g, so a child already in the tree as cheaply is not generated
+    again under another parent, and a costlier copy is dropped with its
+    subtree when a cheaper route to it turns up.
+
+    step() yields one expansion per event like AStarSearch ("removed"
+    also lists forgotten leaves); solve() adds "peak_nodes", also kept
+    in self.peak_nodes.
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan", node_limit=DEFAULT_NODE_LIMIT):
+        if node_limit < 2:
+            raise ValueError("node_limit must be at least 2")
+        self.grid      = grid
+        self.start     = start
+        self.goal      = goal
+        self.heuristic = get_heuristic(heuristic, grid)
+        self.h_node    = node_heuristic(heuristic, grid, goal)   # flat id -> h
+        self.node_limit = node_limit
+
+        # Search tree in memory: id -> [g, f, parent, children in memory
+        # (a set of ids), forgotten children {id: f} (None until expanded),
+        # version, open]. Children are kept explicitly, not re-derived
+        # from the grid, which dynamic mode may wall under the search.
+        # Open nodes sit in lazy heaps (best first / worst first, the
+        # latter for leaves only) tagged with their version.
+        self.cols      = grid.cols
+        self.start_id  = grid.index(start)
+        self.goal_id   = grid.index(goal)
+        self.nodes     = {}
+        self.open_best  = []         # (f, -g, version, id)
+        self.open_worst = []         # (-f, g, version, id)
+        self.versions  = itertools.count(1)   # shared, so a re-made cell never revives old entries
+        self.expanding = -1
+        self.out_of_memory = False
+
+        self.done      = False
+        self.path      = []
+        self.path_index = PathIndex()    # cell -> position on self.path
+        self.nodes_visited = 0
+        self.peak_nodes    = 0
+
+        h = self._ceil(self.heuristic(start, goal))
+        if h != INF and components_for(grid).connected(self.start_id, self.goal_id):
+            self.nodes[self.start_id] = [0, h, -1, set(), None, 0, True]
+            self._open(self.start_id)
+            self.peak_nodes = 1
+
+    # ------------------------------------------------------------------
+    # Generator — call next() each frame from the GUI
+    # ------------------------------------------------------------------
+    def step(self):
+        """
+        Each call to next() on this generator performs ONE expansion.
+
+        Yields the same delta events as AStarSearch.step().
+        """
+        cols = self.cols
+        for cur, added, dropped in self._run():
+            current = divmod(cur, cols)
+            yield {
+                "type"    : "step",
+                "current" : current,
+                "added"   : [divmod(i, cols) for i in added],
+                "removed" : [current] + [divmod(i, cols) for i in dropped],
+                "path"    : []
+            }
+
+        if self.path:
+            yield {
+                "type"    : "found",
+                "current" : self.goal,
+                "added"   : [],
+                "removed" : [self.goal],
+                "path"    : self.path
+            }
+            return
+        yield {
+            "type"    : "no_path",
+            "current" : None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : []
+        }
+
+    # ------------------------------------------------------------------
+    # Headless mode — run to completion in one call
+    # ------------------------------------------------------------------
+    def solve(self):
+        """
+        Runs the same expansions as step() without building events.
+
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve(),
+            plus "peak_nodes"
+        """
+        for _ in self._run():
+            pass
+        if self.path:
+            return {"type": "found", "path": self.path, "cost": len(self.path) - 1,
+                    "nodes_visited": self.nodes_visited, "peak_nodes": self.peak_nodes}
+        return {"type": "no_path", "path": [], "cost": 0,
+                "nodes_visited": self.nodes_visited, "peak_nodes": self.peak_nodes}
+
+    # ------------------------------------------------------------------
+    # Re-planning support
+    # ------------------------------------------------------------------
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+    def _run(self):
+        """Expand best nodes until the goal; yields (id, added, dropped)."""
+        nodes, h_node, goal, ceil = self.nodes, self.h_node, self.goal_id, self._ceil
+        limit, max_depth = self.node_limit, self.node_limit - 1
+        while True:
+            cur = self._best()
+            if cur < 0:
+                break
+            if cur == goal:
+                self._finish()
+                break
+            node = nodes[cur]
+            g, f = node[G], self._key(node)
+            if f == INF:                            # nothing left fits in memory
+                break
+            self.nodes_visited += 1
+            self._close(cur)
+            self.expanding = cur
+            forgotten, node[FORGOT] = node[FORGOT], {}
+
+            added, dropped = [], []
+            for nb in self._neighbours(cur):
+                if forgotten is None:               # first expansion: every child
+                    f_nb = g + 1 + ceil(h_node(nb))
+                elif nb in forgotten:               # later ones: the forgotten children
+                    f_nb = forgotten[nb]
+                else:
+                    continue
+                old = nodes.get(nb)
+                if old is not None:
+                    if old[G] <= g + 1:
+                        continue                    # held as cheaply
+                    self._prune(nb, dropped)        # a costlier copy: re-hang it here
+                f_nb = max(f, f_nb)                 # pathmax
+                if f_nb > max_depth or (nb != goal and g + 1 >= max_depth):
+                    node[FORGOT][nb] = INF          # its path cannot fit in memory
+                    continue
+                if len(nodes) >= limit:
+                    # Room is made only for a child that beats the worst
+                    # leaf in best-first order (lower f, then deeper);
+                    # otherwise the child is forgotten at once
+                    victim = self._worst()
+                    if victim < 0 or (f_nb, -g - 1) >= (nodes[victim][F], -nodes[victim][G]):
+                        node[FORGOT][nb] = f_nb
+                        continue
+                    self._forget(victim, dropped)
+                nodes[nb] = [g + 1, f_nb, cur, set(), None, 0, True]
+                node[KIDS].add(nb)
+                self._open(nb)
+                added.append(nb)
+
+            self.expanding = -1
+            if len(nodes) > self.peak_nodes:
+                self.peak_nodes = len(nodes)
+            self._settle(cur, dropped)
+            yield cur, added, dropped
+        # The start is only queued when the goal is reachable, so stopping
+        # without a path while the root is still held means it did not fit
+        self.out_of_memory = not self.path and self.start_id in nodes
+        self.done = True
+
+    # ------------------------------------------------------------------
+    # Open nodes (lazy heaps; an entry is live while its version is)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _ceil(f):
+        """Moves cost 1, so path costs are whole: an f can round up."""
+        return f if f == INF else math.ceil(f - 1e-9)
+
+    @staticmethod
+    def _key(node):
+        """f a node is queued at: its best forgotten child's once expanded."""
+        forgot = node[FORGOT]
+        return min(forgot.values()) if forgot else node[F]
+
+    def _open(self, i):
+        """Queue node i; only leaves go on the worst-first heap."""
+        if len(self.open_best) > 8 * self.node_limit:
+            self._compact()
+        node = self.nodes[i]
+        node[OPEN]    = True
+        node[VERSION] = next(self.versions)
+        f = self._key(node)
+        heapq.heappush(self.open_best, (f, -node[G], node[VERSION], i))
+        if not node[KIDS]:
+            heapq.heappush(self.open_worst, (-f, node[G], node[VERSION], i))
+
+    def _close(self, i):
+        node = self.nodes[i]
+        node[OPEN]    = False
+        node[VERSION] = next(self.versions)
+
+    def _compact(self):
+        """Rebuild both heaps from the live entries, so they stay O(node_limit)."""
+        nodes = self.nodes
+        self.open_best  = [e for e in self.open_best  if e[3] in nodes and nodes[e[3]][VERSION] == e[2]]
+        self.open_worst = [e for e in self.open_worst if e[3] in nodes and nodes[e[3]][VERSION] == e[2]]
+        heapq.heapify(self.open_best)
+        heapq.heapify(self.open_worst)
+
+    def _top(self, heap, skip=-1):
+        """Live id at the top of heap (other than skip), or -1."""
+        nodes, held = self.nodes, None
+        while heap:
+            _, _, version, i = heap[0]
+            node = nodes.get(i)
+            if node is None or node[VERSION] != version:
+                heapq.heappop(heap)
+            elif i == skip and held is None:
+                held = heapq.heappop(heap)
+            else:
+                break
+        found = heap[0][3] if heap else -1
+        if held is not None:
+            heapq.heappush(heap, held)
+        return found
+
+    def _best(self):
+        return self._top(self.open_best)
+
+    def _worst(self):
+        """Worst open leaf; the root is never forgotten."""
+        return self._top(self.open_worst, skip=self.start_id)
+
+    # ------------------------------------------------------------------
+    # Forgetting and backing up
+    # ------------------------------------------------------------------
+    def _forget(self, i, dropped):
+        """Drop leaf i, remembering its f in its parent."""
+        node = self.nodes[i]
+        self.nodes[node[PARENT]][FORGOT][i] = node[F]
+        self._detach(i, dropped)
+
+    def _detach(self, i, dropped):
+        """Remove leaf i from the tree and settle its parent."""
+        node = self.nodes.pop(i)
+        dropped.append(i)
+        p = node[PARENT]
+        self.nodes[p][KIDS].discard(i)
+        if p != self.expanding:
+            self._settle(p, dropped)
+
+    def _prune(self, i, dropped):
+        """
+        Drop node i with its whole subtree. Used for a costlier copy of a
+        cell, which is never an ancestor of the node being expanded.
+        """
+        nodes = self.nodes
+        stack = list(nodes[i][KIDS])
+        while stack:
+            j = stack.pop()
+            stack.extend(nodes.pop(j)[KIDS])
+            dropped.append(j)
+        nodes[i][KIDS].clear()
+        self._detach(i, dropped)
+
+    def _settle(self, i, dropped):
+        """
+        Expanded node i after a change to its children: drop it once it
+        has none left, in memory or forgotten (a dead end); else queue
+        it while it has forgotten children, and back its f up the tree.
+        """
+        node = self.nodes[i]
+        if not node[KIDS] and not node[FORGOT]:
+            if i != self.start_id:
+                self._detach(i, dropped)
+            return
+        if node[FORGOT]:
+            self._open(i)
+        self._backup(i)
+
+    def _backup(self, i):
+        """Raise f of i, then of its ancestors, to the best f below them."""
+        nodes = self.nodes
+        while i != -1:
+            node = nodes[i]
+            f = self._key(node) if node[FORGOT] else INF
+            for k in node[KIDS]:
+                if nodes[k][F] < f:
+                    f = nodes[k][F]
+            if f <= node[F]:
+                return
+            node[F] = f
+            i = node[PARENT]
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _finish(self):
+        cols, nodes = self.cols, self.nodes
+        path, i = [], self.goal_id
+        while i != -1:
+            path.append(divmod(i, cols))
+            i = nodes[i][PARENT]
+        path.reverse()
+        self.path = path
+        self.path_index = PathIndex(path)
+
+    def _neighbours(self, i):
+        """4-directional movement (no diagonals), on flat ids, from Grid.nbr."""
+        for off, _, _, _ in self.grid.steps[self.grid.nbr[i]]:
+            yield i + off
@@ -0,0 +1,160 @@
+"""
+Batch solver — many (start, goal) queries against one map, fanned out
+over a process pool.
+
+    from batch import solve_batch
+    for i, result in solve_batch(grid, [(s1, g1), (s2, g2), ...], workers=8):
+        ...
+
+The grid is sent to each worker once, through the pool initializer, as
+its raw bytes; tasks only carry chunks of (index, start, goal), and
+per-grid caches (landmark tables, distance fields) are built once per
+worker and reused for every query it handles. Results stream back as
+chunks finish, tagged with the query's position in the input, so they
+arrive out of order. Only a bounded number of chunks is in flight at a
+time, so the query iterable may be lazy and very long.
+
+The grid is snapshotted when solve_batch is called; later edits to it
+are not seen by the workers.
+
+From the command line (random queries between free cells):
+
+    python batch.py --rows 200 --cols 200 --queries 20000 --workers 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from connectivity import components_for
+from grid import Grid
+from solver import ENGINES, load_grid, solve
+
+DEFAULT_CHUNK = 64
+IN_FLIGHT_PER_WORKER = 4
+
+# Worker-side state, set once by _init_worker
+_grid = None
+_job  = None
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+def _init_worker(rows, cols, data, algorithm, heuristic, options, paths):
+    global _grid, _job
+    _grid = Grid(rows, cols)
+    _grid.data[:] = data
+    _grid.rebuild_masks()
+    components_for(_grid)      # reused for every query: no-path answers in O(1)
+    _job  = (algorithm, heuristic, options, paths)
+
+
+def _solve_chunk(chunk):
+    algorithm, heuristic, options, paths = _job
+    out = []
+    for i, start, goal in chunk:
+        result = solve(_grid, start, goal, algorithm, heuristic, **options)
+        if not paths:
+            result["path"] = []
+        out.append((i, result))
+    return out
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+def solve_batch(grid, queries, algorithm="astar", heuristic="manhattan",
+                workers=None, chunksize=DEFAULT_CHUNK, paths=True, **options):
+    """
+    Solve every (start, goal) in queries on grid.
+
+    Yields (index, result) as results complete, where index is the
+    query's position in queries and result is the engine's solve() dict.
+    paths=False drops the cell paths from the results (cost and counters
+    are kept), which saves most of the transfer cost on big batches.
+    workers defaults to os.cpu_count(); workers=1 solves in-process.
+    """
+    if algorithm not in ENGINES:
+        raise ValueError(f"unknown algorithm {algorithm!r} (choose from {', '.join(ENGINES)})")
+    workers = workers or os.cpu_count() or 1
+    init = (grid.rows, grid.cols, bytes(grid.data), algorithm, heuristic, options, paths)
+    tasks = _chunks(queries, chunksize)
+
+    if workers == 1:
+        _init_worker(*init)
+        for chunk in tasks:
+            yield from _solve_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init) as pool:
+        pending = {pool.submit(_solve_chunk, c)
+                   for c in islice(tasks, workers * IN_FLIGHT_PER_WORKER)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+                nxt = next(tasks, None)
+                if nxt is not None:
+                    pending.add(pool.submit(_solve_chunk, nxt))
+
+
+def _chunks(queries, size):
+    """[(index, start, goal), ...] lists of up to size queries."""
+    it = enumerate(queries)
+    while True:
+        chunk = [(i, s, g) for i, (s, g) in islice(it, size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def random_queries(grid, count, rng):
+    """count random (start, goal) pairs between free cells."""
+    free = [grid.cell(i) for i in range(len(grid.data)) if grid.data[i] != Grid.WALL]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solve many random queries on one map in parallel.")
+    ap.add_argument("--map", help="text map file ('#' wall, 'S' start, 'G' goal)")
+    ap.add_argument("--rows", type=int, default=100)
+    ap.add_argument("--cols", type=int, default=100)
+    ap.add_argument("--density", type=float, default=0.3)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--queries", type=int, default=1000)
+    ap.add_argument("--algo", choices=sorted(ENGINES), default="astar")
+    ap.add_argument("--heuristic", choices=["manhattan", "euclidean", "landmark"], default="manhattan")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.map:
+        grid = load_grid(args.map)
+    else:
+        grid = Grid(args.rows, args.cols)
+        grid.generate_random(args.density, rng)
+    queries = random_queries(grid, args.queries, rng)
+
+    t0 = time.perf_counter()
+    found = expanded = 0
+    for _, result in solve_batch(grid, queries, args.algo, args.heuristic,
+                                 args.workers, args.chunksize, paths=False):
+        found    += result["type"] == "found"
+        expanded += result["nodes_visited"]
+    secs = time.perf_counter() - t0
+
+    print(f"{len(queries)} queries  found={found}  nodes_visited={expanded}  "
+          f"time={secs:.2f} s  ({len(queries) / secs:.0f} queries/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
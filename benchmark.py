@@ -0,0 +1,243 @@
+"""
+Headless benchmark harness for the search engines.
+
+Runs every engine on seeded random grids over a matrix of sizes,
+densities and heuristics, and writes one JSON record per query:
+
+    python benchmark.py run --out before.json
+    python benchmark.py run --sizes 60x80,120x160 --densities 0.1,0.3 \\
+                            --heuristics manhattan,landmark --seeds 5 --out after.json
+    python benchmark.py diff before.json after.json
+
+Each query is timed on a freshly generated copy of its grid, best of
+--repeat, so per-grid caches (landmark tables, distance fields) are
+always cold and their build cost is part of the time. A* / GBFS /
+ARA* / bidirectional A* skip the component index on such a grid (see
+connectivity.py); IDA*, SMA*, beam GBFS and HPA* build it, so an
+O(rows*cols) labelling is part of their times. Peak memory is
+measured in a separate run under tracemalloc, which would otherwise
+distort the timings. heap_ops is pushes + pops for engines with a
+pluggable open list (see open_lists.py), null for the others.
+
+diff pairs up records by (engine, heuristic, size, density, seed),
+totals them per matrix cell and flags cells whose time grew by more
+than --threshold (and by at least --min-ms, to ignore timer noise on
+tiny queries), or whose path cost or expansions changed. It exits
+with status 1 if anything was flagged.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from grid import Grid
+from solver import ENGINES, OPEN_LIST_ENGINES, solve
+
+HEURISTICS = ["manhattan", "euclidean", "landmark"]
+NO_HEURISTIC = {"field"}          # engines that ignore the heuristic argument
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+def make_grid(rows, cols, density, seed):
+    """Same grid for the same (rows, cols, density, seed) on every machine."""
+    grid = Grid(rows, cols)
+    grid.generate_random(density, random.Random(f"{rows}x{cols}:{density}:{seed}"))
+    return grid
+
+
+def run_one(engine, heuristic, rows, cols, density, seed, repeat=3, options=None):
+    """Benchmark one query; returns its JSON record."""
+    options = options or {}
+    best = float("inf")
+    for _ in range(repeat):
+        grid = make_grid(rows, cols, density, seed)
+        t0 = time.perf_counter()
+        result = solve(grid, algorithm=engine, heuristic=heuristic, **options)
+        best = min(best, time.perf_counter() - t0)
+
+    grid = make_grid(rows, cols, density, seed)
+    tracemalloc.start()
+    solve(grid, algorithm=engine, heuristic=heuristic, **options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = result.get("open_stats")
+    return {
+        "engine"       : engine,
+        "heuristic"    : None if engine in NO_HEURISTIC else heuristic,
+        "rows"         : rows,
+        "cols"         : cols,
+        "density"      : density,
+        "seed"         : seed,
+        "type"         : result["type"],
+        "cost"         : result["cost"],
+        "nodes_visited": result["nodes_visited"],
+        "heap_ops"     : stats["pushes"] + stats["pops"] if stats else None,
+        "time_ms"      : round(best * 1000, 3),
+        "peak_kb"      : round(peak / 1024, 1),
+    }
+
+
+def run_matrix(engines, sizes, densities, heuristics, seeds, repeat=3, options=None, log=None):
+    records = []
+    for rows, cols in sizes:
+        for density in densities:
+            for seed in range(seeds):
+                for engine in engines:
+                    opts = options if engine in OPEN_LIST_ENGINES else None
+                    for heuristic in (heuristics[:1] if engine in NO_HEURISTIC else heuristics):
+                        rec = run_one(engine, heuristic, rows, cols, density, seed, repeat, opts)
+                        records.append(rec)
+                        if log:
+                            log(rec)
+    return records
+
+
+# ----------------------------------------------------------------------
+# Diffing
+# ----------------------------------------------------------------------
+def _cell(rec):
+    return (rec["engine"], rec["heuristic"], f"{rec['rows']}x{rec['cols']}", rec["density"])
+
+
+def _totals(records):
+    """{query key: record} and per-cell totals {cell: {time_ms, nodes_visited, cost}}."""
+    by_query, cells = {}, {}
+    for rec in records:
+        by_query[_cell(rec) + (rec["seed"],)] = rec
+    for key, rec in by_query.items():
+        t = cells.setdefault(key[:4], {"time_ms": 0.0, "nodes_visited": 0, "cost": 0})
+        for field in t:
+            t[field] += rec[field]
+    return by_query, cells
+
+
+def diff(old, new, threshold=0.10, min_ms=2.0):
+    """
+    Compare two record lists. Returns (lines, regressions) where lines
+    is a printable per-cell report and regressions the number flagged.
+    Only queries present in both files are compared.
+    """
+    old_q, _ = _totals(old)
+    new_q, _ = _totals(new)
+    common = old_q.keys() & new_q.keys()
+    _, a = _totals([old_q[k] for k in common])
+    _, b = _totals([new_q[k] for k in common])
+
+    lines, regressions = [], 0
+    for cell in sorted(a, key=lambda c: tuple(str(x) for x in c)):
+        ta, tb = a[cell], b[cell]
+        ratio = tb["time_ms"] / ta["time_ms"] if ta["time_ms"] else 1.0
+        flags = []
+        if ratio > 1 + threshold and tb["time_ms"] - ta["time_ms"] >= min_ms:
+            flags.append("SLOWER")
+        if tb["cost"] != ta["cost"]:
+            flags.append("COST")
+        if tb["nodes_visited"] != ta["nodes_visited"]:
+            flags.append("NODES")
+        regressions += bool(flags)
+        engine, heuristic, size, density = cell
+        lines.append(f"{engine:6} {heuristic or '-':10} {size:>9} {density:<5} "
+                     f"time {ta['time_ms']:9.2f} -> {tb['time_ms']:9.2f} ms (x{ratio:.2f})  "
+                     f"nodes {ta['nodes_visited']} -> {tb['nodes_visited']}  "
+                     + " ".join(flags))
+    missing = len(old_q.keys() ^ new_q.keys())
+    if missing:
+        lines.append(f"({missing} queries only in one file, not compared)")
+    return lines, regressions
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def _sizes(text):
+    return [tuple(int(x) for x in s.split("x")) for s in text.split(",")]
+
+
+def _floats(text):
+    return [float(x) for x in text.split(",")]
+
+
+def _names(choices):
+    def parse(text):
+        names = text.split(",")
+        bad = [n for n in names if n not in choices]
+        if bad:
+            raise argparse.ArgumentTypeError(f"unknown {', '.join(bad)} (choose from {', '.join(choices)})")
+        return names
+    return parse
+
+
+def main(argv=None):
+    ap  = argparse.ArgumentParser(description="Benchmark the search engines headlessly.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="run the benchmark matrix and write JSON")
+    run.add_argument("--engines", type=_names(list(ENGINES)), default=list(ENGINES))
+    run.add_argument("--sizes", type=_sizes, default=_sizes("30x40,60x80,120x160"))
+    run.add_argument("--densities", type=_floats, default=[0.1, 0.3])
+    run.add_argument("--heuristics", type=_names(HEURISTICS), default=HEURISTICS)
+    run.add_argument("--seeds", type=int, default=3, help="grids per size/density")
+    run.add_argument("--repeat", type=int, default=3, help="timed runs per query (best is kept)")
+    run.add_argument("--open-list", default=None, help="open list backend for astar / gbfs")
+    run.add_argument("--tie", default=None, help="tie-breaking for astar / gbfs")
+    run.add_argument("--out", default="-", help="output file ('-' = stdout)")
+
+    dif = sub.add_parser("diff", help="compare two result files")
+    dif.add_argument("old")
+    dif.add_argument("new")
+    dif.add_argument("--threshold", type=float, default=0.10,
+                     help="relative slowdown that counts as a regression")
+    dif.add_argument("--min-ms", type=float, default=2.0,
+                     help="ignore slowdowns smaller than this many ms per cell")
+
+    args = ap.parse_args(argv)
+
+    if args.cmd == "diff":
+        with open(args.old) as f:
+            old = json.load(f)["results"]
+        with open(args.new) as f:
+            new = json.load(f)["results"]
+        lines, regressions = diff(old, new, args.threshold, args.min_ms)
+        print("\n".join(lines))
+        print(f"{regressions} regression(s)")
+        return 1 if regressions else 0
+
+    options = {}
+    if args.open_list:
+        options["open_list"] = args.open_list
+    if args.tie:
+        options["tie"] = args.tie
+
+    def log(rec):
+        print(f"{rec['engine']:6} {rec['heuristic'] or '-':10} {rec['rows']}x{rec['cols']} "
+              f"d={rec['density']} s={rec['seed']}  {rec['time_ms']:.2f} ms  "
+              f"nodes={rec['nodes_visited']}", file=sys.stderr)
+
+    records = run_matrix(args.engines, args.sizes, args.densities, args.heuristics,
+                         args.seeds, args.repeat, options, log)
+    doc = {
+        "meta": {
+            "python"  : platform.python_version(),
+            "platform": platform.platform(),
+            "time"    : time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "argv"    : sys.argv[1:] if argv is None else list(argv),
+        },
+        "results": records,
+    }
+    text = json.dumps(doc, indent=1)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Clustered abstract graph for hierarchical search (HPA*, see Hpa.py).
+
+The grid is cut into square clusters of CLUSTER x CLUSTER cells. Along
+every border between two neighbouring clusters, each maximal run of
+cell pairs that are free on both sides becomes an entrance: one pair in
+the middle of a short run, one at each end of a long one. The cells of
+those pairs are the abstract nodes:
+
+  * inter edges (cost 1) join the two cells of an entrance pair;
+  * intra edges join the nodes of one cluster, costed by a BFS that
+    stays inside the cluster.
+
+Entrances are scanned for the whole grid up front (O(cells / CLUSTER));
+a cluster's intra edges are only worked out the first time a search
+touches it. Graphs are cached per grid (graph_for) and follow the wall
+edits logged by Grid.set lazily: an edit re-scans the borders the cell
+lies on and drops the intra edges of the clusters on either side, so
+only those clusters are rebuilt, and only when next needed.
+"""
+import weakref
+from collections import deque
+
+CLUSTER        = 16   # cluster side in cells
+ENTRANCE_SPLIT = 6    # runs at least this long get an entrance at each end
+
+_graphs = weakref.WeakKeyDictionary()    # grid -> {cluster size: ClusterGraph}
+
+
+class ClusterGraph:
+    def __init__(self, grid, size=CLUSTER):
+        self.grid   = grid
+        self.size   = size
+        self._build()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def cluster_of(self, i):
+        """Cluster id of flat id i."""
+        r, c = divmod(i, self.grid.cols)
+        return (r // self.size) * self.ccols + c // self.size
+
+    def nodes(self, k):
+        """Abstract nodes (flat ids) inside cluster k."""
+        return self._intra_edges(k).keys()
+
+    def neighbours(self, i):
+        """[(abstract node, cost), ...] reachable from abstract node i."""
+        out = list(self._intra_edges(self.cluster_of(i)).get(i, ()))
+        out.extend((j, 1) for j in self.inter.get(i, ()))
+        return out
+
+    def local_distances(self, src, k=None):
+        """
+        BFS from src without leaving cluster k (src's own by default).
+        Returns (dist, parent) dicts over the cells reached.
+        """
+        grid = self.grid
+        data, cols, size = grid.data, grid.cols, self.size
+        if k is None:
+            k = self.cluster_of(src)
+        r0, c0 = (k // self.ccols) * size, (k % self.ccols) * size
+        r1, c1 = min(r0 + size, grid.rows), min(c0 + size, cols)
+        dist, parent = {src: 0}, {src: -1}
+        q = deque([src])
+        while q:
+            u = q.popleft()
+            r, c = divmod(u, cols)
+            du = dist[u] + 1
+            for v, ok in ((u - cols, r > r0), (u + cols, r < r1 - 1),
+                          (u - 1, c > c0), (u + 1, c < c1 - 1)):
+                if ok and v not in dist and data[v] != 1:       # 1 = WALL
+                    dist[v], parent[v] = du, u
+                    q.append(v)
+        self.cells_scanned += len(dist)
+        return dist, parent
+
+    def local_path(self, a, b):
+        """Shortest path a -> b (flat ids) inside a's cluster, or []."""
+        _, parent = self.local_distances(a)
+        if b not in parent:
+            return []
+        path = []
+        while b != -1:
+            path.append(b)
+            b = parent[b]
+        path.reverse()
+        return path
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def sync(self):
+        """Catch up with wall edits made since the graph was built."""
+        grid = self.grid
+        if self.version == grid.wall_version:
+            return
+        version = grid.wall_version              # before the log: see Grid
+        changes = grid.wall_changes_since(self.version, version)
+        if changes is None:
+            self._build()
+            return
+        borders, clusters = set(), set()
+        for i, _ in changes:
+            clusters.add(self.cluster_of(i))
+            borders.update(self._borders_at(i))
+        for key in borders:
+            self._scan_border(*key)
+            clusters.update(key)
+        for k in clusters:
+            self.intra.pop(k, None)
+        self.rebuilt += len(clusters)
+        self.version = version
+
+    def _build(self):
+        """Scan every border for entrances; intra edges come later."""
+        grid, size = self.grid, self.size
+        self.version = grid.wall_version
+        self.crows   = -(-grid.rows // size)
+        self.ccols   = -(-grid.cols // size)
+        self.borders = {}          # (k1, k2) -> [(cell in k1, cell in k2), ...]
+        self.inter   = {}          # node -> [node across a border, ...]
+        self.intra   = {}          # cluster -> {node: [(node, cost), ...]}
+        self.rebuilt = 0           # clusters invalidated by wall edits
+        self.cells_scanned = 0     # cells visited by cluster-local BFS
+        for cr in range(self.crows):
+            for cc in range(self.ccols):
+                k = cr * self.ccols + cc
+                if cc + 1 < self.ccols:
+                    self._scan_border(k, k + 1)
+                if cr + 1 < self.crows:
+                    self._scan_border(k, k + self.ccols)
+
+    def _borders_at(self, i):
+        """Borders (k1, k2) that flat id i lies along."""
+        cols, size, ccols = self.grid.cols, self.size, self.ccols
+        r, c = divmod(i, cols)
+        k = (r // size) * ccols + c // size
+        out = []
+        if r % size == 0 and r >= size:
+            out.append((k - ccols, k))
+        if r % size == size - 1 and r // size + 1 < self.crows:
+            out.append((k, k + ccols))
+        if c % size == 0 and c >= size:
+            out.append((k - 1, k))
+        if c % size == size - 1 and c // size + 1 < ccols:
+            out.append((k, k + 1))
+        return out
+
+    def _scan_border(self, k1, k2):
+        """(Re)place the entrances between clusters k1 and k2 (k2 right of / below k1)."""
+        grid, size, inter = self.grid, self.size, self.inter
+        data, cols = grid.data, grid.cols
+        for a, b in self.borders.pop((k1, k2), ()):
+            inter[a].remove(b)
+            inter[b].remove(a)
+            if not inter[a]: del inter[a]
+            if not inter[b]: del inter[b]
+
+        r0, c0 = (k1 // self.ccols) * size, (k1 % self.ccols) * size
+        if k2 == k1 + self.ccols:  # horizontal border: pairs one above the other
+            r = r0 + size - 1
+            pairs = [(r*cols + c, (r+1)*cols + c) for c in range(c0, min(c0 + size, cols))]
+        else:                      # vertical border: pairs side by side
+            c = c0 + size - 1
+            pairs = [(r*cols + c, r*cols + c + 1) for r in range(r0, min(r0 + size, grid.rows))]
+
+        entrances, run = [], []
+        for a, b in pairs + [(-1, -1)]:
+            if a >= 0 and data[a] != 1 and data[b] != 1:         # 1 = WALL
+                run.append((a, b))
+                continue
+            if len(run) >= ENTRANCE_SPLIT:
+                entrances += (run[0], run[-1])
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        if entrances:
+            self.borders[(k1, k2)] = entrances
+        for a, b in entrances:
+            inter.setdefault(a, []).append(b)
+            inter.setdefault(b, []).append(a)
+
+    def _intra_edges(self, k):
+        """{node: [(node, cost), ...]} within cluster k, worked out on first use."""
+        edges = self.intra.get(k)
+        if edges is not None:
+            return edges
+        nodes = set()
+        for key in self._cluster_borders(k):
+            side = 0 if key[0] == k else 1
+            nodes.update(pair[side] for pair in self.borders.get(key, ()))
+        edges = self.intra[k] = {}
+        for u in nodes:
+            dist, _ = self.local_distances(u, k)
+            edges[u] = [(v, dist[v]) for v in nodes if v != u and v in dist]
+        return edges
+
+    def _cluster_borders(self, k):
+        cr, cc, ccols = k // self.ccols, k % self.ccols, self.ccols
+        out = []
+        if cr > 0:               out.append((k - ccols, k))
+        if cr + 1 < self.crows:  out.append((k, k + ccols))
+        if cc > 0:               out.append((k - 1, k))
+        if cc + 1 < ccols:       out.append((k, k + 1))
+        return out
+
+
+def graph_for(grid, size=CLUSTER):
+    """Shared, up-to-date ClusterGraph for grid (built on first use)."""
+    per_grid = _graphs.setdefault(grid, {})
+    graph = per_grid.get(size)
+    if graph is None:
+        graph = per_grid[size] = ClusterGraph(grid, size)
+    else:
+        graph.sync()
+    return graph
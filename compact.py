@@ -0,0 +1,71 @@
+"""
+Compact per-cell search state for 4-connected grids.
+
+  * parent links as 2-bit move directions, four cells per byte: the
+    direction a cell was entered by is enough to step back to its
+    parent, so a came_from table costs n/4 bytes instead of 4n;
+  * flags (visited / seen / closed) as bitsets, n/8 bytes.
+
+The engines inline the bit arithmetic in their hot loops:
+
+    bits[i >> 3] >> (i & 7) & 1          # test
+    bits[i >> 3] |= 1 << (i & 7)         # set
+
+and use set_dir / trace_path for the parent links. A run-to-completion
+loop can keep a byte per id instead (unpack_dirs / pack_dirs), which
+saves the read-modify-write on every parent update.
+"""
+
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3       # move that entered a cell
+
+
+def bitset(n):
+    """All-clear bitset for n ids."""
+    return bytearray((n + 7) >> 3)
+
+
+def dir_table(n):
+    """Parent-direction table for n ids (2 bits each)."""
+    return bytearray((n + 3) >> 2)
+
+
+def unpack_dirs(dirs):
+    """Byte-per-id copy of a direction table (len(dirs) * 4 bytes)."""
+    size = len(dirs)
+    v    = int.from_bytes(dirs, "little")
+    low  = int.from_bytes(b"\x03" * size, "little")
+    flat = bytearray(size * 4)
+    for k in range(4):                   # ids 4j+k sit at bits 2k of byte j
+        flat[k::4] = (v >> 2*k & low).to_bytes(size, "little")
+    return flat
+
+
+def pack_dirs(dirs, flat):
+    """Store a byte-per-id table from unpack_dirs back into dirs."""
+    v = 0
+    for k in range(4):
+        v |= int.from_bytes(flat[k::4], "little") << 2*k
+    dirs[:] = v.to_bytes(len(dirs), "little")
+
+
+def move_dir(cur, nb):
+    """Direction of the move cur -> nb between adjacent flat ids."""
+    d = nb - cur
+    return LEFT if d == -1 else RIGHT if d == 1 else UP if d < 0 else DOWN
+
+
+def set_dir(dirs, i, d):
+    """Record that id i was entered by move d."""
+    s = (i & 3) << 1
+    dirs[i >> 2] = (dirs[i >> 2] & ~(3 << s)) | (d << s)
+
+
+def trace_path(dirs, start, goal, cols):
+    """Cells from start to goal, stepping back through dirs from goal."""
+    back = (cols, -cols, 1, -1)          # undo UP, DOWN, LEFT, RIGHT
+    path, i = [divmod(goal, cols)], goal
+    while i != start:
+        i += back[dirs[i >> 2] >> ((i & 3) << 1) & 3]
+        path.append(divmod(i, cols))
+    path.reverse()
+    return path
@@ -0,0 +1,267 @@
+"""
+Connected-component index of the free cells, for O(1) "is there any
+path at all?" checks before a search starts.
+
+Every free cell carries a component label; labels are merged through a
+union-find, so connected(a, b) is two finds. The index is built once per
+grid (components_for caches it) by labelling horizontal runs of free
+cells and uniting runs that touch the row above, then follows the wall
+edits logged by Grid.set lazily. The best-first engines only consult an
+index that already exists (disconnected), since building one costs more
+than a whole search on a fresh grid; the GUI and the batch workers,
+which query one grid many times, build it with components_for:
+
+  * a wall removed unites the components around the freed cell;
+  * a wall added can split one. If the free cells around it are still
+    joined through its 8-neighbour ring nothing changed; otherwise one
+    BFS per side is run in lock-step until all but one side has run dry,
+    and the sides that ran dry are relabelled. The work is bounded by
+    the size of the pieces cut off, not of the grid.
+"""
+import weakref
+from array import array
+from collections import deque
+
+NO_LABEL = -1                         # label of a wall
+
+_indexes = weakref.WeakKeyDictionary()   # grid -> ComponentIndex
+
+
+class ComponentIndex:
+    def __init__(self, grid):
+        self.grid = grid
+        self._build()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def component(self, i):
+        """Component id of flat id i (NO_LABEL for a wall)."""
+        lab = self.labels[i]
+        return NO_LABEL if lab == NO_LABEL else self._find(lab)
+
+    def connected(self, a, b):
+        """True if flat ids a and b are free and joined by some path."""
+        la, lb = self.labels[a], self.labels[b]
+        if la == NO_LABEL or lb == NO_LABEL:
+            return False
+        return self._find(la) == self._find(lb)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def sync(self):
+        """Catch up with wall edits made since the index was built."""
+        grid = self.grid
+        if self.version == grid.wall_version:
+            return
+        version = grid.wall_version              # before the log: see Grid
+        changes = grid.wall_changes_since(self.version, version)
+        if changes is None:
+            self._build()
+            return
+        # Replay the net change per cell against the index's own view
+        # (labels), walls first: splitting only needs the map minus the
+        # new walls, and freed cells can then only merge components.
+        data, labels = grid.data, self.labels
+        touched = {i for i, _ in changes}
+        walled  = [i for i in touched if data[i] == 1 and labels[i] != NO_LABEL]
+        freed   = [i for i in touched if data[i] != 1 and labels[i] == NO_LABEL]
+        if walled:
+            self._detach(walled)
+        for i in freed:
+            self._attach(i)
+        self.version = version
+
+    def _build(self):
+        """Label every free cell: runs per row, united with the row above."""
+        grid = self.grid
+        data, rows, cols = grid.data, grid.rows, grid.cols
+        self.version = grid.wall_version
+        self.parent  = parent = []
+        find, runs_by_row, prev = self._find, [], []
+        for r in range(rows):
+            row, runs, c = data[r*cols:(r+1)*cols], [], 0
+            while c < cols:
+                if row[c] == 1:                          # 1 = WALL
+                    c += 1
+                    continue
+                e = row.find(1, c)
+                if e < 0:
+                    e = cols
+                lab = len(parent)
+                parent.append(lab)
+                runs.append((c, e, lab))
+                c = e
+            j = 0
+            for s, e, lab in runs:
+                while j < len(prev) and prev[j][1] <= s:
+                    j += 1
+                k = j
+                while k < len(prev) and prev[k][0] < e:
+                    a, b = find(lab), find(prev[k][2])
+                    if a != b:
+                        parent[a] = b
+                    k += 1
+            runs_by_row.append(runs)
+            prev = runs
+
+        self.labels = labels = array("i", [NO_LABEL]) * (rows*cols)
+        for r, runs in enumerate(runs_by_row):
+            base = r*cols
+            for s, e, lab in runs:
+                labels[base+s:base+e] = array("i", [find(lab)]) * (e - s)
+
+    def _find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def _new_label(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def _free(self, i):
+        """In-bounds 4-neighbours of i that the index counts as free."""
+        labels, cols = self.labels, self.grid.cols
+        c = i % cols
+        out = []
+        for j, ok in ((i - cols, i >= cols), (i + cols, i + cols < len(labels)),
+                      (i - 1, c > 0), (i + 1, c < cols - 1)):
+            if ok and labels[j] != NO_LABEL:
+                out.append(j)
+        return out
+
+    def _attach(self, i):
+        """i became free: join it and every component around it."""
+        roots = {self._find(self.labels[j]) for j in self._free(i)}
+        if not roots:
+            self.labels[i] = self._new_label()
+            return
+        root = roots.pop()
+        for other in roots:
+            self.parent[other] = root
+        self.labels[i] = root
+
+    def _ring(self, i):
+        """
+        The 8 cells around i in cyclic order, each as (id or -1, is a
+        4-neighbour). Off-grid positions come back as -1.
+        """
+        rows, cols = self.grid.rows, self.grid.cols
+        r, c = divmod(i, cols)
+        out = []
+        for dr, dc in ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)):
+            rr, cc = r + dr, c + dc
+            j = rr*cols + cc if 0 <= rr < rows and 0 <= cc < cols else -1
+            out.append((j, dr == 0 or dc == 0))
+        return out
+
+    def _detach(self, walled):
+        """Cells in walled just became walls: split off what they cut away."""
+        labels = self.labels
+        for i in walled:
+            labels[i] = NO_LABEL
+
+        # One search group per free 4-neighbour of a new wall, merged
+        # up front when the ring around that wall already joins them.
+        owner, gparent, seeds = {}, [], []
+
+        def gfind(g):
+            while gparent[g] != g:
+                gparent[g] = gparent[gparent[g]]
+                g = gparent[g]
+            return g
+
+        for i in walled:
+            ring = self._ring(i)
+            arc  = None                      # group of the current run of free ring cells
+            for j, orth in ring + ring[:1]:  # wrap around to close the ring
+                if j < 0 or labels[j] == NO_LABEL:
+                    arc = None
+                    continue
+                if not orth:
+                    continue
+                g = owner.get(j)
+                if g is None:
+                    g = owner[j] = len(gparent)
+                    gparent.append(g)
+                    seeds.append(j)
+                if arc is None:
+                    arc = gfind(g)
+                elif gfind(g) != arc:
+                    gparent[gfind(g)] = arc
+
+        # Old components are independent: search each one's groups apart
+        by_root = {}
+        for j in seeds:
+            by_root.setdefault(self._find(labels[j]), set()).add(gfind(owner[j]))
+        for groups in by_root.values():
+            if len(groups) > 1:
+                self._split(groups, owner, gparent, gfind)
+
+    def _split(self, groups, owner, gparent, gfind):
+        """Lock-step BFS from each group until at most one is still growing."""
+        labels = self.labels
+        queues = {g: deque() for g in groups}
+        for cell, g in list(owner.items()):
+            root = gfind(g)
+            if root in queues:
+                queues[root].append(cell)
+
+        while len(queues) > 1:
+            live = [g for g, q in queues.items() if q]
+            if len(live) <= 1:
+                break
+            for g in live:
+                q = queues.get(g)
+                if not q:
+                    continue                 # merged away this round
+                u = q.popleft()
+                for v in self._free(u):
+                    o = owner.get(v)
+                    if o is None:
+                        owner[v] = g
+                        q.append(v)
+                        continue
+                    h = gfind(o)
+                    if h != g and h in queues:
+                        gparent[h] = g
+                        q.extend(queues.pop(h))
+
+        if len(queues) <= 1:
+            return                           # still one piece
+        done = [g for g, q in queues.items() if not q]
+        if len(done) == len(queues):
+            done.pop()                       # every side closed: one keeps the old label
+        fresh = {g: self._new_label() for g in done}
+        for cell, g in owner.items():
+            lab = fresh.get(gfind(g))
+            if lab is not None:
+                labels[cell] = lab
+
+
+def components_for(grid):
+    """Shared, up-to-date ComponentIndex for grid (built on first use)."""
+    index = _indexes.get(grid)
+    if index is None:
+        index = _indexes[grid] = ComponentIndex(grid)
+    else:
+        index.sync()
+    return index
+
+
+def disconnected(grid, a, b):
+    """
+    True if flat ids a and b are known to lie in different components.
+    Only an index already built for grid (by components_for) is asked,
+    so a one-shot query on a fresh grid does not pay O(rows*cols) for
+    one; callers that reuse a grid build it up front and keep it warm.
+    """
+    index = _indexes.get(grid)
+    if index is None:
+        return False
+    index.sync()
+    return not index.connected(a, b)
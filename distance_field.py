@@ -0,0 +1,268 @@
+"""
+Goal-keyed distance field for many-to-one queries.
+
+One reverse BFS from the goal labels every reachable cell with its exact
+distance to it. Any start is then answered by walking downhill, one
+neighbour per step, so each agent costs O(path length) instead of a
+search of its own. Fields are cached per (grid, goal) and follow wall
+edits logged by Grid.set incrementally:
+
+  * wall removed -> decrease-only BFS wave from the freed cell;
+  * wall added   -> the cells that lost every downhill neighbour are
+                    un-labelled and relabelled from their surviving
+                    neighbours, touching only the affected region.
+
+The BFS / repair helpers here are shared with landmarks.py.
+"""
+import heapq
+import weakref
+from collections import deque
+from array import array
+from grid import PathIndex
+
+UNREACHED = -1
+MAX_FIELDS_PER_GRID = 8
+
+_fields = weakref.WeakKeyDictionary()   # grid -> {goal id: DistanceField}
+
+
+# ----------------------------------------------------------------------
+# Flat-id BFS helpers (distances in array('i'), UNREACHED = -1)
+# ----------------------------------------------------------------------
+def free_neighbours(grid, i):
+    """Passable 4-neighbours of flat id i."""
+    data, cols = grid.data, grid.cols
+    c = i % cols
+    out = []
+    if i >= cols and data[i-cols] != 1:                 # 1 = WALL
+        out.append(i - cols)
+    if i + cols < len(data) and data[i+cols] != 1:
+        out.append(i + cols)
+    if c > 0 and data[i-1] != 1:
+        out.append(i - 1)
+    if c < cols - 1 and data[i+1] != 1:
+        out.append(i + 1)
+    return out
+
+
+def bfs_distances(grid, src):
+    """Exact distance from src to every cell (UNREACHED if cut off)."""
+    d = array("i", [UNREACHED]) * len(grid.data)
+    if grid.data[src] == 1:
+        return d
+    d[src] = 0
+    q = deque([src])
+    while q:
+        u = q.popleft()
+        du = d[u] + 1
+        for v in free_neighbours(grid, u):
+            if d[v] == UNREACHED:
+                d[v] = du
+                q.append(v)
+    return d
+
+
+def lower_from(grid, d, src, exact=True):
+    """
+    src was just freed: label it from its neighbours and push any
+    shortening outwards. Returns the number of cells relabelled.
+
+    exact=False is for tables that keep stale (too short) distances
+    after walls are added (landmarks.py). A stale finite label on src
+    (even a landmark's own 0) says nothing about the cells it
+    reconnects, so the wave always goes out from src; only an exact
+    field may stop when src's label is already as good as its
+    neighbours'.
+    """
+    known = [d[v] for v in free_neighbours(grid, src) if d[v] != UNREACHED]
+    touched = 0
+    if known:
+        best = min(known) + 1
+        if d[src] == UNREACHED or best < d[src]:
+            d[src] = best
+            touched = 1
+        elif exact:
+            return 0
+    if d[src] == UNREACHED:
+        return 0
+    q = deque([src])
+    while q:
+        u = q.popleft()
+        du = d[u] + 1
+        for v in free_neighbours(grid, u):
+            if d[v] == UNREACHED or d[v] > du:
+                d[v] = du
+                touched += 1
+                q.append(v)
+    return touched
+
+
+def raise_from(grid, d, cell):
+    """
+    cell just became a wall. Un-label every cell that has lost all of
+    its downhill neighbours, then relabel that region from its
+    boundary. Returns the number of cells touched.
+    """
+    if d[cell] == UNREACHED:
+        return 0
+    level, d[cell] = d[cell], UNREACHED
+    if level == 0:                     # the source was walled in
+        orphans = [i for i in range(len(d)) if d[i] != UNREACHED]
+        for i in orphans:
+            d[i] = UNREACHED
+        return len(orphans) + 1
+
+    # Phase 1 — levels are visited in increasing order, so every
+    # possible support of a cell is settled before the cell is checked.
+    orphans = []
+    q = deque(v for v in free_neighbours(grid, cell) if d[v] == level + 1)
+    while q:
+        v = q.popleft()
+        dv = d[v]
+        if dv == UNREACHED:
+            continue
+        nbrs = free_neighbours(grid, v)
+        if any(d[u] == dv - 1 for u in nbrs):
+            continue
+        d[v] = UNREACHED
+        orphans.append(v)
+        q.extend(w for w in nbrs if d[w] == dv + 1)
+
+    # Phase 2 — Dijkstra over the orphaned region from its boundary.
+    heap = []
+    for v in orphans:
+        known = [d[u] for u in free_neighbours(grid, v) if d[u] != UNREACHED]
+        if known:
+            heap.append((min(known) + 1, v))
+    heapq.heapify(heap)
+    while heap:
+        dv, v = heapq.heappop(heap)
+        if d[v] != UNREACHED and d[v] <= dv:
+            continue
+        d[v] = dv
+        for w in free_neighbours(grid, v):
+            if d[w] == UNREACHED or d[w] > dv + 1:
+                heapq.heappush(heap, (dv + 1, w))
+    return len(orphans) + 1
+
+
+# ----------------------------------------------------------------------
+# Field
+# ----------------------------------------------------------------------
+class DistanceField:
+    """Exact distance-to-goal for every cell of grid, kept in sync lazily."""
+
+    def __init__(self, grid, goal):
+        self.grid    = grid
+        self.goal    = goal
+        self.goal_id = grid.index(goal)
+        self.version = grid.wall_version
+        self.dist    = bfs_distances(grid, self.goal_id)
+        self.last_work = len(grid.data)   # cells (re)labelled by the last update
+
+    def sync(self):
+        """Replay wall edits since the last sync (or rebuild if the log is gone)."""
+        grid = self.grid
+        if self.version == grid.wall_version:
+            self.last_work = 0
+            return
+        version = grid.wall_version              # before the log: see Grid
+        changes = grid.wall_changes_since(self.version, version)
+        if changes is None:
+            self.dist = bfs_distances(grid, self.goal_id)
+            self.last_work = len(grid.data)
+        else:
+            work = 0
+            for i, is_wall in changes:
+                if is_wall:
+                    work += raise_from(grid, self.dist, i)
+                else:
+                    work += lower_from(grid, self.dist, i)
+            self.last_work = work
+        self.version = version
+
+    def distance(self, cell):
+        """Steps from cell to the goal, or None if unreachable."""
+        d = self.dist[self.grid.index(cell)]
+        return None if d == UNREACHED else d
+
+    def path_from(self, start):
+        """Downhill walk from start to the goal; [] if unreachable."""
+        grid, dist, cols = self.grid, self.dist, self.grid.cols
+        i = grid.index(start)
+        if dist[i] == UNREACHED:
+            return []
+        path = [start]
+        while dist[i] > 0:
+            want = dist[i] - 1
+            i = next(v for v in free_neighbours(grid, i) if dist[v] == want)
+            path.append(divmod(i, cols))
+        return path
+
+
+def field_for(grid, goal):
+    """Shared, up-to-date DistanceField for (grid, goal)."""
+    per_grid = _fields.setdefault(grid, {})
+    key = grid.index(goal)
+    field = per_grid.get(key)
+    if field is None:
+        if len(per_grid) >= MAX_FIELDS_PER_GRID:
+            per_grid.pop(next(iter(per_grid)))
+        field = per_grid[key] = DistanceField(grid, goal)
+    else:
+        field.sync()
+    return field
+
+
+# ----------------------------------------------------------------------
+# Engine wrapper — same interface as AStarSearch
+# ----------------------------------------------------------------------
+class DistanceFieldSearch:
+    """
+    Answers a query from the goal's shared distance field. The first
+    query on a goal pays for one BFS over the grid; later queries (any
+    start) only walk the gradient, plus whatever repair the wall edits
+    since then require. nodes_visited counts the cells labelled for
+    this query, so it drops to 0 once the field is warm.
+
+    heuristic is accepted for interface compatibility and ignored.
+    """
+
+    def __init__(self, grid, start, goal, heuristic="manhattan"):
+        self.grid  = grid
+        self.start = start
+        self.goal  = goal
+        self.done  = False
+        self.path  = []
+        self.path_index = PathIndex()
+        self.nodes_visited = 0
+
+    def step(self):
+        """Yields a single "found" / "no_path" event (same shape as A*)."""
+        result = self.solve()
+        yield {
+            "type"    : result["type"],
+            "current" : self.start if self.path else None,
+            "added"   : [],
+            "removed" : [],
+            "path"    : self.path
+        }
+
+    def solve(self):
+        """
+        Returns:
+            {"type", "path", "cost", "nodes_visited"} as AStarSearch.solve()
+        """
+        field = field_for(self.grid, self.goal)
+        self.nodes_visited = field.last_work
+        self.path = field.path_from(self.start)
+        self.path_index = PathIndex(self.path)
+        self.done = True
+        if self.path:
+            return {"type": "found", "path": self.path,
+                    "cost": len(self.path) - 1, "nodes_visited": self.nodes_visited}
+        return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": self.nodes_visited}
+
+    def notify_wall_added(self, cell):
+        """Returns True if the wall lands on the current path."""
+        return cell in self.path_index
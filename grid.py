@@ -0,0 +1,222 @@
+import random
+from array import array
+from compact import UP, DOWN, LEFT, RIGHT
+
+# data byte -> 1 << d if the cell can be entered, else 0 (for bytes.translate)
+_ENTER = [bytes(0 if v == 1 else 1 << d for v in range(256)) for d in range(4)]   # 1 = WALL
+
+
+class Grid:
+    """
+    Cell states live in one flat bytearray (self.data, one byte per
+    cell, indexed by r*cols + c). self.cells is a list of memoryview
+    rows over that same buffer, so cells[r][c] reads and writes still
+    work unchanged while the engines use the flat ids directly.
+
+    Only the static map lives here (EMPTY / WALL / START / GOAL); the
+    search visualisation values FRONT..AGENT belong in an Overlay, so
+    the engines never see them.
+
+    Changes to walls made through set() are recorded in wall_log so
+    derived tables (e.g. landmark distances) can catch up incrementally;
+    writing WALL through cells[r][c] directly bypasses the log. A table
+    takes wall_version before reading the map, so an edit made while it
+    builds or syncs (from another thread) is replayed on its next sync.
+
+    self.nbr holds a 4-bit mask per cell: bit d (UP, DOWN, LEFT, RIGHT
+    as in compact.py) is set when the move d from that cell stays on the
+    grid and lands on a non-wall cell. set() keeps it current in O(1);
+    after writing data / cells directly, call rebuild_masks().
+    self.steps[mask] lists the moves a mask allows as (id offset, dr,
+    dc, d), so engines walk successors with no bounds or wall checks.
+    """
+    EMPTY=0; WALL=1; START=2; GOAL=3; FRONT=4; VISIT=5; PATH=6; AGENT=7
+
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.data  = bytearray(rows*cols)
+        view       = memoryview(self.data)
+        self.cells = [view[r*cols:(r+1)*cols] for r in range(rows)]
+        self.wall_version  = 0     # bumped on every wall added/removed
+        self.wall_log      = []    # (flat id, is_wall_now) since wall_log_base
+        self.wall_log_base = 0     # wall_version the log starts from
+        self.start = (rows-2, 1)
+        self.goal  = (1, cols-2)
+        self.cells[self.start[0]][self.start[1]] = self.START
+        self.cells[self.goal[0]][self.goal[1]]   = self.GOAL
+        self.nbr   = bytearray(rows*cols)    # id -> passable-neighbour mask
+        moves = ((-cols, -1, 0, UP), (cols, 1, 0, DOWN), (-1, 0, -1, LEFT), (1, 0, 1, RIGHT))
+        self.steps = tuple(tuple(mv for mv in moves if m >> mv[3] & 1) for m in range(16))
+        self.rebuild_masks()
+
+    def index(self, cell):
+        """(r, c) -> flat id."""
+        return cell[0]*self.cols + cell[1]
+
+    def cell(self, i):
+        """flat id -> (r, c)."""
+        return divmod(i, self.cols)
+
+    def set(self, r, c, val):
+        if (r,c) not in (self.start, self.goal):
+            was_wall = self.cells[r][c] == self.WALL
+            self.cells[r][c] = val
+            if was_wall != (val == self.WALL):
+                self._update_masks(r*self.cols + c, val != self.WALL)
+                self._log_wall(r*self.cols + c, not was_wall)
+
+    def _update_masks(self, i, enterable):
+        """Set or clear the bits of i's neighbours that point at i — O(1)."""
+        nbr, cols = self.nbr, self.cols
+        c = i % cols
+        for j, bit, ok in ((i - cols, 1 << DOWN,  i >= cols),
+                           (i + cols, 1 << UP,    i < len(nbr) - cols),
+                           (i - 1,    1 << RIGHT, c > 0),
+                           (i + 1,    1 << LEFT,  c < cols - 1)):
+            if ok:
+                nbr[j] = nbr[j] | bit if enterable else nbr[j] & ~bit
+
+    def rebuild_masks(self):
+        """
+        Recompute every mask from data, O(n) but as whole-grid integer
+        shifts (one per direction) rather than a Python loop per cell.
+        """
+        n, row = len(self.data), 8*self.cols
+        data, full = self.data, (1 << 8*n) - 1
+        def enter(d):
+            return int.from_bytes(data.translate(_ENTER[d]), "little")
+        not_first = int.from_bytes((b"\0" + b"\xff"*(self.cols-1)) * self.rows, "little")
+        not_last  = int.from_bytes((b"\xff"*(self.cols-1) + b"\0") * self.rows, "little")
+        masks = ((enter(UP) << row) & full | enter(DOWN) >> row
+                 | (enter(LEFT) << 8) & not_first | (enter(RIGHT) >> 8) & not_last)
+        self.nbr[:] = masks.to_bytes(n, "little")
+
+    def _log_wall(self, i, is_wall):
+        # The version is bumped last: a table syncing on another thread
+        # that reads it finds the log (and data, masks) already there
+        if len(self.wall_log) >= self.rows*self.cols:
+            # Too far behind to be worth replaying — consumers rebuild.
+            self.wall_log_base = self.wall_version + 1
+            self.wall_log = []
+        else:
+            self.wall_log.append((i, is_wall))
+        self.wall_version += 1
+
+    def wall_changes_since(self, version, until=None):
+        """
+        Wall edits made after version (up to until, if given), as
+        [(flat id, is_wall), ...], or None if the log no longer reaches
+        back that far. A restarted log is a new list with its base set
+        first, so a reader on another thread sees a consistent pair.
+        """
+        base, log = self.wall_log_base, self.wall_log
+        if version < base:
+            return None
+        changes = log[version - base:] if until is None else log[version - base:until - base]
+        if self.wall_log_base != base:           # restarted while reading
+            return None
+        return changes
+
+    def generate_random(self, density, rng=None):
+        """Fill with random walls. Pass a seeded random.Random for reproducible maps."""
+        rand = (rng or random).random
+        keep = (self.index(self.start), self.index(self.goal))
+        data = self.data
+        for i in range(self.rows*self.cols):
+            if i not in keep:
+                data[i] = self.WALL if rand() < density else self.EMPTY
+        self.rebuild_masks()
+        self.wall_log_base = self.wall_version + 1
+        self.wall_log = []
+        self.wall_version += 1
+
+
+class Overlay:
+    """
+    Search visualisation drawn over a Grid: one of FRONT / VISIT / PATH /
+    AGENT per flat id, or 0 for none. An entry only counts while its
+    stamp equals the current generation, so clear() just bumps the
+    generation — O(1) however large the grid.
+
+    Ids written since the last take_dirty() are queued in dirty for the
+    renderer; after a clear() it must repaint everything (see cleared).
+    """
+
+    def __init__(self, n):
+        self.value      = bytearray(n)
+        self.stamp      = array("I", [0]) * n
+        self.generation = 1
+        self.dirty      = []
+        self.cleared    = True     # set by clear(), reset by take_dirty()
+
+    def get(self, i):
+        return self.value[i] if self.stamp[i] == self.generation else 0
+
+    def set(self, i, val):
+        self.value[i] = val
+        self.stamp[i] = self.generation
+        self.dirty.append(i)
+
+    def clear(self):
+        self.generation += 1
+        if self.generation == 2**32:          # stamps would alias: reset them
+            self.stamp = array("I", [0]) * len(self.value)
+            self.generation = 1
+        self.dirty.clear()
+        self.cleared = True
+
+    def take_dirty(self):
+        """(cleared, ids) since the last call; cleared means repaint all."""
+        cleared, dirty = self.cleared, self.dirty
+        self.cleared, self.dirty = False, []
+        return cleared, dirty
+
+
+class PathIndex:
+    """
+    A path being walked: its cells, an O(1) cell -> position index, and
+    a cursor (at) on the walker's cell. Cells before the cursor are behind.
+    """
+
+    def __init__(self, path=()):
+        self.cells = list(path)
+        self.pos   = {cell: k for k, cell in enumerate(self.cells)}
+        self.at    = 0
+
+    def __contains__(self, cell):
+        return cell in self.pos
+
+    def __len__(self):
+        """Steps left to the end of the path."""
+        return max(len(self.cells) - 1 - self.at, 0)
+
+    def current(self):
+        return self.cells[self.at] if self.cells else None
+
+    def advance(self):
+        self.at += 1
+        return self.current()
+
+    def ahead(self, cell):
+        """Position of cell if it is still ahead of the cursor, else -1."""
+        k = self.pos.get(cell, -1)
+        return k if k > self.at else -1
+
+    def remaining(self):
+        return self.cells[self.at:]
+
+    def reroute(self, k, detour):
+        """
+        Replace the cells from the cursor up to position k by detour
+        (which runs from the current cell to cells[k]), keeping the rest.
+        Loops the detour makes through the kept tail are cut out.
+        """
+        joined = list(detour) + self.cells[k+1:]
+        last   = {cell: j for j, cell in enumerate(joined)}
+        cells, j = [], 0
+        while j < len(joined):
+            cells.append(joined[j])
+            j = last[joined[j]] + 1
+        self.cells = cells
+        self.pos   = {cell: k for k, cell in enumerate(cells)}
+        self.at    = 0
@@ -1,4 +1,5 @@
 import math
+from landmarks import landmarks_for
 
 
 def manhattan(a, b):
@@ -14,4 +15,49 @@ def euclidean(a, b):
     Euclidean distance between two grid cells.
     a, b: tuples of (row, col)
     """
-    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
\ No newline at end of file
+    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+
+
+def landmark(grid):
+    """
+    Landmark (ALT) lower bound on grid, max'ed with Manhattan.
+    Returns a function of two (row, col) tuples like the ones above.
+    """
+    table, cols = landmarks_for(grid), grid.cols
+    bound = table.lower_bound
+
+    def h(a, b):
+        return max(abs(a[0] - b[0]) + abs(a[1] - b[1]),
+                   bound(a[0]*cols + a[1], b[0]*cols + b[1]))
+    return h
+
+
+def get_heuristic(name, grid=None):
+    """Pair heuristic h(a, b) for a name from the HEURISTIC dropdown."""
+    if name == "euclidean":
+        return euclidean
+    if name == "landmark":
+        return landmark(grid)
+    return manhattan
+
+
+def node_heuristic(name, grid, goal):
+    """
+    Heuristic towards a fixed goal as a function of a flat id
+    (r*cols + c), for the engines' inner loops.
+    """
+    cols = grid.cols
+    gr, gc = goal
+    if name == "euclidean":
+        def h(i):
+            dr, dc = i // cols - gr, i % cols - gc
+            return math.sqrt(dr * dr + dc * dc)
+    elif name == "landmark":
+        bound, g_id = landmarks_for(grid).lower_bound, gr*cols + gc
+
+        def h(i):
+            return max(abs(i // cols - gr) + abs(i % cols - gc), bound(i, g_id))
+    else:
+        def h(i):
+            return abs(i // cols - gr) + abs(i % cols - gc)
+    return h
@@ -0,0 +1,168 @@
+"""
+Opt-in instrumentation for the best-first engines (AStarSearch, GBFSearch).
+
+    probe  = Probe(callback=sample, every=10000)
+    result = AStarSearch(grid, start, goal, probe=probe).solve()
+    probe.report()          # {"counters": {...}, "time_ms": {...}, ...}
+    probe.export("runs.jsonl", engine="astar")
+
+An engine built without a probe runs exactly the code it always did;
+the only cost is one "is None" test per solve(). With a probe, attach()
+shadows the engine's open list push / pop, neighbour generator,
+heuristic, path reconstruction and step() with counting, timing shims
+(instance attributes, so the class is untouched), and solve() is driven
+through step() so every expansion passes through them. Expect a probed
+run to take about twice as long as a plain one.
+
+Counters:
+    expansions       nodes expanded (nodes_visited)
+    pushes / pops    open list entries added / taken (see open_lists.py)
+    stale_pops       superseded heap entries skipped on pop
+    decrease_keys    queued entries moved up in place
+    peak_open        largest open list size
+    neighbours       successors generated
+    h_calls          heuristic evaluations
+    g_improvements   times a node's g was lowered (0 for GBFS, no g)
+
+time_ms: setup (constructor, including per-grid tables), search (time
+inside step(), reconstruct excluded), reconstruct, and the parts of
+search spent in open_list, neighbours and heuristic: the hot spots.
+
+callback(probe) is called every `every` expansions (if every > 0) and
+once when the search ends, on the thread running the search. A sampling
+profiler can read probe.report() there, or diff it with the previous
+sample to see where the time of the last stretch went.
+"""
+import json
+import time
+
+COUNTERS = ("expansions", "pushes", "pops", "stale_pops", "decrease_keys", "peak_open",
+            "neighbours", "h_calls", "g_improvements")
+PHASES   = ("setup", "search", "reconstruct", "open_list", "neighbours", "heuristic")
+
+
+class Probe:
+    def __init__(self, callback=None, every=0):
+        self.callback = callback
+        self.every    = every
+        self.engine   = None
+        self.finished = False
+        self.neighbours = self.h_calls = self.push_calls = 0
+        self.time = dict.fromkeys(PHASES, 0.0)      # seconds per phase
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def counters(self):
+        """Current counter values (see module docstring)."""
+        engine = self.engine
+        stats  = engine.open_set.stats if engine is not None else {}
+        improves_g = engine is not None and hasattr(engine, "g_score")
+        return {
+            "expansions"    : engine.nodes_visited if engine is not None else 0,
+            "pushes"        : stats.get("pushes", 0),
+            "pops"          : stats.get("pops", 0),
+            "stale_pops"    : stats.get("stale_pops", 0),
+            "decrease_keys" : stats.get("decrease_keys", 0),
+            "peak_open"     : stats.get("peak", 0),
+            "neighbours"    : self.neighbours,
+            "h_calls"       : self.h_calls,
+            # the start is queued before attach(); every later push
+            # comes from a lowered g
+            "g_improvements": self.push_calls if improves_g else 0,
+        }
+
+    def report(self):
+        """One JSON-ready record of the run so far."""
+        return {
+            "engine"  : type(self.engine).__name__ if self.engine is not None else None,
+            "finished": self.finished,
+            "counters": self.counters(),
+            "time_ms" : {k: round(v * 1000, 3) for k, v in self.time.items()},
+        }
+
+    def export(self, path, **fields):
+        """Append report() plus any extra fields as one JSON line to path."""
+        rec = dict(fields, **self.report())
+        with open(path, "a") as f:
+            f.write(json.dumps(rec) + "\n")
+        return rec
+
+    # ------------------------------------------------------------------
+    # Wiring (called from the engine constructors)
+    # ------------------------------------------------------------------
+    def attach(self, engine, setup_s=0.0):
+        """Shadow engine's hot paths with counting, timing wrappers."""
+        self.engine = engine
+        self.time["setup"] += setup_s
+        clock, t = time.perf_counter, self.time
+        ol = engine.open_set
+
+        push, pop = ol.push, ol.pop
+        def timed_push(node, f, g):
+            t0 = clock()
+            push(node, f, g)
+            self.push_calls += 1
+            t["open_list"] += clock() - t0
+        def timed_pop():
+            t0 = clock()
+            out = pop()
+            t["open_list"] += clock() - t0
+            return out
+        ol.push, ol.pop = timed_push, timed_pop
+
+        neighbours = engine._neighbours
+        def timed_neighbours(i):
+            t0 = clock()
+            out = list(neighbours(i))
+            self.neighbours += len(out)
+            t["neighbours"] += clock() - t0
+            return out
+        engine._neighbours = timed_neighbours
+
+        h_node = engine.h_node
+        def timed_h(i):
+            t0 = clock()
+            h = h_node(i)
+            self.h_calls += 1
+            t["heuristic"] += clock() - t0
+            return h
+        engine.h_node = timed_h
+
+        reconstruct = engine._reconstruct_path
+        def timed_reconstruct():
+            t0 = clock()
+            path = reconstruct()
+            t["reconstruct"] += clock() - t0
+            return path
+        engine._reconstruct_path = timed_reconstruct
+
+        step = engine.step
+        def timed_step():
+            gen, every, callback = step(), self.every, self.callback
+            while True:
+                t0, r0 = clock(), t["reconstruct"]
+                try:
+                    event = next(gen)
+                except StopIteration:
+                    return
+                finally:
+                    t["search"] += clock() - t0 - (t["reconstruct"] - r0)
+                if event["type"] != "step":
+                    self.finished = True
+                    if callback is not None:
+                        callback(self)
+                elif every and callback is not None and engine.nodes_visited % every == 0:
+                    callback(self)
+                yield event
+        engine.step = timed_step
+
+    def solve(self):
+        """The engine's solve(), driven through the wrapped step()."""
+        engine = self.engine
+        for event in engine.step():
+            pass
+        if event["type"] == "found":
+            return {"type": "found", "path": engine.path,
+                    "cost": len(engine.path) - 1, "nodes_visited": engine.nodes_visited}
+        return {"type": "no_path", "path": [], "cost": 0, "nodes_visited": engine.nodes_visited}
@@ -0,0 +1,111 @@
+"""
+Landmark (ALT) heuristic: exact BFS distances from K landmark cells,
+combined through the triangle inequality
+
+    dist(a, b) >= |d(L, a) - d(L, b)|      for every landmark L.
+
+Tables are built once per grid and shared by every query on it
+(landmarks_for caches them). Wall edits logged by Grid.set are replayed
+lazily the next time the table is fetched:
+
+  * a wall added leaves the table admissible (old distances can only
+    be shorter than new ones), so it is just counted as staleness;
+  * a wall removed can shorten distances, so a decrease-only BFS wave
+    is run from the freed cell in each landmark table (always, even if
+    the freed cell kept a stale label: see lower_from's exact=False).
+
+Once too many additions have piled up, or the grid was regenerated,
+the tables are rebuilt from scratch.
+"""
+import weakref
+
+from distance_field import UNREACHED, bfs_distances, lower_from
+
+DEFAULT_K = 8
+
+_tables = weakref.WeakKeyDictionary()    # grid -> LandmarkTable
+
+
+class LandmarkTable:
+    def __init__(self, grid, k=DEFAULT_K):
+        self.grid    = grid
+        self.k       = k
+        self.version = grid.wall_version
+        self.stale   = 0                 # wall additions not reflected in dist
+        self.landmarks = []              # flat ids
+        self.dist      = []              # one array('i') per landmark
+        self._select()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def lower_bound(self, a, b):
+        """Admissible distance estimate between flat ids a and b."""
+        best = 0
+        for d in self.dist:
+            da, db = d[a], d[b]
+            if da == UNREACHED or db == UNREACHED:
+                if da != db:
+                    return float("inf")    # different components
+                continue
+            diff = da - db if da > db else db - da
+            if diff > best:
+                best = diff
+        return best
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def sync(self):
+        """Catch up with wall edits made since the table was built."""
+        grid = self.grid
+        if self.version == grid.wall_version:
+            return
+        version = grid.wall_version              # before the log: see Grid
+        changes = grid.wall_changes_since(self.version, version)
+        if changes is None:
+            self._select()
+            return
+        for i, is_wall in changes:
+            if is_wall:
+                self.stale += 1
+            else:
+                for d in self.dist:
+                    lower_from(self.grid, d, i, exact=False)
+        self.version = version
+        if self.stale > max(16, grid.rows*grid.cols // 200):
+            self._select()
+
+    def _select(self):
+        """Farthest-point landmark selection, then one BFS per landmark."""
+        grid, data = self.grid, self.grid.data
+        self.version   = grid.wall_version
+        self.stale     = 0
+        self.landmarks = []
+        self.dist      = []
+        seed = next((i for i in range(len(data)) if data[i] != 1), None)   # 1 = WALL
+        if seed is None:
+            return
+        # Closest-landmark distance per cell; start from the seed's BFS
+        # so the first landmark lands on the far edge of its component.
+        spread = bfs_distances(self.grid, seed)
+        for _ in range(self.k):
+            far = max(range(len(spread)), key=spread.__getitem__)
+            if spread[far] <= 0:
+                break
+            d = bfs_distances(self.grid, far)
+            self.landmarks.append(far)
+            self.dist.append(d)
+            for i in range(len(spread)):
+                if d[i] != UNREACHED and d[i] < spread[i]:
+                    spread[i] = d[i]
+
+
+def landmarks_for(grid, k=DEFAULT_K):
+    """Shared, up-to-date LandmarkTable for grid (built on first use)."""
+    table = _tables.get(grid)
+    if table is None or table.k != k:
+        table = _tables[grid] = LandmarkTable(grid, k)
+    else:
+        table.sync()
+    return table
@@ -0,0 +1,291 @@
+"""
+Open lists (priority queues) for the best-first engines.
+
+Every backend works on flat node ids and has the same interface:
+
+    push(node, f, g)   queue node, or lower its key if it is already queued
+    pop() -> (node, g) best entry, or (-1, 0) once the list is exhausted
+    closed             bitset (compact.py) of the nodes popped so far
+    stats              {"pushes", "pops", "stale_pops", "decrease_keys", "peak"}
+
+Backends:
+
+  "heap"     heapq with lazy deletion — a better g pushes a duplicate and
+             the old entry is skipped when it surfaces (a stale pop). An
+             infinite f sorts last and is never popped.
+  "indexed"  binary heap with a position index, so a better g moves the
+             existing entry up (decrease-key): no duplicates, no stale pops.
+  "bucket"   bucket queue for integer priorities: one list per key and a
+             small heap over the distinct keys, O(1) push / pop / decrease
+             within a bucket. Needs integer f (Manhattan, landmark); an
+             infinite f (landmark: other component) is not queued.
+  "auto"     "bucket" when f is integral, else "indexed".
+
+Ties on f are broken by g: tie="low_g" (the engines' historical order)
+or tie="high_g", which prefers nodes closer to the goal and usually
+expands fewer of the equal-f plateau. Remaining ties go to the lower id
+("heap", "indexed") or the most recently queued node ("bucket").
+"""
+import heapq
+from array import array
+from compact import bitset
+
+INF      = float("inf")
+BACKENDS = ("heap", "indexed", "bucket", "auto")
+TIES     = ("low_g", "high_g")
+
+
+def make_open_list(kind, n, tie="low_g", integer=True):
+    """Open list of the named backend for n nodes (see module docstring)."""
+    if tie not in TIES:
+        raise ValueError(f"unknown tie-breaking {tie!r} (choose from {', '.join(TIES)})")
+    if kind == "auto":
+        kind = "bucket" if integer else "indexed"
+    if kind == "heap":
+        return LazyHeap(n, tie, integer)
+    if kind == "indexed":
+        return IndexedHeap(n, tie)
+    if kind == "bucket":
+        if not integer:
+            raise ValueError("bucket open list needs integer costs; use 'indexed' for euclidean")
+        return BucketQueue(n, tie)
+    raise ValueError(f"unknown open list {kind!r} (choose from {', '.join(BACKENDS)})")
+
+
+class _Counters:
+    """Queue counters kept as plain attributes (cheap in the hot loop)."""
+    pushes = pops = stale_pops = decrease_keys = peak = 0
+
+    @property
+    def stats(self):
+        return {"pushes": self.pushes, "pops": self.pops, "stale_pops": self.stale_pops,
+                "decrease_keys": self.decrease_keys, "peak": self.peak}
+
+
+# ----------------------------------------------------------------------
+# Lazy binary heap (baseline)
+# ----------------------------------------------------------------------
+class LazyHeap(_Counters):
+    """
+    Entries fold the tie-break and node into one int, as BucketQueue
+    does: (f*n + t)*n + node with t = g (low_g) or n-1-g (high_g), which
+    heapq compares and stores far more cheaply than (f, ±g, node)
+    tuples. Non-integer f (euclidean) is kept beside it as (f, t*n +
+    node). The order is the same either way. Which push / pop an
+    instance uses is fixed at construction.
+    """
+
+    def __init__(self, n, tie="low_g", integer=True):
+        self.n      = n
+        self.heap   = []                 # packed entries, see above
+        self.closed = bitset(n)
+        self.high_g = tie == "high_g"
+        if not integer:
+            self.push, self.pop = self._push_pair, self._pop_pair
+
+    def __len__(self):
+        return len(self.heap)
+
+    @property
+    def pushes(self):
+        # every entry pushed is still queued or was popped (live or stale)
+        return len(self.heap) + self.pops + self.stale_pops
+
+    def push(self, node, f, g):
+        n = self.n
+        heapq.heappush(self.heap, (f*n + (n - 1 - g if self.high_g else g))*n + node)
+
+    def pop(self):
+        n, heap, closed = self.n, self.heap, self.closed
+        if len(heap) > self.peak:        # the heap is at its largest before a pop
+            self.peak = len(heap)
+        while heap:
+            k = heapq.heappop(heap)
+            if k == INF:                 # only nodes cut off from the goal are left
+                heap.clear()
+                break
+            node = k % n
+            if closed[node >> 3] >> (node & 7) & 1:
+                self.stale_pops += 1
+                continue
+            closed[node >> 3] |= 1 << (node & 7)
+            self.pops += 1
+            t = k // n % n
+            return node, (n - 1 - t if self.high_g else t)
+        return -1, 0
+
+    def _push_pair(self, node, f, g):
+        n = self.n
+        heapq.heappush(self.heap, (f, (n - 1 - g if self.high_g else g)*n + node))
+
+    def _pop_pair(self):
+        n, heap, closed = self.n, self.heap, self.closed
+        if len(heap) > self.peak:
+            self.peak = len(heap)
+        while heap:
+            k = heapq.heappop(heap)[1]
+            node = k % n
+            if closed[node >> 3] >> (node & 7) & 1:
+                self.stale_pops += 1
+                continue
+            closed[node >> 3] |= 1 << (node & 7)
+            self.pops += 1
+            t = k // n
+            return node, (n - 1 - t if self.high_g else t)
+        return -1, 0
+
+
+# ----------------------------------------------------------------------
+# Indexed binary heap with decrease-key
+# ----------------------------------------------------------------------
+class IndexedHeap(_Counters):
+    def __init__(self, n, tie="low_g"):
+        self.heap  = []                  # nodes, heap-ordered by key
+        self.key   = [None] * n          # node -> (f, ±g, node)
+        self.pos   = array("i", [-1]) * n
+        self.sign  = 1 if tie == "low_g" else -1
+        self.closed = bitset(n)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, node, f, g):
+        k = (f, self.sign * g, node)
+        p = self.pos[node]
+        if p >= 0:
+            if k >= self.key[node]:
+                return
+            self.key[node] = k
+            self.decrease_keys += 1
+            self._up(p)
+            return
+        self.key[node] = k
+        self.heap.append(node)
+        self._up(len(self.heap) - 1)
+        self.pushes += 1
+        if len(self.heap) > self.peak:
+            self.peak = len(self.heap)
+
+    def pop(self):
+        heap = self.heap
+        if not heap:
+            return -1, 0
+        node = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._down(0)
+        self.pos[node] = -1
+        self.closed[node >> 3] |= 1 << (node & 7)
+        self.pops += 1
+        return node, self.sign * self.key[node][1]
+
+    def _up(self, i):
+        heap, key, pos = self.heap, self.key, self.pos
+        node = heap[i]
+        k = key[node]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = heap[parent]
+            if key[p] <= k:
+                break
+            heap[i] = p
+            pos[p] = i
+            i = parent
+        heap[i] = node
+        pos[node] = i
+
+    def _down(self, i):
+        heap, key, pos = self.heap, self.key, self.pos
+        size = len(heap)
+        node = heap[i]
+        k = key[node]
+        while True:
+            child = 2*i + 1
+            if child >= size:
+                break
+            if child + 1 < size and key[heap[child+1]] < key[heap[child]]:
+                child += 1
+            c = heap[child]
+            if k <= key[c]:
+                break
+            heap[i] = c
+            pos[c] = i
+            i = child
+        heap[i] = node
+        pos[node] = i
+
+
+# ----------------------------------------------------------------------
+# Bucket queue (integer priorities)
+# ----------------------------------------------------------------------
+class BucketQueue(_Counters):
+    """
+    The bucket key folds the tie-break into one integer,
+    f*span + (g or span-1-g) with span = n > any g, so each bucket holds
+    nodes that are fully tied. Only distinct keys go through the heap.
+    """
+
+    def __init__(self, n, tie="low_g"):
+        self.span    = n
+        self.high_g  = tie == "high_g"
+        self.buckets = {}                    # key -> [node, ...]
+        self.keys    = []                    # min-heap of bucket keys
+        self.where   = array("q", [0]) * n   # node -> its bucket key
+        self.pos     = array("i", [-1]) * n  # node -> index in its bucket
+        self.size    = 0
+        self.closed  = bitset(n)
+
+    def __len__(self):
+        return self.size
+
+    def push(self, node, f, g):
+        if f == INF:                         # provably cut off from the goal
+            return
+        span = self.span
+        k = f*span + (span - 1 - g if self.high_g else g)
+        p = self.pos[node]
+        if p >= 0:
+            if k >= self.where[node]:
+                return
+            self._remove(node, p)
+            self.decrease_keys += 1
+        else:
+            self.size += 1
+            self.pushes += 1
+            if self.size > self.peak:
+                self.peak = self.size
+        bucket = self.buckets.get(k)
+        if bucket is None:
+            bucket = self.buckets[k] = []
+            heapq.heappush(self.keys, k)
+        self.pos[node]   = len(bucket)
+        self.where[node] = k
+        bucket.append(node)
+
+    def pop(self):
+        keys, buckets = self.keys, self.buckets
+        while keys:
+            k = keys[0]
+            bucket = buckets.get(k)
+            if not bucket:                   # emptied by decrease-key
+                if bucket is not None:
+                    del buckets[k]
+                heapq.heappop(keys)
+                continue
+            node = bucket.pop()
+            self.pos[node] = -1
+            self.closed[node >> 3] |= 1 << (node & 7)
+            self.size -= 1
+            self.pops += 1
+            t = k % self.span
+            return node, (self.span - 1 - t if self.high_g else t)
+        return -1, 0
+
+    def _remove(self, node, p):
+        bucket = self.buckets[self.where[node]]
+        last = bucket.pop()
+        if last != node:
+            bucket[p] = last
+            self.pos[last] = p
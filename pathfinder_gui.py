@@ -1,4 +1,10 @@
-import pygame, sys, random
+import pygame, sys, random, math, time
+from contextlib import nullcontext
+from functools import partial
+from connectivity import components_for
+from grid import Grid, Overlay, PathIndex
+from search_worker import SearchJob
+from instrument import Probe
 
 pygame.init()
 _info    = pygame.display.Info()
@@ -46,6 +52,22 @@ DEFAULT_COLS    = 30
 GRID_PAD        = 28
 PANEL_PAD       = 18
 FPS             = 60
+MAX_DIRTY_RECTS = 256   # past this many changed cells, update the grid area in one rect
+RASTER_MIN_CELL = 8     # grids whose cells would fit smaller than this use the raster view
+MAX_GRID        = 2000  # ROWS / COLS input limit
+MAX_ZOOM        = 48    # raster view: largest cell size in px
+SEARCH_BUDGET_MS = 10   # search time allowed per frame, whatever the speed setting
+# Expansions per frame for each Speed slider position; None = as many as
+# fit in SEARCH_BUDGET_MS (instant on small grids)
+SPEED_STEPS = (0.5, 1, 2, 4, 8, 16, 32, 64, 256, 1024, None)
+DEFAULT_SPEED = 4
+ARA_DEADLINE_MS = 50    # ARA*: engine time allowed for improving its first path
+PROFILE_LOG = "search_profile.jsonl"   # Profiling mode: one instrumentation record per run
+
+CMAP = {Grid.EMPTY:CELL_EMPTY, Grid.WALL:CELL_WALL, Grid.START:CELL_START,
+        Grid.GOAL:CELL_GOAL, Grid.FRONT:CELL_FRONT, Grid.VISIT:CELL_VISIT,
+        Grid.PATH:CELL_PATH, Grid.AGENT:CELL_AGENT}
+WALL_EDGE = (55, 65, 95)
 
 def rrect(surf, color, rect, r=8, bw=0, bc=None):
     pygame.draw.rect(surf, color, rect, border_radius=r)
@@ -197,12 +219,13 @@ class NumberInput:
 
 
 class Slider:
-    def __init__(self, x, y, w, label, mn=0, mx=100, val=30, color=A_TEAL, font=None):
+    def __init__(self, x, y, w, label, mn=0, mx=100, val=30, color=A_TEAL, font=None, fmt=str):
         self.x, self.y, self.w = x, y, w
         self.label = label
         self.mn, self.mx, self.val = mn, mx, val
         self.color = color
         self.font  = font
+        self.fmt   = fmt      # val -> displayed text
         self.drag  = False
         self.track = pygame.Rect(x, y+22, w, 6)
 
@@ -211,7 +234,7 @@ class Slider:
 
     def draw(self, surf):
         if self.font:
-            surf.blit(self.font.render(f"{self.label}: {self.val}", True, WHITE), (self.x, self.y))
+            surf.blit(self.font.render(f"{self.label}: {self.fmt(self.val)}", True, WHITE), (self.x, self.y))
         pygame.draw.rect(surf, CELL_WALL, self.track, border_radius=3)
         pygame.draw.rect(surf, self.color,
                          pygame.Rect(self.track.x, self.track.y, int(self.norm*self.track.w), self.track.h),
@@ -231,34 +254,6 @@ class Slider:
                 (event.pos[0]-self.track.x)/self.track.w)) * (self.mx-self.mn))
 
 
-class Grid:
-    EMPTY=0; WALL=1; START=2; GOAL=3; FRONT=4; VISIT=5; PATH=6; AGENT=7
-
-    def __init__(self, rows, cols):
-        self.rows, self.cols = rows, cols
-        self.cells = [[self.EMPTY]*cols for _ in range(rows)]
-        self.start = (rows-2, 1)
-        self.goal  = (1, cols-2)
-        self.cells[self.start[0]][self.start[1]] = self.START
-        self.cells[self.goal[0]][self.goal[1]]   = self.GOAL
-
-    def set(self, r, c, val):
-        if (r,c) not in (self.start, self.goal):
-            self.cells[r][c] = val
-
-    def clear_path(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.cells[r][c] in (self.FRONT, self.VISIT, self.PATH, self.AGENT):
-                    self.cells[r][c] = self.EMPTY
-
-    def generate_random(self, density):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if (r,c) not in (self.start, self.goal):
-                    self.cells[r][c] = self.WALL if random.random() < density else self.EMPTY
-
-
 class MetricsBox:
     def __init__(self, x, y, w, font):
         self.x, self.y, self.w = x, y, w
@@ -266,26 +261,47 @@ class MetricsBox:
         self.nodes_visited = 0
         self.path_cost     = 0
         self.exec_time_ms  = 0.0
+        self.bound         = None    # proven cost / optimal, for anytime engines
+        self.probe         = None    # instrument.Probe of a profiled run
         self.status        = "IDLE"
 
+    # Rows added while a profiled run is shown
+    PROBE_ROWS = 6
+
     def draw(self, surf):
-        box = pygame.Rect(self.x, self.y, self.w, 115)
+        rows = self._probe_rows() if self.probe is not None else []
+        box = pygame.Rect(self.x, self.y, self.w, 131 + 16*len(rows))
         rrect(surf, PANEL_DARK, box, r=10, bw=1, bc=BORDER)
         t = self.font.render("─── METRICS ───", True, GREY)
         surf.blit(t, t.get_rect(centerx=box.centerx, y=box.y+10))
-        sc = {"IDLE":GREY,"RUNNING":A_AMBER,"MOVING":A_TEAL,"FOUND":A_GREEN,"NO PATH":A_RED}.get(self.status, WHITE)
+        sc = {"IDLE":GREY,"RUNNING":A_AMBER,"MOVING":A_TEAL,"FOUND":A_GREEN,"NO PATH":A_RED,"ERROR":A_RED}.get(self.status, WHITE)
         st = self.font.render(self.status, True, sc)
         surf.blit(st, st.get_rect(centerx=box.centerx, y=box.y+32))
         for i, (lbl, val, col) in enumerate([
             ("Nodes Visited", str(self.nodes_visited), A_AMBER),
             ("Path Cost",     str(self.path_cost),     A_GREEN),
             ("Exec Time",     f"{self.exec_time_ms:.1f} ms", A_TEAL),
-        ]):
+            ("Subopt. Bound", "—" if self.bound is None else f"≤ {self.bound:.2f}×", A_PURPLE),
+        ] + rows):
             y = box.y + 65 + i*16
             surf.blit(self.font.render(lbl, True, GREY), (box.x+14, y))
             v = self.font.render(val, True, col)
             surf.blit(v, (box.x+self.w-v.get_width()-14, y))
 
+    def _probe_rows(self):
+        """Counter rows of the profiled run, hottest phase last."""
+        c, t = self.probe.counters(), self.probe.time
+        hot = max(("open_list", "neighbours", "heuristic"), key=t.get)
+        share = t[hot] / t["search"] if t["search"] else 0.0
+        return [
+            ("Push / Pop",  f"{c['pushes']} / {c['pops']}", WHITE),
+            ("Stale Skips", str(c["stale_pops"]),           WHITE),
+            ("Neighbours",  str(c["neighbours"]),           WHITE),
+            ("h Calls",     str(c["h_calls"]),              WHITE),
+            ("g Improved",  str(c["g_improvements"]),       WHITE),
+            ("Hot Spot",    f"{hot} {share:.0%}",           A_RED),
+        ]
+
 
 def draw_legend(surf, x, y, w, h, font):
     items = [(CELL_START,"Start"),(CELL_GOAL,"Goal"),(CELL_WALL,"Wall"),
@@ -312,22 +328,27 @@ class ContextMenu:
     def _item_rect(self, i):
         return pygame.Rect(self.x, self.y+self.PAD+i*self.IH, self.W, self.IH)
 
-    def show(self, sx, sy, cell, grid):
+    def show(self, sx, sy, cell, grid, overlay):
         self.visible, self.cell, self.hovered = True, cell, -1
         r, c = cell
+        painted = grid.cells[r][c] == Grid.EMPTY and overlay.get(grid.index(cell))
         self.items = []
         if (r,c) != grid.start:                                       self.items.append(("📍  Set as Start", CELL_START, 'start'))
         if (r,c) != grid.goal:                                        self.items.append(("🎯  Set as Goal",  CELL_GOAL,  'goal'))
         if grid.cells[r][c] != Grid.WALL:                             self.items.append(("✏   Place Wall",  A_TEAL,  'wall'))
         if grid.cells[r][c] == Grid.WALL:                             self.items.append(("⌫   Remove Wall", A_RED,   'clear'))
-        if grid.cells[r][c] not in (Grid.WALL,Grid.START,Grid.GOAL,Grid.EMPTY):
-                                                                      self.items.append(("✕   Clear Cell",  GREY,       'clear'))
+        if painted:                                                   self.items.append(("✕   Clear Cell",  GREY,       'clear'))
         mh = len(self.items)*self.IH + self.PAD*2
         self.x = min(sx, GRID_AREA_W-self.W-4)
         self.y = min(sy, SCREEN_H-mh-4)
 
     def hide(self): self.visible = False; self.cell = None
 
+    def rect(self):
+        """Screen area the menu covers, drop shadow included."""
+        mh = len(self.items)*self.IH + self.PAD*2
+        return pygame.Rect(self.x, self.y, self.W+9, mh+9)
+
     def draw(self, surf, font):
         if not self.visible: return
         mh = len(self.items)*self.IH + self.PAD*2
@@ -368,30 +389,79 @@ class PathfinderApp:
         self.grid_rows  = DEFAULT_ROWS
         self.grid_cols  = DEFAULT_COLS
         self._recompute_layout()
-        self.grid         = Grid(self.grid_rows, self.grid_cols)
+        self._new_grid()
         self.context_menu = ContextMenu()
         self.scroll_y     = 0
         self.panel_surf   = pygame.Surface((PANEL_W, 1100))
 
+        # ── Rendering state ───────────────────────────
+        # The grid area is kept in grid_surf between frames; only cells
+        # whose composed value (map + overlay, see _sync_shown) changed
+        # are redrawn and pushed to the display.
+        self.grid_surf = pygame.Surface((GRID_AREA_W, GRID_AREA_H))
+        self.shown     = bytearray()  # composed cell values on screen
+        self.static    = bytearray()  # grid.data as of the last sync
+        self.shown_for = None       # grid shown / static were sized for
+        self.painted   = None       # (grid, layout) grid_surf was fully painted for
+        self.overlays  = []         # screen rects covered by menus last frame
+        self.shown_view = None      # raster view (zoom, x, y) last painted
+        self.dragging   = False     # raster view is being panned with the mouse
+        self.scan      = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
+        for y in range(0, SCREEN_H, 4):
+            pygame.draw.line(self.scan, (0,0,0,18), (0,y), (SCREEN_W,y))
+
         # ── Search state ──────────────────────────────
-        self.searcher    = None
-        self.search_gen  = None
+        self.search_job  = None     # SearchJob running / last run (see searcher)
+        self.retired_job = None     # last one cancelled; the next job waits for its worker
         self.searching   = False
-        self.start_time  = 0.0
+        self.resume_due  = False    # a repair was asked for while one ran
+        self.search_time = 0.0      # seconds spent in the searcher itself
+        self.step_credit = 0.0      # fractional expansions owed (speeds < 1/frame)
         self.frame_count = 0
 
         # ── Agent movement state ──────────────────────
         self.agent_pos     = None   # current cell agent is on
-        self.agent_path    = []     # remaining path ahead of agent
+        self.agent_route   = PathIndex()   # path being walked, cursor on agent_pos
         self.agent_moving  = False  # True when agent is walking path
+        self.rejoin_at     = None   # route position a running replan heads for
 
         self._build_ui()
 
+    def _new_grid(self):
+        """Fresh empty grid of the current size, with its own overlay."""
+        self.grid    = Grid(self.grid_rows, self.grid_cols)
+        self.overlay = Overlay(self.grid_rows*self.grid_cols)
+
     def _recompute_layout(self):
         uw, uh = GRID_AREA_W-GRID_PAD*2, GRID_AREA_H_USE-GRID_PAD*2
-        self.cell_size  = max(8, min(uw//self.grid_cols, uh//self.grid_rows)-1)
+        fit = min(uw//self.grid_cols, uh//self.grid_rows)-1
+        self.raster     = fit < RASTER_MIN_CELL
+        self.cell_size  = max(8, fit)
         self.grid_off_x = (GRID_AREA_W - self.grid_cols*self.cell_size)//2
         self.grid_off_y = (GRID_AREA_H_USE - self.grid_rows*self.cell_size)//2
+        if self.raster:
+            self._fit_view()
+
+    # ── Raster viewport (large grids) ─────────────────
+    def _fit_view(self):
+        """Zoom the raster view out to the whole grid, centred."""
+        vw, vh = GRID_AREA_W, GRID_AREA_H_USE
+        self.zoom   = min(vw/self.grid_cols, vh/self.grid_rows)   # px per cell
+        self.view_x = (self.grid_cols - vw/self.zoom)/2           # cell at the left edge
+        self.view_y = (self.grid_rows - vh/self.zoom)/2
+
+    def _zoom_at(self, mx, my, factor):
+        """Zoom the raster view keeping the cell under (mx, my) in place."""
+        cx, cy = self.view_x + mx/self.zoom, self.view_y + my/self.zoom
+        lo = min(GRID_AREA_W/self.grid_cols, GRID_AREA_H_USE/self.grid_rows) / 2
+        self.zoom   = max(lo, min(MAX_ZOOM, self.zoom*factor))
+        self.view_x = cx - mx/self.zoom
+        self.view_y = cy - my/self.zoom
+
+    def _pan(self, dx, dy):
+        """Move the raster view by a screen-pixel offset."""
+        self.view_x -= dx/self.zoom
+        self.view_y -= dy/self.zoom
 
     def _build_ui(self):
         px, pw = PANEL_PAD, PANEL_W-PANEL_PAD*2
@@ -400,16 +470,22 @@ class PathfinderApp:
         g1, g2, lh = 14, 5, 14
 
         cy += lh
-        self.dd_algo = Dropdown(px, cy, pw, dh, ["A* Search","Greedy Best-First (GBFS)"],
+        self.dd_algo = Dropdown(px, cy, pw, dh, ["A* Search","Greedy Best-First (GBFS)",
+                                                   "D* Lite (Incremental)","JPS (sparse walls)",
+                                                   "Distance Field (many-to-one)","Bidirectional A*",
+                                                   "Hierarchical (HPA*)","Anytime ARA* (deadline)",
+                                                   "IDA* (memory-bounded)","SMA* (memory-bounded)",
+                                                   "Beam GBFS (bounded frontier)"],
                                 "ALGORITHM", A_TEAL, self.font)
         cy += dh+g1; cy += lh
-        self.dd_heur = Dropdown(px, cy, pw, dh, ["Manhattan Distance","Euclidean Distance"],
+        self.dd_heur = Dropdown(px, cy, pw, dh, ["Manhattan Distance","Euclidean Distance",
+                                                   "Landmark (ALT)"],
                                 "HEURISTIC", A_AMBER, self.font)
         cy += dh+g1; cy += lh
 
         half = (pw-6)//2
-        self.in_rows = NumberInput(px, cy, half, ih, "ROWS", DEFAULT_ROWS, 5, 60, A_TEAL, self.font)
-        self.in_cols = NumberInput(px+half+6, cy, half, ih, "COLS", DEFAULT_COLS, 5, 80, A_TEAL, self.font)
+        self.in_rows = NumberInput(px, cy, half, ih, "ROWS", DEFAULT_ROWS, 5, MAX_GRID, A_TEAL, self.font)
+        self.in_cols = NumberInput(px+half+6, cy, half, ih, "COLS", DEFAULT_COLS, 5, MAX_GRID, A_TEAL, self.font)
         cy += ih+g2
         self.btn_apply = Button(px, cy, pw, bh, "⊞  Apply Grid Size", A_TEAL, font=self.font)
         cy += bh+g1; cy += lh
@@ -424,153 +500,282 @@ class PathfinderApp:
                                    A_AMBER, toggle=True, always_lit=True, font=self.font)
         self.btn_reset    = Button(px+pw//2+3, cy, pw//2-3, bh, "↺  Reset", A_TEAL, font=self.font)
         cy += bh+g1
+        self.sl_speed = Slider(px, cy, pw, "Speed", 0, len(SPEED_STEPS)-1, DEFAULT_SPEED, A_GREEN, self.font,
+                               fmt=lambda v: "instant" if SPEED_STEPS[v] is None else f"{SPEED_STEPS[v]:g} steps/frame")
+        cy += 28+g1
         self.btn_dynamic  = Button(px, cy, pw, bh, "⚡  Dynamic Mode: OFF",
                                    A_AMBER, toggle=True, always_lit=True, font=self.font)
+        cy += bh+g2
+        self.btn_profile  = Button(px, cy, pw, bh, "⏱  Profiling: OFF",
+                                   A_PURPLE, toggle=True, always_lit=True, font=self.font)
         cy += bh+g1
         self.metrics = MetricsBox(px, cy, pw, self.font)
-        cy += 120
+        cy += 136 + 16*MetricsBox.PROBE_ROWS
 
         self.panel_content_h = cy+PANEL_PAD
         self.all_buttons   = [self.btn_apply, self.btn_generate, self.btn_clear,
-                               self.btn_start, self.btn_pause, self.btn_reset, self.btn_dynamic]
-        self.all_sliders   = [self.sl_density]
+                               self.btn_start, self.btn_pause, self.btn_reset, self.btn_dynamic,
+                               self.btn_profile]
+        self.all_sliders   = [self.sl_density, self.sl_speed]
         self.all_dropdowns = [self.dd_algo, self.dd_heur]
         self.all_inputs    = [self.in_rows, self.in_cols]
 
     # ── Search wiring ─────────────────────────────────
-    def _start_search(self, start=None, replan=False):
-        """Instantiate the selected algorithm and kick off the generator."""
+    def _start_search(self, start=None, goal=None, replan=False):
+        """
+        Instantiate the selected algorithm and kick off the generator.
+        A replan keeps the overlay and the agent's route (see _replan).
+        """
         from Astar import AStarSearch
+        from Arastar import ARAStarSearch
+        from BeamGbfs import BeamGBFSearch
+        from BidirAstar import BidirectionalAStarSearch
         from Gbfs  import GBFSearch
-
-        # Clear previous visual state unless replanning (keep walls)
+        from Hpa   import HPAStarSearch
+        from Idastar import IDAStarSearch
+        from Smastar import SMAStarSearch
+        from DstarLite import DStarLiteSearch
+        from Jps   import JPSearch
+        from distance_field import DistanceFieldSearch
+
+        # Clear previous visual state unless replanning (walls live in
+        # the grid, so this is just an O(1) overlay generation bump)
         if not replan:
-            self.grid.clear_path()
+            self.overlay.clear()
 
-        heuristic = "manhattan" if "Manhattan" in self.dd_heur.value else "euclidean"
+        heuristic = ("manhattan" if "Manhattan" in self.dd_heur.value else
+                     "landmark"  if "Landmark"  in self.dd_heur.value else "euclidean")
         s = start if start else self.grid.start
-
-        if "A*" in self.dd_algo.value:
-            self.searcher = AStarSearch(self.grid, s, self.grid.goal, heuristic)
+        g = goal  if goal  else self.grid.goal
+
+        if "HPA*" in self.dd_algo.value:
+            engine = HPAStarSearch
+        elif "ARA*" in self.dd_algo.value:
+            engine = partial(ARAStarSearch, deadline_ms=ARA_DEADLINE_MS)
+        elif "Bidirectional" in self.dd_algo.value:
+            engine = BidirectionalAStarSearch
+        elif "IDA*" in self.dd_algo.value:
+            engine = IDAStarSearch
+        elif "SMA*" in self.dd_algo.value:
+            engine = SMAStarSearch
+        elif "A*" in self.dd_algo.value:
+            engine = AStarSearch
+        elif "JPS" in self.dd_algo.value:
+            engine = JPSearch
+        elif "D*" in self.dd_algo.value:
+            engine = DStarLiteSearch
+        elif "Field" in self.dd_algo.value:
+            engine = DistanceFieldSearch
+        elif "Beam" in self.dd_algo.value:
+            engine = BeamGBFSearch
         else:
-            self.searcher = GBFSearch(self.grid, s, self.grid.goal, heuristic)
-
-        self.search_gen  = self.searcher.step()
+            engine = GBFSearch
+
+        # The engine is built on the worker too: constructors may build
+        # per-grid tables (landmarks, components, distance fields,
+        # cluster graphs), and that time counts as search time
+        # Profiling mode instruments the engines that support it
+        probe = None
+        if self.btn_profile.active and engine in (AStarSearch, GBFSearch):
+            probe  = Probe()
+            engine = partial(engine, probe=probe)
+
+        self._cancel_search()
+        grid = self.grid
+
+        def make():
+            components_for(grid)        # many searches per grid: keep no-path checks O(1)
+            return engine(grid, s, g, heuristic)
+        self.search_job  = SearchJob(make, after=self.retired_job)
+        self.search_time = 0.0
+        self.step_credit = 0.0
         self.searching   = True
-        self.start_time  = pygame.time.get_ticks()
         self.btn_pause.active = False
         self.metrics.status        = "RUNNING"
         self.metrics.nodes_visited = 0
         self.metrics.path_cost     = 0
         self.metrics.exec_time_ms  = 0.0
-        # Reset agent movement
-        self.agent_pos    = None
-        self.agent_path   = []
+        self.metrics.bound         = None
+        self.metrics.probe         = probe
+        # Reset agent movement (a replan just holds the agent in place)
         self.agent_moving = False
+        if not replan:
+            self.agent_pos   = None
+            self.agent_route = PathIndex()
+            self.rejoin_at   = None
 
     def _search_step(self):
         """
         Called once per frame from the main loop.
-        Advances the generator by sl_speed.val steps and updates the grid.
+        Applies up to the Speed slider's steps per frame from the search
+        worker's queue, stopping early once SEARCH_BUDGET_MS is spent so
+        the frame rate holds on big grids. Exec Time adds up the worker's
+        time in the engine only, not painting or idle frames.
         """
         if not self.searching or self.btn_pause.active:
             return
-        if self.search_gen is None:
+        job = self.search_job
+        if job is None:
             return
 
-        # Throttle: advance 1 step every 2 frames for visible animation
-        if self.frame_count % 2 != 0:
-            return
-        for _ in range(1):
-            try:
-                result = next(self.search_gen)
-            except StopIteration:
+        rate = SPEED_STEPS[self.sl_speed.val]
+        if rate is None:
+            steps = sys.maxsize
+        else:
+            self.step_credit += rate
+            steps = int(self.step_credit)
+            self.step_credit -= steps
+        clock    = time.perf_counter
+        deadline = clock() + SEARCH_BUDGET_MS / 1000
+        for _ in range(steps):
+            item = job.poll()
+            if item is None:
+                return                       # the worker is not there yet
+            result, nodes_visited, secs = item
+            self.search_time += secs
+            if result is None:
                 self.searching = False
                 return
 
-            # Update cell colours for frontier and visited
-            # Frontier painted first (amber), visited overrides it (blue)
-            for cell in result["frontier"]:
-                r, c = cell
-                if self.grid.cells[r][c] not in (Grid.START, Grid.GOAL, Grid.WALL, Grid.VISIT):
-                    self.grid.cells[r][c] = Grid.FRONT
-
-            for cell in result["visited"]:
-                r, c = cell
-                if self.grid.cells[r][c] not in (Grid.START, Grid.GOAL, Grid.WALL):
-                    self.grid.cells[r][c] = Grid.VISIT
+            self._apply_search_delta(result)
 
             # Update metrics
-            self.metrics.nodes_visited = self.searcher.nodes_visited
-            elapsed = pygame.time.get_ticks() - self.start_time
-            self.metrics.exec_time_ms  = float(elapsed)
+            self.metrics.nodes_visited = nodes_visited
+            self.metrics.exec_time_ms  = self.search_time * 1000
+            if result.get("cost") is not None:       # anytime engines: current path
+                self.metrics.path_cost = result["cost"]
+                self.metrics.bound     = result["bound"]
+            if result["type"] in ("found", "no_path") and self.metrics.probe is not None:
+                self._export_profile()
 
             if result["type"] == "found":
+                # A replan's detour is spliced onto the kept route tail
+                if self.rejoin_at is not None:
+                    self.agent_route.reroute(self.rejoin_at, result["path"])
+                    self.rejoin_at = None
+                else:
+                    self.agent_route = PathIndex(result["path"])
                 # Draw final path
-                for cell in result["path"]:
-                    r, c = cell
-                    if self.grid.cells[r][c] not in (Grid.START, Grid.GOAL):
-                        self.grid.cells[r][c] = Grid.PATH
-                self.metrics.path_cost    = len(result["path"]) - 1
-                self.metrics.exec_time_ms = float(pygame.time.get_ticks() - self.start_time)
+                for cell in self.agent_route.remaining():
+                    self.overlay.set(self.grid.index(cell), Grid.PATH)
+                self.metrics.path_cost    = len(self.agent_route)
                 self.metrics.status       = "FOUND"
                 self.searching    = False
                 # Kick off agent movement along the found path
-                self.agent_path   = list(result["path"])[1:]  # skip start node
-                self.agent_pos    = self.grid.start
+                self.agent_pos    = self.agent_route.current()
                 self.agent_moving = True
+                # Walls spawned behind the search front while it ran
+                # can sit on the path it returned: replan around them.
+                k = self._first_wall_ahead()
+                if k >= 0:
+                    self._replan(k)
+                elif self.resume_due:
+                    self._resume_search()
                 return
 
             elif result["type"] == "no_path":
                 self.metrics.status = "NO PATH"
                 self.searching = False
+                self.rejoin_at = None
+                if self.resume_due:
+                    self._resume_search()
+                return
+
+            elif result["type"] == "error":          # the engine raised (see search_worker)
+                self.metrics.status = "ERROR"
+                self.searching = False
+                self.rejoin_at = None
+                self.resume_due = False
                 return
 
+            if clock() >= deadline:
+                return
+
+    @property
+    def searcher(self):
+        """Engine of the current search job (None while it is being built)."""
+        return self.search_job.searcher if self.search_job else None
+
+    def _cancel_search(self, wait=False):
+        """
+        Stop the search worker, if any; queued events are dropped with it.
+        wait=True returns only once its searcher has left the grid alone
+        (a constructor still building tables is not waited for; see
+        search_worker). The next job waits for this worker to exit.
+        """
+        if self.search_job:
+            self.search_job.cancel(wait)
+            self.retired_job = self.search_job
+        self.search_job = None
+        self.searching  = False
+        self.resume_due = False
+
+    def _export_profile(self):
+        """Append the finished run's instrumentation record to PROFILE_LOG."""
+        try:
+            self.metrics.probe.export(PROFILE_LOG, algo=self.dd_algo.value, heuristic=self.dd_heur.value,
+                                      rows=self.grid.rows, cols=self.grid.cols)
+        except OSError:
+            pass                    # read-only working dir: the panel still shows it
+
+    def _apply_search_delta(self, result):
+        """
+        Repaint only the cells a step event reports as changed:
+        cells leaving the frontier go back to empty, the expanded node
+        turns blue (visited) and newly opened nodes turn amber (frontier).
+        Walls, start and goal are in the grid, not the overlay, so they
+        always show through and need no checks here.
+        """
+        ov, cols = self.overlay, self.grid.cols
+        for r, c in result["removed"]:
+            if ov.get(r*cols + c) == Grid.FRONT:
+                ov.set(r*cols + c, Grid.EMPTY)
+        if result["current"] is not None:
+            r, c = result["current"]
+            ov.set(r*cols + c, Grid.VISIT)
+        for r, c in result["added"]:
+            if ov.get(r*cols + c) != Grid.VISIT:
+                ov.set(r*cols + c, Grid.FRONT)
+
     # ── Dynamic mode obstacle spawning ───────────────
     def _agent_step(self):
         """
-        Move the agent one cell forward along agent_path.
-        Uses the same 2-frame throttle as the search animation.
+        Move the agent one cell forward along agent_route, on every
+        other frame (half the frame rate). Unlike the search, the agent's
+        pace does not follow the Speed slider.
         """
         if not self.agent_moving or self.btn_pause.active:
             return
-        if not self.agent_path:
+        if not self.agent_route:
             return
 
-        self.frame_count += 1
-        if self.frame_count % 2 != 0:
+        if self.frame_count % 2 != 0:      # run() advances frame_count
             return
 
         # Leave green trail behind the agent
-        if self.agent_pos and self.agent_pos not in (self.grid.start, self.grid.goal):
-            self.grid.cells[self.agent_pos[0]][self.agent_pos[1]] = Grid.PATH
+        if self.agent_pos:
+            self.overlay.set(self.grid.index(self.agent_pos), Grid.PATH)
 
         # Advance to next cell
-        self.agent_path.pop(0)
+        self.agent_pos = self.agent_route.advance()
 
-        if not self.agent_path:
+        if not self.agent_route:
             # Reached the goal
-            self.agent_pos    = self.grid.goal
             self.agent_moving = False
             self.metrics.status = "FOUND"
             return
 
-        self.agent_pos = self.agent_path[0]
-        r, c = self.agent_pos
-
-        # Mark agent position visually (don't overwrite start/goal)
-        if self.agent_pos not in (self.grid.start, self.grid.goal):
-            self.grid.cells[r][c] = Grid.AGENT
+        # Mark agent position (start/goal still show through, see _sync_shown)
+        self.overlay.set(self.grid.index(self.agent_pos), Grid.AGENT)
 
     def _dynamic_step(self):
         """
-        Spawns walls only while search is actively running.
-        Stops as soon as path is found or no path exists.
+        Spawns walls while a search is running or the agent is walking.
+        Stops once the agent has arrived or no path exists.
         """
         if not self.btn_dynamic.active:
             return
-        # Only spawn while search is actively running
-        if not self.searching:
+        if not (self.searching or self.agent_moving):
             return
 
         # ~2% chance per frame to spawn a new obstacle
@@ -581,35 +786,265 @@ class PathfinderApp:
         c = random.randint(0, self.grid.cols-1)
         cell = (r, c)
 
-        # Only spawn on empty/visited/frontier cells
-        if self.grid.cells[r][c] in (Grid.EMPTY, Grid.VISIT, Grid.FRONT):
-            self.grid.cells[r][c] = Grid.WALL
+        # Only spawn on empty cells, never under the agent; landing on the
+        # route ahead of it makes the agent replan (see _wall_added)
+        if self.grid.cells[r][c] == Grid.EMPTY and cell != self.agent_pos:
+            with self._job_lock():
+                self.grid.set(r, c, Grid.WALL)
+            self._wall_added(cell)
 
-            if self.searcher and self.searcher.notify_wall_added(cell):
-                self._start_search(start=self.grid.start, replan=True)
+    def _job_lock(self):
+        """Hold while editing the grid or searcher under a running worker."""
+        return self.search_job.lock if self.search_job else nullcontext()
+
+    def _wall_added(self, cell):
+        """
+        React to a wall just written at cell. While the agent walks, only
+        a wall on the route still ahead of it (an O(1) index lookup)
+        triggers a replan; during a search the searcher decides.
+        """
+        searcher = self.searcher
+        if not searcher:
+            return
+        incremental = getattr(searcher, "incremental", False)
+        if self.agent_moving or self.rejoin_at is not None:
+            if incremental:
+                with self._job_lock():            # keep its state in step
+                    searcher.notify_wall_added(cell)
+            # Walls on the part a running detour will replace don't matter
+            k = self.agent_route.ahead(cell)
+            if k >= 0 and (self.rejoin_at is None or k >= self.rejoin_at):
+                self._replan(k)
+            return
+        with self._job_lock():
+            replan = searcher.notify_wall_added(cell)
+        if replan and incremental:
+            self._resume_search()
 
+    def _replan(self, k):
+        """
+        The route is blocked at position k: plan again from the agent's
+        cell. Incremental engines just move their start and repair; the
+        others search a detour to the first free cell past k and keep
+        the rest of the route, which is still valid. If the route's end
+        is walled too (the goal was moved off it), the whole way to the
+        current goal is searched again.
+        """
+        if getattr(self.searcher, "incremental", False):
+            self._resume_search()
+            return
+        route = self.agent_route
+        self._clear_route_ahead()
+        data, cols = self.grid.data, self.grid.cols
+        j, end = k + 1, len(route.cells)
+        while j < end and data[route.cells[j][0]*cols + route.cells[j][1]] == Grid.WALL:
+            j += 1
+        if j == end:
+            self.rejoin_at = None
+            self._start_search(start=self.agent_pos, replan=True)
+            return
+        self.rejoin_at = j
+        self._start_search(start=self.agent_pos, goal=route.cells[j], replan=True)
+
+    def _first_wall_ahead(self):
+        """Route position of the first wall ahead of the agent, or -1."""
+        route, data, cols = self.agent_route, self.grid.data, self.grid.cols
+        for k in range(route.at + 1, len(route.cells)):
+            r, c = route.cells[k]
+            if data[r*cols + c] == Grid.WALL:
+                return k
+        return -1
+
+    def _clear_route_ahead(self):
+        """Wipe the PATH overlay of the route ahead of the agent."""
+        route = self.agent_route
+        for cell in route.cells[route.at+1:]:
+            i = self.grid.index(cell)
+            if self.overlay.get(i) == Grid.PATH:
+                self.overlay.set(i, Grid.EMPTY)
+
+    def _resume_search(self):
+        """
+        Incremental engines keep their state across map changes: rather
+        than rebuilding the searcher, run its repair generator on a new
+        job and wipe the now-stale path overlay. A running repair picks
+        the change up itself; if its worker may already have finished,
+        the repair is run again once its last event is in (resume_due).
+        """
+        if self.searching:
+            self.resume_due = True
+            return
+        searcher = self.searcher
+        if self.agent_route:                # en route: plan on from the agent's cell
+            with self._job_lock():
+                searcher.move_start(self.agent_pos)
+        self._clear_route_ahead()
+        self._cancel_search()
+        self.search_job   = SearchJob(searcher=searcher, after=self.retired_job)
+        self.searching    = True
+        self.search_time  = 0.0
+        self.step_credit  = 0.0
+        self.agent_moving = False
+        self.metrics.status = "RUNNING"
+
+    # ── Grid rendering ────────────────────────────────
     def _draw_grid(self):
-        surf = self.screen
+        """
+        Bring grid_surf up to date and return the rects that changed.
+        Rows are compared against shown as byte slices, so finding the
+        dirty cells costs one C-level compare per row; a new grid or a
+        new layout repaints everything.
+        """
+        if self.raster:
+            return self._draw_raster()
+        changed = self._sync_shown()
+        key = (self.grid, self.cell_size, self.grid_off_x, self.grid_off_y)
+        if key != self.painted or changed is None:
+            self.painted = key
+            self._paint_all()
+            return [self.grid_surf.get_rect()]
+
+        shown, cols = self.shown, self.grid.cols
+        dirty = [self._paint_cell(i // cols, i % cols, shown[i]) for i in changed]
+        if len(dirty) > MAX_DIRTY_RECTS:
+            return [dirty[0].unionall(dirty)]
+        return dirty
+
+    def _sync_shown(self):
+        """
+        Update shown — the grid as drawn: its own value for walls,
+        start and goal, the overlay's for EMPTY cells. Map edits are
+        found by comparing grid.data against static one row slice at a
+        time, overlay edits come from its dirty queue. Returns the ids
+        whose shown value changed, or None if everything must be redrawn
+        (new grid, or the overlay was cleared).
+        """
+        g, ov = self.grid, self.overlay
+        data = g.data
+        cleared, touched = ov.take_dirty()
+        if self.shown_for is not g:
+            self.shown_for = g
+            self.static, self.shown = bytearray(data), bytearray(data)
+            cleared = True
+        shown, static = self.shown, self.static
+        if cleared:
+            static[:] = data
+            shown[:]  = data
+            for i in touched:
+                if not data[i]:
+                    shown[i] = ov.get(i)
+            return None
+
+        if data != static:
+            cols = g.cols
+            for a in range(0, len(data), cols):
+                b = a + cols
+                if data[a:b] != static[a:b]:
+                    touched.extend(i for i in range(a, b) if data[i] != static[i])
+            static[:] = data
+        changed = []
+        for i in touched:
+            v = data[i] or ov.get(i)
+            if shown[i] != v:
+                shown[i] = v
+                changed.append(i)
+        return changed
+
+    def _paint_cell(self, r, c, v):
+        """Draw one cell (fill, wall bevel, its top/left grid lines, S/G label)."""
+        surf, cs = self.grid_surf, self.cell_size
+        x, y = self.grid_off_x + c*cs, self.grid_off_y + r*cs
+        rect = pygame.Rect(x, y, cs, cs)
+        pygame.draw.rect(surf, CMAP[v], rect)
+        if v == Grid.WALL and cs >= 12:
+            pygame.draw.rect(surf, WALL_EDGE, rect, border_radius=max(1,cs//8))
+        pygame.draw.line(surf, CELL_GRID, (x, y), (x+cs, y))
+        pygame.draw.line(surf, CELL_GRID, (x, y), (x, y+cs))
+        if cs >= 14 and v in (Grid.START, Grid.GOAL):
+            t = self.font.render("S" if v == Grid.START else "G", True, BG)
+            surf.blit(t, t.get_rect(center=rect.center))
+        return rect
+
+    def _paint_all(self):
+        surf = self.grid_surf
         g, cs, ox, oy = self.grid, self.cell_size, self.grid_off_x, self.grid_off_y
-        CMAP = {Grid.EMPTY:CELL_EMPTY, Grid.WALL:CELL_WALL, Grid.START:CELL_START,
-                Grid.GOAL:CELL_GOAL, Grid.FRONT:CELL_FRONT, Grid.VISIT:CELL_VISIT,
-                Grid.PATH:CELL_PATH, Grid.AGENT:CELL_AGENT}
-        pygame.draw.rect(surf, BG, (0, 0, GRID_AREA_W, GRID_AREA_H))
-        for r in range(g.rows):
-            for c in range(g.cols):
-                rect = pygame.Rect(ox+c*cs, oy+r*cs, cs, cs)
-                pygame.draw.rect(surf, CMAP[g.cells[r][c]], rect)
-                if g.cells[r][c] == Grid.WALL and cs >= 12:
-                    pygame.draw.rect(surf, (55,65,95), rect, border_radius=max(1,cs//8))
-        for r in range(g.rows+1):
-            pygame.draw.line(surf, CELL_GRID, (ox, oy+r*cs), (ox+g.cols*cs, oy+r*cs))
-        for c in range(g.cols+1):
-            pygame.draw.line(surf, CELL_GRID, (ox+c*cs, oy), (ox+c*cs, oy+g.rows*cs))
-        if cs >= 14:
-            for (r,c), lbl in [(g.start,"S"),(g.goal,"G")]:
-                t = self.font.render(lbl, True, BG)
-                surf.blit(t, t.get_rect(center=(ox+c*cs+cs//2, oy+r*cs+cs//2)))
+        surf.fill(BG)
+        for i, v in enumerate(self.shown):
+            self._paint_cell(i // g.cols, i % g.cols, v)
+        # Bottom and right edges (every other line belongs to a cell)
+        pygame.draw.line(surf, CELL_GRID, (ox, oy+g.rows*cs), (ox+g.cols*cs, oy+g.rows*cs))
+        pygame.draw.line(surf, CELL_GRID, (ox+g.cols*cs, oy), (ox+g.cols*cs, oy+g.rows*cs))
         draw_legend(surf, 8, GRID_AREA_H_USE+6, GRID_AREA_W-16, LEGEND_H-10, self.font)
+        surf.blit(self.font.render("Dynamic Pathfinding Agent", True, DIM), (8, SCREEN_H-18))
+
+    def _draw_raster(self):
+        """
+        Raster view for grids too large for per-cell drawing. An 8-bit
+        surface wraps shown in place with CMAP as its palette, so
+        mapping states to colours costs nothing per frame. Only the
+        visible cells are cut out, scaled to the zoom and blitted. The
+        viewport is repainted only when the bytes or the view changed.
+        """
+        g, surf = self.grid, self.grid_surf
+        port = pygame.Rect(0, 0, GRID_AREA_W, GRID_AREA_H_USE)
+        view = (self.zoom, self.view_x, self.view_y)
+        changed = self._sync_shown()
+        full = self.painted != (g, "raster")
+        if full:
+            self.painted = (g, "raster")
+            self.raster_surf = pygame.image.frombuffer(self.shown, (g.cols, g.rows), "P")
+            self.raster_surf.set_palette([CMAP.get(v, BG) for v in range(256)])
+            surf.fill(BG)
+            draw_legend(surf, 8, GRID_AREA_H_USE+6, GRID_AREA_W-16, LEGEND_H-10, self.font)
+            surf.blit(self.font.render("Dynamic Pathfinding Agent", True, DIM), (8, SCREEN_H-18))
+        elif view == self.shown_view and changed == []:
+            return []
+        self.shown_view = view
+
+        z, vx, vy = view
+        surf.fill(BG, port)
+        c0, r0 = max(0, int(vx)), max(0, int(vy))
+        c1 = min(g.cols, int(vx + port.w/z) + 1)
+        r1 = min(g.rows, int(vy + port.h/z) + 1)
+        if c0 < c1 and r0 < r1:
+            x0, y0 = round((c0-vx)*z), round((r0-vy)*z)
+            x1, y1 = round((c1-vx)*z), round((r1-vy)*z)
+            part = self.raster_surf.subsurface((c0, r0, c1-c0, r1-r0))
+            surf.set_clip(port)
+            surf.blit(pygame.transform.scale(part, (x1-x0, y1-y0)), (x0, y0))
+            if z >= 6:
+                for c in range(c0, c1+1):
+                    x = round((c-vx)*z)
+                    pygame.draw.line(surf, CELL_GRID, (x, y0), (x, y1))
+                for r in range(r0, r1+1):
+                    y = round((r-vy)*z)
+                    pygame.draw.line(surf, CELL_GRID, (x0, y), (x1, y))
+            surf.set_clip(None)
+        return [surf.get_rect() if full else port]
+
+    def _render(self):
+        """
+        Compose one frame on top of the previous one and return the
+        screen rects to push: the dirty cells, whatever the menus
+        covered last frame, the panel and the menus themselves.
+        """
+        screen, scan = self.screen, self.scan
+        grid_area = self.grid_surf.get_rect()
+        restore = self._draw_grid() + [r.clip(grid_area) for r in self.overlays]
+        for rect in restore:
+            screen.blit(self.grid_surf, rect, rect)
+            screen.blit(scan, rect, rect)
+
+        self._draw_panel()
+        panel = pygame.Rect(GRID_AREA_W, 0, PANEL_W, SCREEN_H)
+        screen.blit(scan, panel, panel)
+
+        # Draw open dropdown lists directly on screen (fixes z-order)
+        self.overlays = self._draw_open_dropdowns()
+        if self.context_menu.visible:
+            self.context_menu.draw(screen, self.font)
+            self.overlays.append(self.context_menu.rect())
+        return restore + [panel] + self.overlays
 
     def _draw_panel(self):
         surf, ps, pw = self.screen, self.panel_surf, PANEL_W
@@ -624,6 +1059,7 @@ class PathfinderApp:
         ps.blit(t, t.get_rect(centerx=pw//2, y=56))
 
         self.btn_dynamic.label = "⚡  Dynamic Mode: ON" if self.btn_dynamic.active else "⚡  Dynamic Mode: OFF"
+        self.btn_profile.label = "⏱  Profiling: ON" if self.btn_profile.active else "⏱  Profiling: OFF"
         for w in self.all_buttons+self.all_sliders+self.all_inputs: w.draw(ps)
         self.metrics.draw(ps)
         # Draw only the closed (header) part of each dropdown on panel_surf
@@ -643,6 +1079,11 @@ class PathfinderApp:
             pygame.draw.rect(surf, A_TEAL, (GRID_AREA_W+pw-5, by, 3, bh), border_radius=2)
 
     def _cell_at(self, mx, my):
+        if self.raster:
+            if not (0 <= mx < GRID_AREA_W and 0 <= my < GRID_AREA_H_USE): return None
+            c = math.floor(self.view_x + mx/self.zoom)
+            r = math.floor(self.view_y + my/self.zoom)
+            return (r,c) if 0<=r<self.grid.rows and 0<=c<self.grid.cols else None
         c = (mx-self.grid_off_x)//self.cell_size
         r = (my-self.grid_off_y)//self.cell_size
         return (r,c) if 0<=r<self.grid.rows and 0<=c<self.grid.cols else None
@@ -652,10 +1093,14 @@ class PathfinderApp:
             if event.type == pygame.QUIT or \
                (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 pygame.quit(); sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                self.painted = None          # window was uncovered: repaint it all
 
             if event.type == pygame.MOUSEWHEEL and pygame.mouse.get_pos()[0] >= GRID_AREA_W:
                 self.scroll_y = max(0, min(self.scroll_y-event.y*25,
                                            max(0, self.panel_content_h-SCREEN_H)))
+            if self.raster:
+                self._handle_view(event)
 
             pe = event
             if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
@@ -677,54 +1122,92 @@ class PathfinderApp:
             action, cell = self.context_menu.handle(event)
             if action and cell:
                 r, c = cell
-                if action == 'start':
-                    self.grid.cells[self.grid.start[0]][self.grid.start[1]] = Grid.EMPTY
-                    self.grid.start = (r,c); self.grid.cells[r][c] = Grid.START
-                elif action == 'goal':
-                    self.grid.cells[self.grid.goal[0]][self.grid.goal[1]] = Grid.EMPTY
-                    self.grid.goal  = (r,c); self.grid.cells[r][c] = Grid.GOAL
-                elif action == 'wall':  self.grid.set(r,c, Grid.WALL)
-                elif action == 'clear': self.grid.set(r,c, Grid.EMPTY)
+                self.overlay.set(self.grid.index(cell), Grid.EMPTY)
+                with self._job_lock():                 # edits land between expansions
+                    if action == 'start':
+                        self.grid.set(r,c, Grid.EMPTY)     # logs it if a wall is cleared
+                        self.overlay.set(self.grid.index(self.grid.start), Grid.EMPTY)
+                        self.grid.cells[self.grid.start[0]][self.grid.start[1]] = Grid.EMPTY
+                        self.grid.start = (r,c); self.grid.cells[r][c] = Grid.START
+                    elif action == 'goal':
+                        self.grid.set(r,c, Grid.EMPTY)
+                        self.overlay.set(self.grid.index(self.grid.goal), Grid.EMPTY)
+                        self.grid.cells[self.grid.goal[0]][self.grid.goal[1]] = Grid.EMPTY
+                        self.grid.goal  = (r,c); self.grid.cells[r][c] = Grid.GOAL
+                    elif action == 'wall':  self.grid.set(r,c, Grid.WALL)
+                    elif action == 'clear':
+                        was_wall = self.grid.cells[r][c] == Grid.WALL
+                        self.grid.set(r,c, Grid.EMPTY)
+                if action == 'wall':
+                    self._wall_added(cell)
+                elif action == 'clear' and was_wall and getattr(self.searcher, "incremental", False):
+                    with self._job_lock():
+                        replan = self.searcher.notify_wall_removed(cell)
+                    if replan: self._resume_search()
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.pos[0] < GRID_AREA_W:
                 if event.button == 3:
                     cell = self._cell_at(*event.pos)
-                    if cell: self.context_menu.show(*event.pos, cell, self.grid)
+                    if cell: self.context_menu.show(*event.pos, cell, self.grid, self.overlay)
                 elif event.button == 1: self.context_menu.hide()
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 self.context_menu.hide()
 
+    def _handle_view(self, event):
+        """Raster view: wheel zooms, left/middle drag pans, arrows pan, Home fits."""
+        if event.type == pygame.MOUSEWHEEL:
+            mx, my = pygame.mouse.get_pos()
+            if mx < GRID_AREA_W:
+                self._zoom_at(mx, my, 1.25**event.y)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 2) \
+                and event.pos[0] < GRID_AREA_W and not self.context_menu.visible:
+            self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button in (1, 2):
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            self._pan(*event.rel)
+        elif event.type == pygame.KEYDOWN and not any(ni.active for ni in self.all_inputs):
+            step = GRID_AREA_W // 10
+            if   event.key == pygame.K_HOME:  self._fit_view()
+            elif event.key == pygame.K_LEFT:  self._pan(step, 0)
+            elif event.key == pygame.K_RIGHT: self._pan(-step, 0)
+            elif event.key == pygame.K_UP:    self._pan(0, step)
+            elif event.key == pygame.K_DOWN:  self._pan(0, -step)
+
     def _on_button(self, btn):
         if btn is self.btn_apply:
             self.in_rows._commit(); self.in_cols._commit()
             self.grid_rows, self.grid_cols = self.in_rows.val, self.in_cols.val
             self._recompute_layout()
-            self.grid = Grid(self.grid_rows, self.grid_cols)
-            self.searching  = False
-            self.searcher   = None
-            self.search_gen = None
+            self._new_grid()
+            self._cancel_search()
             self.metrics.nodes_visited = self.metrics.path_cost = 0
-            self.metrics.exec_time_ms  = 0; self.metrics.status = "IDLE"
+            self.metrics.exec_time_ms  = 0; self.metrics.bound = None; self.metrics.status = "IDLE"
+            self.metrics.probe = None
 
         elif btn is self.btn_generate:
+            self._cancel_search(wait=True)
             self.grid.generate_random(self.sl_density.val/100)
-            self.searching = False; self.searcher = None; self.search_gen = None; self.agent_moving = False; self.agent_pos = None; self.agent_path = []
+            self.overlay.clear()
+            self.agent_moving = False; self.agent_pos = None; self.agent_route = PathIndex()
             self.metrics.status = "IDLE"
 
         elif btn is self.btn_clear:
-            self.grid = Grid(self.grid_rows, self.grid_cols)
-            self.searching = False; self.searcher = None; self.search_gen = None; self.agent_moving = False; self.agent_pos = None; self.agent_path = []
+            self._new_grid()
+            self._cancel_search(); self.agent_moving = False; self.agent_pos = None; self.agent_route = PathIndex()
             self.metrics.nodes_visited = self.metrics.path_cost = 0
-            self.metrics.exec_time_ms  = 0; self.metrics.status = "IDLE"
+            self.metrics.exec_time_ms  = 0; self.metrics.bound = None; self.metrics.status = "IDLE"
+            self.metrics.probe = None
 
         elif btn is self.btn_start:
             self._start_search()
 
         elif btn is self.btn_reset:
-            self.grid.clear_path()
-            self.searching = False; self.searcher = None; self.search_gen = None; self.agent_moving = False; self.agent_pos = None; self.agent_path = []
+            self.overlay.clear()
+            self._cancel_search(); self.agent_moving = False; self.agent_pos = None; self.agent_route = PathIndex()
             self.metrics.nodes_visited = self.metrics.path_cost = 0
-            self.metrics.exec_time_ms  = 0; self.metrics.status = "IDLE"
+            self.metrics.exec_time_ms  = 0; self.metrics.bound = None; self.metrics.status = "IDLE"
+            self.metrics.probe = None
             self.btn_pause.active = False
 
     def _draw_open_dropdowns(self):
@@ -732,7 +1215,9 @@ class PathfinderApp:
         Draw the open dropdown item lists directly on self.screen so they
         always appear on top of every other widget (fixes z-order bug).
         Coordinates are shifted by GRID_AREA_W and adjusted for scroll.
+        Returns the screen rects drawn over.
         """
+        drawn = []
         for dd in self.all_dropdowns:
             if not dd.open:
                 continue
@@ -749,29 +1234,22 @@ class PathfinderApp:
                 bg = (40, 50, 75) if i == dd.hovered else (30, 36, 56)
                 rrect(self.screen, bg, ir, r=4, bw=1,
                       bc=dd.color if i == dd.selected else dd.color)
+                drawn.append(ir)
                 if dd.font:
                     t = dd.font.render(opt, True, dd.color if i == dd.selected else WHITE)
                     self.screen.blit(t, t.get_rect(midleft=(ir.x + 12, ir.centery)))
+        return drawn
 
     def run(self):
-        scan = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-        for y in range(0, SCREEN_H, 4):
-            pygame.draw.line(scan, (0,0,0,18), (0,y), (SCREEN_W,y))
+        self.screen.fill(BG)
+        pygame.display.flip()
         while True:
             self._handle_events()
             self.frame_count += 1        # single increment drives all throttles
             self._search_step()
             self._agent_step()
             self._dynamic_step()
-            self.screen.fill(BG)
-            self._draw_grid()
-            self._draw_panel()
-            self.screen.blit(scan, (0,0))
-            # Draw open dropdown lists directly on screen (fixes z-order)
-            self._draw_open_dropdowns()
-            self.context_menu.draw(self.screen, self.font)
-            self.screen.blit(self.font.render("Dynamic Pathfinding Agent", True, DIM), (8, SCREEN_H-18))
-            pygame.display.flip()
+            pygame.display.update(self._render())
             self.clock.tick(FPS)
 
 
@@ -0,0 +1,131 @@
+"""
+Background search runner for the GUI.
+
+A SearchJob builds its searcher and drives its step() generator on a
+daemon thread, posting each delta event to a queue; the main loop polls
+that queue within its frame budget, so a slow engine (or a slow table
+build in a constructor) never blocks input or drawing.
+
+    job = SearchJob(lambda: AStarSearch(grid, start, goal))
+    item = job.poll()        # (event, nodes_visited, seconds) or None
+    job.cancel()             # takes effect before the next expansion
+
+Items are posted in order; event is None once the generator is
+exhausted without a "found" / "no_path". If the constructor or the
+engine raises, the last event is {"type": "error", "error": message}
+(shaped like a "no_path" event, the traceback going to stderr), so a
+consumer always sees the job end. seconds is the time the
+worker thread spent inside the constructor and the generator for that
+event (CPU time, so waiting on the main thread is not counted).
+
+The queue is bounded, so at animated speeds the worker only runs a
+little ahead of the display. Anything that touches the searcher or
+its grid while the job runs (wall edits, notify_wall_added,
+move_start, ...) must hold job.lock, which the worker holds for each
+expansion; it is re-entrant, so such code may nest.
+
+make() runs outside job.lock, so edits never wait for a constructor's
+table builds; the shared per-grid tables replay any edit that lands
+meanwhile on their next sync. Pass after=<previous job> when replacing
+a job on the same grid: the new worker first waits for the old one to
+exit, so two constructors never sync the same tables at once. The
+waiting happens on the worker thread, never on the caller's.
+"""
+import queue
+import threading
+import time
+import traceback
+
+MAX_QUEUED = 4096       # events the worker may run ahead of the display
+PUT_POLL_S = 0.05       # how often a blocked worker re-checks for cancel
+
+
+class SearchJob:
+    def __init__(self, make=None, searcher=None, after=None):
+        """
+        Run searcher, or the one make() returns (built on the worker),
+        once the worker of job after, if any, has exited.
+        """
+        self.make      = make
+        self.searcher  = searcher
+        self.after     = after
+        self.events    = queue.Queue(MAX_QUEUED)
+        self.lock      = threading.RLock()
+        self.cancelled = threading.Event()
+        self.thread    = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def poll(self):
+        """Next (event, nodes_visited, seconds), or None if none is ready."""
+        try:
+            return self.events.get_nowait()
+        except queue.Empty:
+            return None
+
+    def cancel(self, wait=False):
+        """
+        Stop the worker; nothing more will be posted. wait=True also
+        waits out the expansion in flight, before editing the grid in
+        place. A make() in flight is not waited for: its tables replay
+        the edit, and its searcher is never run.
+        """
+        self.cancelled.set()
+        if wait:
+            with self.lock:
+                pass
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        clock, gen = time.thread_time, None      # CPU time: not GIL waits
+        if self.after is not None:
+            self.after.thread.join()             # it has been cancelled: exits promptly
+            self.after = None
+        build = 0.0
+        if self.searcher is None and not self.cancelled.is_set():
+            t0 = clock()
+            try:
+                searcher = self.make()           # no lock held: may take a while
+            except Exception as exc:
+                self._post((self._failed(exc), 0, clock() - t0))
+                return
+            build = clock() - t0
+            with self.lock:
+                self.searcher = searcher
+        while not self.cancelled.is_set():
+            with self.lock:
+                if self.cancelled.is_set():      # cancelled while waiting for the lock
+                    return
+                t0 = clock() - build
+                build = 0.0
+                if gen is None:
+                    gen = self.searcher.step()
+                try:
+                    event = next(gen)
+                except StopIteration:
+                    event = None
+                except Exception as exc:
+                    event = self._failed(exc)
+                item = (event, self.searcher.nodes_visited, clock() - t0)
+            if not self._post(item):
+                return
+            if event is None or event["type"] != "step":
+                return
+
+    @staticmethod
+    def _failed(exc):
+        """Terminal event for an exception raised by make() or the engine."""
+        traceback.print_exc()
+        return {"type": "error", "current": None, "added": [], "removed": [],
+                "path": [], "error": f"{type(exc).__name__}: {exc}"}
+
+    def _post(self, item):
+        """Queue item, waiting for room; False if cancelled meanwhile."""
+        while not self.cancelled.is_set():
+            try:
+                self.events.put(item, timeout=PUT_POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
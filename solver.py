@@ -0,0 +1,187 @@
+"""
+Headless solver — runs the search engines to completion without the GUI.
+
+    from solver import solve
+    result = solve(grid, algorithm="astar", heuristic="manhattan")
+
+or from the command line:
+
+    python solver.py --rows 60 --cols 80 --density 0.3 --seed 7
+    python solver.py --map maze.txt --algo gbfs --heuristic euclidean
+    python solver.py --open-list bucket --tie high_g --stats
+    python solver.py --algo ara --deadline-ms 20
+    python solver.py --algo gbfs --profile runs.jsonl
+    python solver.py --algo sma --node-limit 2000
+    python solver.py --algo beam --beam-width 64
+"""
+import argparse
+import random
+import sys
+import time
+
+from Arastar import ARAStarSearch
+from Astar import AStarSearch
+from BeamGbfs import BeamGBFSearch
+from BidirAstar import BidirectionalAStarSearch
+from DstarLite import DStarLiteSearch
+from Gbfs import GBFSearch
+from Hpa import HPAStarSearch
+from Idastar import IDAStarSearch
+from Jps import JPSearch
+from Smastar import SMAStarSearch
+from distance_field import DistanceFieldSearch
+from grid import Grid
+from instrument import Probe
+from open_lists import BACKENDS, TIES
+
+
+ENGINES = {
+    "astar": AStarSearch,
+    "bidir": BidirectionalAStarSearch,
+    "gbfs" : GBFSearch,
+    "beam" : BeamGBFSearch,
+    "dstar": DStarLiteSearch,
+    "jps"  : JPSearch,
+    "field": DistanceFieldSearch,
+    "hpa"  : HPAStarSearch,
+    "ara"  : ARAStarSearch,
+    "ida"  : IDAStarSearch,
+    "sma"  : SMAStarSearch,
+}
+
+
+# Engines whose open list is pluggable (open_list= / tie= keywords);
+# they also take probe= (see instrument.py)
+OPEN_LIST_ENGINES = {"astar", "gbfs"}
+
+# Memory-bounded engines (node_limit= keyword, "peak_nodes" in the result)
+MEMORY_BOUNDED_ENGINES = {"ida", "sma"}
+
+
+def solve(grid, start=None, goal=None, algorithm="astar", heuristic="manhattan", **options):
+    """
+    Solve one query on grid. start / goal default to grid.start / grid.goal.
+    Extra keyword options go to the engine constructor (e.g. open_list="bucket",
+    tie="high_g", probe=Probe() for astar / gbfs).
+
+    Returns the engine's solve() dict:
+        {"type", "path", "cost", "nodes_visited"}
+    plus "open_stats" (the open list counters) for engines that have them,
+    and "probe" (Probe.report()) when a probe was passed.
+    """
+    if algorithm not in ENGINES:
+        raise ValueError(f"unknown algorithm {algorithm!r} (choose from {', '.join(ENGINES)})")
+    s = start if start is not None else grid.start
+    g = goal  if goal  is not None else grid.goal
+    engine = ENGINES[algorithm](grid, s, g, heuristic, **options)
+    result = engine.solve()
+    if algorithm in OPEN_LIST_ENGINES:
+        result["open_stats"] = engine.open_set.stats
+    if options.get("probe") is not None:
+        result["probe"] = options["probe"].report()
+    return result
+
+
+def load_grid(path):
+    """
+    Read a text map: '#' = wall, 'S' = start, 'G' = goal, anything else free.
+    All lines are padded to the longest one.
+    """
+    with open(path) as f:
+        lines = [ln.rstrip("\n") for ln in f if ln.strip()]
+    rows, cols = len(lines), max(len(ln) for ln in lines)
+    grid = Grid(rows, cols)
+    grid.cells[grid.start[0]][grid.start[1]] = Grid.EMPTY
+    grid.cells[grid.goal[0]][grid.goal[1]]   = Grid.EMPTY
+    for r, ln in enumerate(lines):
+        for c, ch in enumerate(ln):
+            if ch == "#":
+                grid.cells[r][c] = Grid.WALL
+            elif ch == "S":
+                grid.start = (r, c)
+            elif ch == "G":
+                grid.goal = (r, c)
+    grid.cells[grid.start[0]][grid.start[1]] = Grid.START
+    grid.cells[grid.goal[0]][grid.goal[1]]   = Grid.GOAL
+    grid.rebuild_masks()                 # walls were written past set()
+    return grid
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run a pathfinding query without the GUI.")
+    ap.add_argument("--map", help="text map file ('#' wall, 'S' start, 'G' goal)")
+    ap.add_argument("--rows", type=int, default=60)
+    ap.add_argument("--cols", type=int, default=80)
+    ap.add_argument("--density", type=float, default=0.3, help="wall probability for random maps")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--algo", choices=sorted(ENGINES), default="astar")
+    ap.add_argument("--heuristic", choices=["manhattan", "euclidean", "landmark"], default="manhattan")
+    ap.add_argument("--open-list", choices=BACKENDS, default=None,
+                    help="priority queue backend (astar / gbfs only)")
+    ap.add_argument("--tie", choices=TIES, default=None,
+                    help="tie-breaking on equal f (astar / gbfs only)")
+    ap.add_argument("--deadline-ms", type=float, default=None,
+                    help="time budget for improving the first path (ara only)")
+    ap.add_argument("--max-expansions", type=int, default=None,
+                    help="expansion budget for improving the first path (ara only)")
+    ap.add_argument("--node-limit", type=int, default=None,
+                    help="most search nodes held at once (ida / sma only)")
+    ap.add_argument("--beam-width", type=int, default=None,
+                    help="frontier cells kept by the first pass (beam only)")
+    ap.add_argument("--stats", action="store_true", help="print open list counters")
+    ap.add_argument("--profile", metavar="PATH",
+                    help="append the run's instrumentation record to PATH (astar / gbfs only)")
+    ap.add_argument("--path", action="store_true", help="print the path cells")
+    args = ap.parse_args(argv)
+
+    if args.map:
+        grid = load_grid(args.map)
+    else:
+        grid = Grid(args.rows, args.cols)
+        grid.generate_random(args.density, random.Random(args.seed))
+
+    options = {}
+    if args.open_list or args.tie:
+        if args.algo not in OPEN_LIST_ENGINES:
+            ap.error(f"--open-list / --tie only apply to {', '.join(sorted(OPEN_LIST_ENGINES))}")
+        options = {"open_list": args.open_list or "heap", "tie": args.tie or "low_g"}
+    if args.deadline_ms is not None or args.max_expansions is not None:
+        if args.algo != "ara":
+            ap.error("--deadline-ms / --max-expansions only apply to ara")
+        options = {"deadline_ms": args.deadline_ms, "max_expansions": args.max_expansions}
+    if args.node_limit is not None:
+        if args.algo not in MEMORY_BOUNDED_ENGINES:
+            ap.error(f"--node-limit only applies to {', '.join(sorted(MEMORY_BOUNDED_ENGINES))}")
+        options = {"node_limit": args.node_limit}
+    if args.beam_width is not None:
+        if args.algo != "beam":
+            ap.error("--beam-width only applies to beam")
+        options = {"width": args.beam_width}
+    if args.profile:
+        if args.algo not in OPEN_LIST_ENGINES:
+            ap.error(f"--profile only applies to {', '.join(sorted(OPEN_LIST_ENGINES))}")
+        options["probe"] = Probe()
+
+    t0 = time.perf_counter()
+    result = solve(grid, algorithm=args.algo, heuristic=args.heuristic, **options)
+    ms = (time.perf_counter() - t0) * 1000
+
+    print(f"{result['type']}  cost={result['cost']}  "
+          f"nodes_visited={result['nodes_visited']}  time={ms:.2f} ms"
+          + (f"  bound={result['bound']:.3f}" if result.get("bound") is not None else "")
+          + (f"  peak_nodes={result['peak_nodes']}" if "peak_nodes" in result else "")
+          + (f"  width={result['width']}" if "width" in result else ""))
+    if args.stats and "open_stats" in result:
+        print("  ".join(f"{k}={v}" for k, v in result["open_stats"].items()))
+    if args.profile:
+        rec = options["probe"].export(args.profile, algo=args.algo, heuristic=args.heuristic,
+                                      rows=grid.rows, cols=grid.cols, seed=args.seed)
+        print("  ".join(f"{k}={v}" for k, v in rec["counters"].items()))
+        print("  ".join(f"{k}={v}ms" for k, v in rec["time_ms"].items()))
+    if args.path:
+        print(" ".join(f"{r},{c}" for r, c in result["path"]))
+    return 0 if result["type"] == "found" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# The modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+import pytest
+
+from distance_field import UNREACHED, bfs_distances
+from grid import Grid
+
+
+@pytest.fixture
+def random_grid():
+    """Factory: seeded random map, 5-25 rows / cols, 20-40% walls."""
+    def make(seed):
+        rng = random.Random(seed)
+        grid = Grid(rng.randint(5, 25), rng.randint(5, 25))
+        grid.generate_random(rng.choice([0.2, 0.3, 0.4]), rng)
+        return grid
+    return make
+
+
+@pytest.fixture
+def bfs_cost():
+    """Shortest start -> goal cost by plain BFS, None if unreachable."""
+    def cost(grid):
+        d = bfs_distances(grid, grid.index(grid.start))[grid.index(grid.goal)]
+        return None if d == UNREACHED else d
+    return cost
+
+
+@pytest.fixture
+def assert_route():
+    """Check a path runs start -> goal over free, 4-adjacent cells."""
+    def check(grid, path):
+        assert path[0] == grid.start and path[-1] == grid.goal
+        for (r, c), (nr, nc) in zip(path, path[1:]):
+            assert abs(r - nr) + abs(c - nc) == 1
+            assert grid.cells[nr][nc] != Grid.WALL
+    return check
@@ -0,0 +1,56 @@
+import pytest
+
+from Arastar import ARAStarSearch
+from grid import Grid
+
+
+@pytest.mark.parametrize("heuristic", ["manhattan", "euclidean", "landmark"])
+def test_unbudgeted_runs_end_optimal(random_grid, bfs_cost, assert_route, heuristic):
+    for seed in range(40):
+        grid = random_grid(seed)
+        want = bfs_cost(grid)
+        got = ARAStarSearch(grid, grid.start, grid.goal, heuristic).solve()
+        if want is None:
+            assert got["type"] == "no_path" and got["bound"] is None, seed
+            continue
+        assert got["type"] == "found" and got["cost"] == want, seed
+        assert got["bound"] == 1.0, seed
+        assert_route(grid, got["path"])
+
+
+@pytest.mark.parametrize("budget", [1, 10, 50])
+def test_budget_still_returns_a_path_within_its_bound(random_grid, bfs_cost, assert_route, budget):
+    for seed in range(40):
+        grid = random_grid(seed)
+        want = bfs_cost(grid)
+        got = ARAStarSearch(grid, grid.start, grid.goal, max_expansions=budget).solve()
+        if want is None:
+            assert got["type"] == "no_path", seed
+            continue
+        assert got["type"] == "found", seed
+        assert want <= got["cost"] <= got["bound"] * want + 1e-9, seed
+        assert 1.0 <= got["bound"] <= 3.0
+        assert_route(grid, got["path"])
+
+
+def test_step_and_solve_agree(random_grid):
+    for seed in range(30):
+        grid = random_grid(seed)
+        want = ARAStarSearch(grid, grid.start, grid.goal, max_expansions=40).solve()
+        search = ARAStarSearch(grid, grid.start, grid.goal, max_expansions=40)
+        events = list(search.step())
+        last = events[-1]
+        assert last["type"] == want["type"] and last["path"] == want["path"], seed
+        assert last["bound"] == want["bound"], seed
+        assert search.nodes_visited == want["nodes_visited"], seed
+        # bound never loosens as the passes go on
+        bounds = [e["bound"] for e in events if e["bound"] is not None]
+        assert bounds == sorted(bounds, reverse=True), seed
+
+
+def test_bad_weights_are_rejected():
+    grid = Grid(4, 4)
+    with pytest.raises(ValueError):
+        ARAStarSearch(grid, grid.start, grid.goal, weight=0.5)
+    with pytest.raises(ValueError):
+        ARAStarSearch(grid, grid.start, grid.goal, weight_step=0)
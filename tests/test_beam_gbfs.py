@@ -0,0 +1,65 @@
+import pytest
+
+from BeamGbfs import BeamGBFSearch
+from grid import Grid
+
+
+@pytest.mark.parametrize("width", [1, 4, 256])
+@pytest.mark.parametrize("max_width", [None, 8])
+def test_finds_a_path_whenever_one_exists(random_grid, bfs_cost, assert_route, width, max_width):
+    # Passes widen until the goal is reached; the last one is unbounded
+    for seed in range(40):
+        grid = random_grid(seed)
+        want = bfs_cost(grid)
+        got = BeamGBFSearch(grid, grid.start, grid.goal, width=width, max_width=max_width).solve()
+        if want is None:
+            assert got["type"] == "no_path", seed
+            continue
+        assert got["type"] == "found" and got["cost"] >= want, seed
+        assert_route(grid, got["path"])
+
+
+@pytest.mark.parametrize("width", [1, 3, 16])
+def test_frontier_never_exceeds_the_width(random_grid, width):
+    # Replays the events: "added" / "removed" (expanded or dropped). A
+    # cell pushed and dropped by the same expansion used to be in both
+    for seed in range(30):
+        grid = random_grid(seed)
+        search = BeamGBFSearch(grid, grid.start, grid.goal, width=width, max_width=width)
+        frontier = set()
+        for event in search.step():
+            if event["type"] != "step":
+                break
+            frontier.difference_update(event["removed"])
+            frontier.update(event["added"])
+            if search.width is not None:    # the last pass is unbounded
+                assert len(frontier) <= search.width, seed
+            assert frontier == {divmod(i, grid.cols) for i in search.live}, seed
+
+
+@pytest.mark.parametrize("width", [1, 4, 256])
+def test_step_and_solve_agree(random_grid, width):
+    for seed in range(30):
+        grid = random_grid(seed)
+        a = BeamGBFSearch(grid, grid.start, grid.goal, width=width, max_width=16)
+        b = BeamGBFSearch(grid, grid.start, grid.goal, width=width, max_width=16)
+        want = a.solve()
+        events = list(b.step())
+        assert events[-1]["type"] == want["type"] and b.path == want["path"], seed
+        assert (b.nodes_visited, b.dropped, b.passes, b.width) == \
+               (a.nodes_visited, a.dropped, a.passes, want["width"]), seed
+
+
+def test_unreachable_goal_runs_no_pass():
+    grid = Grid(5, 5)
+    for c in range(5):
+        grid.set(2, c, Grid.WALL)
+    search = BeamGBFSearch(grid, grid.start, grid.goal)
+    assert search.solve()["type"] == "no_path"
+    assert search.passes == 0 and search.nodes_visited == 0
+
+
+def test_width_must_be_positive():
+    grid = Grid(4, 4)
+    with pytest.raises(ValueError):
+        BeamGBFSearch(grid, grid.start, grid.goal, width=0)
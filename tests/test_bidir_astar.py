@@ -0,0 +1,49 @@
+import pytest
+
+from BidirAstar import BidirectionalAStarSearch
+from connectivity import components_for
+from grid import Grid
+
+
+@pytest.mark.parametrize("heuristic", ["manhattan", "euclidean", "landmark"])
+@pytest.mark.parametrize("tie", ["low_g", "high_g"])
+def test_paths_are_optimal(random_grid, bfs_cost, assert_route, heuristic, tie):
+    for seed in range(40):
+        grid = random_grid(seed)
+        want = bfs_cost(grid)
+        got = BidirectionalAStarSearch(grid, grid.start, grid.goal, heuristic, tie).solve()
+        if want is None:
+            assert got["type"] == "no_path", seed
+            continue
+        assert got["type"] == "found" and got["cost"] == want, seed
+        assert_route(grid, got["path"])
+
+
+def test_step_and_solve_agree(random_grid):
+    for seed in range(30):
+        grid = random_grid(seed)
+        want = BidirectionalAStarSearch(grid, grid.start, grid.goal).solve()
+        search = BidirectionalAStarSearch(grid, grid.start, grid.goal)
+        events = list(search.step())
+        assert events[-1]["type"] == want["type"], seed
+        assert events[-1]["path"] == want["path"], seed
+        assert search.nodes_visited == want["nodes_visited"], seed
+
+
+def test_unreachable_goal():
+    grid = Grid(6, 6)
+    for c in range(6):
+        grid.set(3, c, Grid.WALL)
+    # Without a component index both sides run dry
+    got = BidirectionalAStarSearch(grid, grid.start, grid.goal).solve()
+    assert got["type"] == "no_path" and got["nodes_visited"] > 0
+    # With one, neither side is started
+    components_for(grid)
+    got = BidirectionalAStarSearch(grid, grid.start, grid.goal).solve()
+    assert got == {"type": "no_path", "path": [], "cost": 0, "nodes_visited": 0}
+
+
+def test_bad_tie_is_rejected():
+    grid = Grid(4, 4)
+    with pytest.raises(ValueError):
+        BidirectionalAStarSearch(grid, grid.start, grid.goal, tie="random")
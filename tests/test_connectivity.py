@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from connectivity import NO_LABEL, ComponentIndex, components_for, disconnected
+from grid import Grid
+
+
+def _partition(index, grid):
+    """Components as a set of frozensets of flat ids, labels aside."""
+    groups = {}
+    for i in range(grid.rows * grid.cols):
+        comp = index.component(i)
+        assert (comp == NO_LABEL) == (grid.data[i] == Grid.WALL)
+        if comp != NO_LABEL:
+            groups.setdefault(comp, set()).add(i)
+    return {frozenset(g) for g in groups.values()}
+
+
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("sync_every", [1, 7])
+def test_incremental_index_matches_a_fresh_build(seed, sync_every):
+    # Walls added (splits, ring checks) and removed (merges), synced
+    # after each edit or in batches, against a rebuild of the same map
+    rng = random.Random(seed)
+    grid = Grid(rng.randint(5, 25), rng.randint(5, 25))
+    grid.generate_random(rng.choice([0.2, 0.35, 0.5]), rng)
+    index = components_for(grid)
+    for k in range(150):
+        cell = (rng.randrange(grid.rows), rng.randrange(grid.cols))
+        grid.set(*cell, Grid.WALL if rng.random() < 0.55 else Grid.EMPTY)
+        if k % sync_every == 0:
+            assert components_for(grid) is index
+            assert _partition(index, grid) == _partition(ComponentIndex(grid), grid), k
+
+
+def test_edit_log_overflow_falls_back_to_a_rebuild():
+    grid = Grid(6, 6)
+    index = components_for(grid)
+    rng = random.Random(3)
+    for _ in range(5 * 36):             # more than the log keeps
+        grid.set(rng.randrange(6), rng.randrange(6), rng.choice([Grid.WALL, Grid.EMPTY]))
+    assert grid.wall_changes_since(index.version) is None
+    index.sync()
+    assert _partition(index, grid) == _partition(ComponentIndex(grid), grid)
+
+
+def test_split_and_rejoin():
+    grid = Grid(7, 7)
+    a, b = grid.index(grid.start), grid.index(grid.goal)
+    index = components_for(grid)
+    for c in range(7):
+        grid.set(3, c, Grid.WALL)
+    assert disconnected(grid, a, b)
+    grid.set(3, 4, Grid.EMPTY)
+    assert not disconnected(grid, a, b)
+    assert index.connected(a, b)
+
+
+def test_no_index_means_no_answer():
+    # disconnected() never builds one, so a fresh grid is never ruled out
+    grid = Grid(5, 5)
+    for c in range(5):
+        grid.set(2, c, Grid.WALL)
+    assert not disconnected(grid, grid.index(grid.start), grid.index(grid.goal))
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from DstarLite import DStarLiteSearch
+from distance_field import UNREACHED, bfs_distances
+from grid import Grid
+
+
+def _check(grid, start, result):
+    want = bfs_distances(grid, grid.index(grid.goal))[grid.index(start)]
+    if grid.cells[start[0]][start[1]] == Grid.WALL or want == UNREACHED:
+        assert result["type"] == "no_path"
+        return
+    assert result["type"] == "found" and result["cost"] == want
+    path = result["path"]
+    assert path[0] == start and path[-1] == grid.goal
+    for (r, c), (nr, nc) in zip(path, path[1:]):
+        assert abs(r - nr) + abs(c - nc) == 1 and grid.cells[nr][nc] != Grid.WALL
+
+
+@pytest.mark.parametrize("heuristic", ["manhattan", "euclidean", "landmark"])
+@pytest.mark.parametrize("use_step", [False, True])
+def test_replans_match_bfs_after_edits_and_moves(heuristic, use_step):
+    # Landmark keys used to go stale when a wall was removed (the bound
+    # moves with the map), leaving a longer path or none at all
+    for seed in range(60):
+        rng = random.Random(seed)
+        grid = Grid(rng.randint(3, 20), rng.randint(3, 20))
+        grid.generate_random(rng.choice([0, 0.1, 0.25, 0.35]), rng)
+        search = DStarLiteSearch(grid, grid.start, grid.goal, heuristic)
+        start = grid.start
+
+        def run():
+            if not use_step:
+                return search.solve()
+            event = list(search.step())[-1]
+            return {"type": event["type"], "path": search.path, "cost": len(search.path) - 1}
+
+        _check(grid, start, run())
+        for _ in range(15):
+            cell = (rng.randrange(grid.rows), rng.randrange(grid.cols))
+            if cell == grid.goal:
+                continue
+            if rng.random() < 0.6:
+                grid.set(*cell, Grid.WALL)
+                search.notify_wall_added(cell)
+            elif grid.cells[cell[0]][cell[1]] == Grid.WALL:
+                grid.set(*cell, Grid.EMPTY)
+                search.notify_wall_removed(cell)
+            path = search.path
+            if rng.random() < 0.2 and len(path) > 1 and grid.cells[path[1][0]][path[1][1]] != Grid.WALL:
+                start = path[1]
+                search.move_start(start)
+            _check(grid, start, run())
+
+
+def test_map_change_deltas_reach_the_next_event():
+    grid = Grid(9, 9)
+    search = DStarLiteSearch(grid, grid.start, grid.goal)
+    frontier = set()
+    for event in search.step():
+        frontier.difference_update(event["removed"])
+        frontier.update(event["added"])
+    cell = search.path[len(search.path) // 2]
+    grid.set(*cell, Grid.WALL)
+    assert search.notify_wall_added(cell)
+    events = list(search.step())
+    assert events[0]["added"] or events[0]["removed"]
+    for event in events:
+        frontier.difference_update(event["removed"])
+        frontier.update(event["added"])
+    # Replaying the deltas gives exactly the cells left in the open set
+    live = {divmod(i, grid.cols) for i, e in enumerate(search.entry) if e is not None}
+    assert frontier == live
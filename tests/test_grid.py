@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from distance_field import free_neighbours
+from grid import Grid
+
+
+def _successors(grid, i):
+    return sorted(i + off for off, _, _, _ in grid.steps[grid.nbr[i]])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_masks_kept_by_set_match_a_rebuild(seed):
+    rng = random.Random(seed)
+    grid = Grid(rng.randint(2, 20), rng.randint(3, 20))
+    grid.generate_random(0.3, rng)
+    for _ in range(200):
+        cell = (rng.randrange(grid.rows), rng.randrange(grid.cols))
+        grid.set(*cell, rng.choice([Grid.WALL, Grid.EMPTY, Grid.WALL]))
+    kept = bytes(grid.nbr)
+    grid.rebuild_masks()
+    assert bytes(grid.nbr) == kept
+
+
+@pytest.mark.parametrize("shape", [(2, 3), (2, 8), (9, 3), (4, 5), (13, 9)])
+def test_steps_list_exactly_the_free_neighbours(shape):
+    # Every cell, walls included: a mask describes where moves land
+    rng = random.Random(sum(shape))
+    grid = Grid(*shape)
+    grid.generate_random(0.4, rng)
+    for i in range(grid.rows * grid.cols):
+        assert _successors(grid, i) == sorted(free_neighbours(grid, i)), divmod(i, grid.cols)
+        for off, dr, dc, _ in grid.steps[grid.nbr[i]]:
+            r, c = divmod(i, grid.cols)
+            assert grid.index((r + dr, c + dc)) == i + off
+
+
+def test_direct_writes_need_rebuild_masks():
+    grid = Grid(3, 3)
+    grid.cells[1][1] = Grid.WALL        # bypasses set()
+    assert grid.index((1, 1)) in _successors(grid, grid.index((0, 1)))
+    grid.rebuild_masks()
+    assert grid.index((1, 1)) not in _successors(grid, grid.index((0, 1)))
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from Hpa import HPAStarSearch
+from grid import Grid
+
+
+@pytest.mark.parametrize("cluster", [3, 5, 16])
+def test_paths_are_valid_and_near_optimal(random_grid, bfs_cost, assert_route, cluster):
+    # Entrances can force a detour along each border crossed, so the
+    # cost is checked against BFS from below only
+    for seed in range(40):
+        grid = random_grid(seed)
+        want = bfs_cost(grid)
+        got = HPAStarSearch(grid, grid.start, grid.goal, cluster=cluster).solve()
+        if want is None:
+            assert got["type"] == "no_path", seed
+            continue
+        assert got["type"] == "found" and got["cost"] >= want, seed
+        assert_route(grid, got["path"])
+
+
+def test_step_and_solve_agree(random_grid):
+    for seed in range(30):
+        grid = random_grid(seed)
+        want = HPAStarSearch(grid, grid.start, grid.goal, cluster=5).solve()
+        search = HPAStarSearch(grid, grid.start, grid.goal, cluster=5)
+        events = list(search.step())
+        assert events[-1]["type"] == want["type"], seed
+        assert events[-1]["path"] == want["path"], seed
+        assert search.nodes_visited == want["nodes_visited"], seed
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_synced_graph_answers_like_a_fresh_one(bfs_cost, assert_route, seed):
+    # The cluster graph is cached per grid and follows wall edits; a
+    # copy of the map builds its graph from scratch
+    rng = random.Random(seed)
+    grid = Grid(rng.randint(5, 40), rng.randint(5, 40))
+    grid.generate_random(0.25, rng)
+    HPAStarSearch(grid, grid.start, grid.goal, cluster=5).solve()
+    for _ in range(20):
+        grid.set(rng.randrange(grid.rows), rng.randrange(grid.cols),
+                 rng.choice([Grid.WALL, Grid.EMPTY]))
+        got = HPAStarSearch(grid, grid.start, grid.goal, cluster=5).solve()
+        fresh = Grid(grid.rows, grid.cols)
+        fresh.data[:] = grid.data
+        fresh.rebuild_masks()
+        want = HPAStarSearch(fresh, fresh.start, fresh.goal, cluster=5).solve()
+        assert (got["type"], got["path"]) == (want["type"], want["path"])
+        assert (got["type"] == "no_path") == (bfs_cost(grid) is None)
+
+
+def test_unreachable_goal():
+    grid = Grid(20, 20)
+    for c in range(20):
+        grid.set(9, c, Grid.WALL)
+    search = HPAStarSearch(grid, grid.start, grid.goal, cluster=5)
+    assert search.solve()["type"] == "no_path"
+    assert search.nodes_visited == 0
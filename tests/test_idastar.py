@@ -0,0 +1,49 @@
+import pytest
+
+from Astar import AStarSearch
+from Idastar import IDAStarSearch
+from grid import Grid
+
+
+@pytest.mark.parametrize("heuristic", ["manhattan", "euclidean", "landmark"])
+def test_paths_are_optimal(random_grid, heuristic):
+    for seed in range(40):
+        grid = random_grid(seed)
+        want = AStarSearch(grid, grid.start, grid.goal).solve()
+        got  = IDAStarSearch(grid, grid.start, grid.goal, heuristic).solve()
+        assert (got["type"], got["cost"]) == (want["type"], want["cost"]), seed
+
+
+def test_full_table_trades_cpu_for_memory(random_grid):
+    # Cells past the table limit are not remembered: more expansions,
+    # same optimal cost, and the table never grows past the limit
+    for seed in range(20):
+        grid = random_grid(seed)
+        want = AStarSearch(grid, grid.start, grid.goal).solve()
+        if want["type"] != "found":
+            continue
+        ample = IDAStarSearch(grid, grid.start, grid.goal).solve()
+        tight = IDAStarSearch(grid, grid.start, grid.goal, node_limit=20)
+        got   = tight.solve()
+        assert got["cost"] == want["cost"], seed
+        assert len(tight.best_g) <= 20
+        assert got["nodes_visited"] >= ample["nodes_visited"]
+
+
+def test_events_end_in_the_solve_result(random_grid):
+    for seed in range(20):
+        grid = random_grid(seed)
+        want = IDAStarSearch(grid, grid.start, grid.goal).solve()
+        events = list(IDAStarSearch(grid, grid.start, grid.goal).step())
+        assert events[-1]["type"] == want["type"]
+        assert events[-1]["path"] == want["path"]
+
+
+def test_unreachable_goal_runs_no_pass():
+    grid = Grid(5, 5)
+    for c in range(5):
+        grid.set(2, c, Grid.WALL)
+    search = IDAStarSearch(grid, grid.start, grid.goal)
+    assert search.solve() == {"type": "no_path", "path": [], "cost": 0,
+                              "nodes_visited": 0, "peak_nodes": 0}
+    assert search.passes == 0
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from Astar import AStarSearch
+from distance_field import UNREACHED, bfs_distances, lower_from
+from grid import Grid
+
+
+def _edit_and_query(seed, open_list):
+    """Random wall edits between landmark queries; returns mismatches against BFS."""
+    rng = random.Random(seed)
+    rows, cols = rng.randint(3, 15), rng.randint(3, 15)
+    grid = Grid(rows, cols)
+    grid.generate_random(rng.choice([0.3, 0.45, 0.55]), rng)
+    AStarSearch(grid, grid.start, grid.goal, "landmark")          # builds the tables
+    bad = []
+    for _ in range(10):
+        for _ in range(rng.randint(1, 4)):
+            grid.set(rng.randrange(rows), rng.randrange(cols), rng.choice([Grid.EMPTY, Grid.WALL]))
+        start = (rng.randrange(rows), rng.randrange(cols))
+        if grid.data[grid.index(start)] == Grid.WALL:
+            continue
+        d = bfs_distances(grid, grid.index(grid.goal))[grid.index(start)]
+        result = AStarSearch(grid, start, grid.goal, "landmark", open_list=open_list).solve()
+        want = None if d == UNREACHED else d
+        got  = result["cost"] if result["type"] == "found" else None
+        if got != want:
+            bad.append((start, want, got))
+    return bad
+
+
+@pytest.mark.parametrize("open_list", ["heap", "bucket"])
+def test_landmark_sync_stays_admissible_under_edits(open_list):
+    # Freed cells that kept a stale label (seed 70), and a walled-in
+    # landmark freed again (seed 2475), used to leave cells UNREACHED
+    for seed in [70, 2475] + list(range(400)):
+        assert _edit_and_query(seed, open_list) == [], seed
+
+
+def test_freed_cell_with_stale_label_reconnects_neighbours():
+    grid = Grid(3, 4)
+    for c in range(4):                      # isolate row 0: 0 1 2 3
+        grid.set(1, c, Grid.WALL)
+    grid.set(0, 2, Grid.WALL)
+    d = bfs_distances(grid, 0)              # [0, 1, -, -] along row 0
+    grid.set(0, 1, Grid.WALL)               # added: label 1 left stale
+    grid.set(0, 2, Grid.EMPTY)
+    lower_from(grid, d, 2, exact=False)     # no labelled neighbour yet
+    grid.set(0, 1, Grid.EMPTY)
+    lower_from(grid, d, 1, exact=False)     # stale label already "good enough"
+    assert list(d[:4]) == [0, 1, 2, 3]
+
+
+def test_freed_landmark_waves_out():
+    grid = Grid(3, 4)
+    for c in range(4):
+        grid.set(1, c, Grid.WALL)
+    grid.set(0, 1, Grid.WALL)
+    d = bfs_distances(grid, 0)              # [0, -, -, -] along row 0
+    grid.set(0, 0, Grid.WALL)               # the landmark itself walled in
+    grid.set(0, 1, Grid.EMPTY)
+    lower_from(grid, d, 1, exact=False)     # no labelled neighbour yet
+    grid.set(0, 0, Grid.EMPTY)
+    lower_from(grid, d, 0, exact=False)     # keeps its 0, must still wave out
+    assert list(d[:4]) == [0, 1, 2, 3]
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from Astar import AStarSearch
+from Gbfs import GBFSearch
+from open_lists import make_open_list
+
+KINDS = ["heap", "indexed", "bucket", "auto"]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("tie", ["low_g", "high_g"])
+@pytest.mark.parametrize("integer", [True, False])
+def test_pops_best_key_once_per_node(kind, tie, integer):
+    # f = g + h with a fixed h per node, so the lowest g pushed for a
+    # node is also its lowest f; re-pushes are decrease-keys or worse
+    if kind == "bucket" and not integer:
+        pytest.skip("bucket needs integer f")
+    rng = random.Random(7)
+    n = 200
+    h = [rng.randint(0, 30) if integer else rng.random() * 30 for _ in range(n)]
+    best = {}
+    ol = make_open_list(kind, n, tie, integer)
+    for _ in range(600):
+        node, g = rng.randrange(n), rng.randint(0, 50)
+        ol.push(node, g + h[node], g)
+        best[node] = min(g, best.get(node, g))
+
+    popped, last = [], None
+    while True:
+        node, g = ol.pop()
+        if node < 0:
+            break
+        assert g == best[node]
+        f = g + h[node]
+        if last is not None:
+            assert f >= last[0]
+            if f == last[0]:                        # ties on f go by g
+                assert g >= last[1] if tie == "low_g" else g <= last[1]
+        last = (f, g)
+        popped.append(node)
+        assert ol.closed[node >> 3] >> (node & 7) & 1
+    assert sorted(popped) == sorted(best)
+    assert ol.pop() == (-1, 0)
+    assert ol.stats["pops"] == len(best)
+
+
+def test_bad_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        make_open_list("bucket", 10, integer=False)
+    with pytest.raises(ValueError):
+        make_open_list("fibonacci", 10)
+    with pytest.raises(ValueError):
+        make_open_list("heap", 10, tie="random")
+    assert type(make_open_list("auto", 10, integer=False)).__name__ == "IndexedHeap"
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("tie", ["low_g", "high_g"])
+@pytest.mark.parametrize("heuristic", ["manhattan", "euclidean", "landmark"])
+def test_astar_is_optimal_on_every_backend(random_grid, bfs_cost, assert_route, kind, tie, heuristic):
+    if kind == "bucket" and heuristic == "euclidean":
+        pytest.skip("bucket needs integer f")
+    for seed in range(30):
+        grid = random_grid(seed)
+        want = bfs_cost(grid)
+        got = AStarSearch(grid, grid.start, grid.goal, heuristic, open_list=kind, tie=tie).solve()
+        if want is None:
+            assert got["type"] == "no_path", seed
+            continue
+        assert got["type"] == "found" and got["cost"] == want, seed
+        assert_route(grid, got["path"])
+
+
+@pytest.mark.parametrize("engine", [AStarSearch, GBFSearch])
+@pytest.mark.parametrize("kind", KINDS)
+def test_step_and_solve_agree(random_grid, engine, kind):
+    for seed in range(20):
+        grid = random_grid(seed)
+        a = engine(grid, grid.start, grid.goal, open_list=kind)
+        b = engine(grid, grid.start, grid.goal, open_list=kind)
+        want = a.solve()
+        events = list(b.step())
+        assert events[-1]["type"] == want["type"], seed
+        assert b.path == want["path"] and b.nodes_visited == want["nodes_visited"], seed
+        assert b.open_set.stats == a.open_set.stats, seed
@@ -0,0 +1,80 @@
+import threading
+
+from Astar import AStarSearch
+from grid import Grid
+from search_worker import SearchJob
+
+TIMEOUT_S = 5
+
+
+def _drain(job):
+    """Events of job until its last one (found / no_path / None)."""
+    events = []
+    while True:
+        item = job.events.get(timeout=TIMEOUT_S)
+        events.append(item[0])
+        if item[0] is None or item[0]["type"] != "step":
+            return events
+
+
+def test_lock_is_free_while_the_searcher_is_built():
+    grid = Grid(8, 8)
+    building, release = threading.Event(), threading.Event()
+
+    def make():
+        building.set()
+        assert release.wait(TIMEOUT_S)
+        return AStarSearch(grid, grid.start, grid.goal)
+
+    job = SearchJob(make)
+    assert building.wait(TIMEOUT_S)
+    assert job.lock.acquire(timeout=TIMEOUT_S)      # an edit does not wait for make()
+    grid.set(3, 3, Grid.WALL)
+    job.lock.release()
+    release.set()
+    assert _drain(job)[-1]["type"] == "found"
+
+
+def test_next_job_waits_for_the_cancelled_one():
+    grid = Grid(8, 8)
+    order, release = [], threading.Event()
+
+    def slow():
+        assert release.wait(TIMEOUT_S)
+        order.append("old")
+        return AStarSearch(grid, grid.start, grid.goal)
+
+    def fast():
+        order.append("new")
+        return AStarSearch(grid, grid.start, grid.goal)
+
+    old = SearchJob(slow)
+    old.cancel()
+    new = SearchJob(fast, after=old)
+    release.set()
+    assert _drain(new)[-1]["type"] == "found"
+    assert order == ["old", "new"]
+    assert old.poll() is None                       # cancelled during make(): never run
+
+
+class _Raising:
+    """Searcher whose step() raises after one event."""
+    nodes_visited = 0
+
+    def step(self):
+        yield {"type": "step", "current": (0, 0), "added": [], "removed": [], "path": []}
+        raise RuntimeError("engine bug")
+
+
+def test_engine_exception_ends_the_job_with_an_error_event():
+    events = _drain(SearchJob(searcher=_Raising()))
+    assert [e["type"] for e in events] == ["step", "error"]
+    assert events[-1]["error"] == "RuntimeError: engine bug"
+
+
+def test_constructor_exception_ends_the_job_with_an_error_event():
+    def make():
+        raise ValueError("bad node_limit")
+    events = _drain(SearchJob(make))
+    assert [e["type"] for e in events] == ["error"]
+    assert "bad node_limit" in events[-1]["error"]